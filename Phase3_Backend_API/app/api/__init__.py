@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api import auth, users, categories, gigs, orders, offers, reviews, messages, search, notifications, payments
+from app.api import auth, users, categories, gigs, orders, offers, reviews, messages, search, notifications, payments, push, admin
 
 api_router = APIRouter()
 
@@ -15,4 +15,6 @@ api_router.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
 api_router.include_router(messages.router, prefix="/messages", tags=["messages"])
 api_router.include_router(search.router, prefix="/search", tags=["search"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
-api_router.include_router(payments.router, prefix="/payments", tags=["payments"])
\ No newline at end of file
+api_router.include_router(payments.router, prefix="/payments", tags=["payments"])
+api_router.include_router(push.router, prefix="/push", tags=["push"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
\ No newline at end of file
@@ -0,0 +1,102 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_current_admin
+from app.core.config import SLOW_QUERY_DUMP_PATH
+from app.database.session import get_db, get_pool_stats
+from app.database.slow_queries import slow_query_log
+from app.schemas.user import Principal
+from app.services.auth import principal_cache
+from app.services.category import category_tree
+from app.services.engagement import engagement_counter
+from app.services.outbox import OutboxService, outbox_dispatcher
+from app.services.push import push_hub
+from app.services.response_cache import response_cache
+from app.services.unread import unread_counters
+
+router = APIRouter()
+
+@router.get("/engagement-stats")
+def get_engagement_stats(
+    current_user: Principal = Depends(get_current_admin)
+) -> Any:
+    """Get buffered and flushed gig impression/click counts."""
+    return engagement_counter.stats()
+
+@router.get("/outbox-stats")
+def get_outbox_stats(
+    current_user: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Get notification outbox backlog and dispatcher counters."""
+    return {**OutboxService.backlog(db), **outbox_dispatcher.stats()}
+
+@router.get("/push-stats")
+def get_push_stats(
+    current_user: Principal = Depends(get_current_admin)
+) -> Any:
+    """Get push connection and fan-out counters of this process."""
+    return push_hub.stats()
+
+@router.post("/outbox/retry-failed")
+def retry_failed_outbox_events(
+    current_user: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Requeue outbox events that exhausted their dispatch attempts."""
+    count = OutboxService.retry_failed(db)
+    return {"message": f"{count} events requeued"}
+
+@router.get("/pool-stats")
+def get_connection_pool_stats(
+    current_user: Principal = Depends(get_current_admin)
+) -> Any:
+    """Get database connection pool occupancy and checkout metrics."""
+    return get_pool_stats()
+
+@router.get("/cache-stats")
+def get_cache_stats(
+    current_user: Principal = Depends(get_current_admin)
+) -> Any:
+    """Get hit/miss counters of the in-process caches."""
+    return {
+        "principals": principal_cache.stats(),
+        "category_tree": category_tree.stats(),
+        "responses": response_cache.stats(),
+        "unread_counters": unread_counters.stats()
+    }
+
+@router.post("/categories/refresh")
+def refresh_categories(
+    current_user: Principal = Depends(get_current_admin)
+) -> Any:
+    """Drop the category snapshot after categories were changed in the database."""
+    category_tree.invalidate()
+    return {"message": "Category tree will be reloaded on the next request"}
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    sort_by: str = Query("total_ms", regex="^(total_ms|count|p50_ms|p95_ms|max_ms|slow_count)$"),
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: Principal = Depends(get_current_admin)
+) -> Any:
+    """Get statement timings aggregated by normalized fingerprint."""
+    return slow_query_log.report(sort_by=sort_by, limit=limit)
+
+@router.post("/slow-queries/dump")
+def dump_slow_queries(
+    current_user: Principal = Depends(get_current_admin)
+) -> Any:
+    """Write the full slow-query report to SLOW_QUERY_DUMP_PATH."""
+    report = slow_query_log.dump(SLOW_QUERY_DUMP_PATH)
+    return {"message": "Slow-query report written", "path": SLOW_QUERY_DUMP_PATH, "fingerprints": report["fingerprints"]}
+
+@router.delete("/slow-queries")
+def reset_slow_queries(
+    current_user: Principal = Depends(get_current_admin)
+) -> Any:
+    """Start a new slow-query aggregation window."""
+    slow_query_log.reset()
+    return {"message": "Slow-query log reset"}
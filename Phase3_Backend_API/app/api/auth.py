@@ -3,14 +3,16 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_active_user
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.database.async_session import get_async_db
 from app.database.session import get_db
-from app.models.user import User
-from app.schemas.user import UserCreate, UserOut, Token
+from app.schemas.user import UserCreate, UserOut, Token, Principal
 from app.services.auth import AuthService
+from app.services.user import AsyncUserService
 
 router = APIRouter()
 
@@ -56,8 +58,8 @@ def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/refresh-token", response_model=Token)
-def refresh_access_token(
-    current_user: User = Depends(get_current_active_user)
+async def refresh_access_token(
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """Refresh access token."""
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -67,6 +69,9 @@ def refresh_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserOut)
-def read_users_me(current_user: User = Depends(get_current_active_user)) -> Any:
+async def read_users_me(
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
     """Get current user information."""
-    return current_user
\ No newline at end of file
+    return await AsyncUserService.get_current_user(db, current_user.user_id)
\ No newline at end of file
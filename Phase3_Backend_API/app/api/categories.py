@@ -1,53 +1,73 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 
 from app.database.session import get_db
-from app.models.category import Category
 from app.schemas.category import CategoryOut
+from app.services.category import category_tree
+from app.utils.conditional import conditional_response
 
 router = APIRouter()
 
+# Served from the in-memory category snapshot; the session only connects
+# when the snapshot has to be (re)loaded
+
 @router.get("/", response_model=List[CategoryOut])
 def get_all_categories(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ) -> Any:
     """Get all categories."""
-    categories = db.query(Category).filter(Category.is_active == True).order_by(Category.display_order).all()
-    return categories
+    snapshot = category_tree.snapshot(db)
+    not_modified = conditional_response(request, response, snapshot.etag)
+    if not_modified:
+        return not_modified
+    
+    return snapshot.active
 
 @router.get("/{category_id}", response_model=CategoryOut)
 def get_category_by_id(
     category_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ) -> Any:
     """Get category by ID."""
-    category = db.query(Category).filter(Category.category_id == category_id).first()
+    snapshot = category_tree.snapshot(db)
+    category = snapshot.get(category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
+    
+    not_modified = conditional_response(request, response, snapshot.etag)
+    if not_modified:
+        return not_modified
+    
     return category
 
 @router.get("/{category_id}/subcategories", response_model=List[CategoryOut])
 def get_subcategories(
     category_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ) -> Any:
     """Get subcategories for a category."""
+    snapshot = category_tree.snapshot(db)
+    
     # First verify parent category exists
-    parent_category = db.query(Category).filter(Category.category_id == category_id).first()
-    if not parent_category:
+    if not snapshot.get(category_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
     
-    subcategories = db.query(Category).filter(
-        Category.parent_category_id == category_id,
-        Category.is_active == True
-    ).order_by(Category.display_order).all()
+    not_modified = conditional_response(request, response, snapshot.etag)
+    if not_modified:
+        return not_modified
     
-    return subcategories
\ No newline at end of file
+    return snapshot.subcategories(category_id)
@@ -1,16 +1,25 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, WebSocketException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from starlette.requests import HTTPConnection
 
 from app.core.config import SECRET_KEY, ALGORITHM
-from app.database.session import get_db
+from app.database.async_session import AsyncSessionLocal
 from app.models.user import User, SellerProfile
+from app.schemas.user import Principal
+from app.services.auth import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """Get the current user from the token."""
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    """Get the current user from the token.
+
+    Returns the cached principal (role, active flag, seller id); endpoints
+    that need the full user row load it themselves. On a cache miss the
+    lookup uses its own short-lived session, so the request does not hold
+    an async connection while it runs.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -27,38 +36,75 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.user_id == int(user_id)).first()
+    cache_key = (int(user_id), payload.get("jti"))
+    principal = principal_cache.get(cache_key)
+    if principal is not None:
+        return principal
+    
+    # One query for the user and their seller profile, if any
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(User.user_id, User.user_role, User.is_active, SellerProfile.seller_id).outerjoin(
+                SellerProfile, SellerProfile.user_id == User.user_id
+            ).where(User.user_id == int(user_id))
+        )
+        row = result.first()
     
-    if user is None:
+    if row is None:
         raise credentials_exception
     
-    return user
+    principal = Principal(
+        user_id=row.user_id,
+        user_role=row.user_role,
+        is_active=bool(row.is_active),
+        seller_id=row.seller_id
+    )
+    principal_cache.set(cache_key, principal)
+    
+    return principal
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Get the current active user."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
     return current_user
 
-async def get_current_seller(current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)) -> SellerProfile:
-    """Get the current user's seller profile."""
+async def get_connection_user(connection: HTTPConnection) -> Principal:
+    """Get the current active user of a long-lived connection (SSE or WebSocket).
+
+    Browsers cannot set headers on EventSource or WebSocket, so the token
+    may also be passed as the `token` query parameter. A session is only
+    opened on a principal cache miss, and closed before the stream starts.
+    """
+    scheme, _, token = connection.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = connection.query_params.get("token", "")
+    
+    try:
+        return await get_current_active_user(await get_current_user(token=token))
+    except HTTPException as exc:
+        if connection.scope["type"] == "websocket":
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=exc.detail)
+        raise
+
+async def get_current_seller(current_user: Principal = Depends(get_current_active_user)) -> Principal:
+    """Get the current user if they have a seller profile (seller_id is set)."""
     if current_user.user_role not in ["seller", "both", "admin"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User is not a seller"
         )
     
-    seller_profile = db.query(SellerProfile).filter(SellerProfile.user_id == current_user.user_id).first()
-    if not seller_profile:
+    if current_user.seller_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Seller profile not found"
         )
     
-    return seller_profile
+    return current_user
 
-async def get_current_admin(current_user: User = Depends(get_current_active_user)) -> User:
+async def get_current_admin(current_user: Principal = Depends(get_current_active_user)) -> Principal:
     """Get current user if they are an admin."""
     if current_user.user_role != "admin":
         raise HTTPException(
@@ -66,4 +112,4 @@ async def get_current_admin(current_user: User = Depends(get_current_active_user
             detail="Admin access required"
         )
     
-    return current_user
\ No newline at end of file
+    return current_user
@@ -1,20 +1,27 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, asc
 
 from app.api.dependencies import get_current_active_user, get_current_seller
+from app.core.config import RESPONSE_CACHE_FEATURED_TTL_SECONDS, RESPONSE_CACHE_LISTING_TTL_SECONDS
+from app.database.loading import statement_budget
 from app.database.session import get_db
 from app.models.gig import Gig, GigPackage, GigImage
-from app.models.user import User, SellerProfile
-from app.schemas.gig import GigCreate, GigOut, GigUpdate, GigPackageCreate, GigPackageOut
+from app.schemas.gig import GigCreate, GigDetailOut, GigOut, GigUpdate, GigPackageCreate, GigPackageOut
+from app.schemas.user import Principal
+from app.services.engagement import engagement_counter
 from app.services.gig import GigService
+from app.services.response_cache import GIG_CATEGORY, GIG_FEATURED, GIG_LIST, cached_response
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
-@router.get("/", response_model=List[GigOut])
+@router.get("/", response_model=List[GigOut], dependencies=[Depends(statement_budget(1))])
 def get_gigs(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     category_id: Optional[int] = Query(None),
@@ -26,79 +33,110 @@ def get_gigs(
     sort_by: Optional[str] = Query("ranking", regex="^(ranking|price|delivery_time|rating)$"),
     sort_order: Optional[str] = Query("desc", regex="^(asc|desc)$"),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get gigs with filtering and sorting."""
-    return GigService.get_gigs(
-        db=db,
-        skip=skip,
-        limit=limit,
-        category_id=category_id,
-        subcategory_id=subcategory_id,
-        min_price=min_price,
-        max_price=max_price,
-        delivery_time=delivery_time,
-        seller_level=seller_level,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        search=search
-    )
+    def load():
+        return GigService.get_gigs(
+            db=db,
+            skip=skip,
+            limit=limit,
+            category_id=category_id,
+            subcategory_id=subcategory_id,
+            min_price=min_price,
+            max_price=max_price,
+            delivery_time=delivery_time,
+            seller_level=seller_level,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            search=search,
+            cursor=cursor
+        )
+    
+    # Only the unfiltered first page is shared widely enough to cache
+    filters = (category_id, subcategory_id, min_price, max_price, delivery_time, seller_level, search, cursor)
+    if skip == 0 and all(value is None for value in filters):
+        return cached_response(
+            request, response, GIG_LIST,
+            {"limit": limit, "sort_by": sort_by, "sort_order": sort_order},
+            load, List[GigOut], RESPONSE_CACHE_LISTING_TTL_SECONDS
+        )
+    
+    gigs = load()
+    set_next_cursor(response, gigs)
+    return gigs
 
-@router.get("/featured", response_model=List[GigOut])
+@router.get("/featured", response_model=List[GigOut], dependencies=[Depends(statement_budget(1))])
 def get_featured_gigs(
+    request: Request,
+    response: Response,
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get featured gigs."""
-    gigs = db.query(Gig).filter(
-        Gig.is_featured == True,
-        Gig.is_active == True
-    ).order_by(desc(Gig.ranking_score)).limit(limit).all()
-    
-    return gigs
+    return cached_response(
+        request, response, GIG_FEATURED, {"limit": limit},
+        lambda: GigService.get_featured_gigs(db=db, limit=limit),
+        List[GigOut], RESPONSE_CACHE_FEATURED_TTL_SECONDS
+    )
 
-@router.get("/my-gigs", response_model=List[GigOut])
+@router.get("/my-gigs", response_model=List[GigOut], dependencies=[Depends(statement_budget(2))])
 def get_my_gigs(
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get current seller's gigs."""
-    gigs = db.query(Gig).filter(Gig.seller_id == current_seller.seller_id).all()
-    return gigs
+    return GigService.get_seller_gigs(db=db, seller_id=current_seller.seller_id)
 
 @router.post("/", response_model=GigOut)
 def create_gig(
     gig_data: GigCreate,
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Create a new gig."""
     return GigService.create_gig(db=db, gig_data=gig_data, seller_id=current_seller.seller_id)
 
-@router.get("/{gig_id}", response_model=GigOut)
+@router.get("/{gig_id}", response_model=GigDetailOut, dependencies=[Depends(statement_budget(3))])
 def get_gig_by_id(
     gig_id: int,
     db: Session = Depends(get_db)
 ) -> Any:
-    """Get gig by ID."""
-    gig = GigService.get_gig_by_id(db=db, gig_id=gig_id)
+    """Get gig by ID, with its active packages and images."""
+    gig = GigService.get_gig_by_id(db=db, gig_id=gig_id, profile="gig_detail")
     if not gig:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Gig not found"
         )
     
-    # Increment view count
-    gig.impression_count += 1
-    db.commit()
+    # Buffered; written to gigs.impression_count by the engagement flusher
+    engagement_counter.record_impression(gig_id)
     
     return gig
 
+@router.post("/{gig_id}/click")
+def record_gig_click(
+    gig_id: int,
+    db: Session = Depends(get_db)
+) -> Any:
+    """Record a click on a gig."""
+    gig_exists = db.query(Gig.gig_id).filter(Gig.gig_id == gig_id, Gig.is_active == True).first()
+    if not gig_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Gig not found"
+        )
+    
+    engagement_counter.record_click(gig_id)
+    return {"message": "Click recorded"}
+
 @router.put("/{gig_id}", response_model=GigOut)
 def update_gig(
     gig_id: int,
     gig_update: GigUpdate,
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Update a gig."""
@@ -112,7 +150,7 @@ def update_gig(
 @router.delete("/{gig_id}")
 def delete_gig(
     gig_id: int,
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Delete a gig (set inactive)."""
@@ -144,7 +182,7 @@ def get_gig_packages(
 def create_gig_package(
     gig_id: int,
     package_data: GigPackageCreate,
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Create a package for a gig."""
@@ -155,17 +193,34 @@ def create_gig_package(
         seller_id=current_seller.seller_id
     )
 
-@router.get("/category/{category_id}", response_model=List[GigOut])
+@router.get("/category/{category_id}", response_model=List[GigOut], dependencies=[Depends(statement_budget(1))])
 def get_gigs_by_category(
     category_id: int,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get gigs by category."""
-    gigs = db.query(Gig).filter(
-        Gig.category_id == category_id,
-        Gig.is_active == True
-    ).order_by(desc(Gig.ranking_score)).offset(skip).limit(limit).all()
+    def load():
+        return GigService.get_gigs(
+            db=db,
+            skip=skip,
+            limit=limit,
+            category_id=category_id,
+            sort_by="ranking",
+            sort_order="desc",
+            cursor=cursor
+        )
+    
+    if skip == 0 and cursor is None:
+        return cached_response(
+            request, response, GIG_CATEGORY, {"category_id": category_id, "limit": limit},
+            load, List[GigOut], RESPONSE_CACHE_LISTING_TTL_SECONDS
+        )
     
+    gigs = load()
+    set_next_cursor(response, gigs)
     return gigs
\ No newline at end of file
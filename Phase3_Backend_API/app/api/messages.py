@@ -1,45 +1,72 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_active_user
+from app.database.async_session import get_async_db
 from app.database.session import get_db
-from app.models.user import User
 from app.schemas.message import MessageCreate, MessageOut, ConversationOut
-from app.services.message import MessageService
+from app.schemas.user import Principal
+from app.services.message import MessageService, AsyncMessageService
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 @router.get("/conversations", response_model=List[ConversationOut])
-def get_conversations(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def get_conversations(
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
-    """Get all conversations for current user."""
-    return MessageService.get_conversations(db=db, user_id=current_user.user_id)
+    """Get conversations for current user, most recent first."""
+    conversations = await AsyncMessageService.get_conversations(
+        db=db, 
+        user_id=current_user.user_id, 
+        limit=limit, 
+        cursor=cursor
+    )
+    set_next_cursor(response, conversations)
+    return conversations
+
+@router.get("/unread-count")
+async def get_unread_count(
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """Get unread message count across all conversations."""
+    count = await AsyncMessageService.get_unread_count(db=db, user_id=current_user.user_id)
+    return {"unread_count": count}
 
 @router.get("/conversations/{conversation_id}", response_model=List[MessageOut])
 def get_conversation_messages(
     conversation_id: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get messages in a conversation."""
-    return MessageService.get_conversation_messages(
+    messages = MessageService.get_conversation_messages(
         db=db, 
         conversation_id=conversation_id, 
         user_id=current_user.user_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
+    set_next_cursor(response, messages)
+    return messages
 
 @router.post("/send", response_model=MessageOut)
 def send_message(
     message_data: MessageCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Send a message."""
@@ -49,10 +76,26 @@ def send_message(
         sender_id=current_user.user_id
     )
 
+@router.put("/conversations/{conversation_id}/read")
+async def mark_conversation_as_read(
+    conversation_id: str,
+    up_to_message_id: Optional[int] = Query(None, ge=1, description="Newest message id the client has seen; omit to mark everything"),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """Mark messages in a conversation as read, up to a message id."""
+    marked = await AsyncMessageService.mark_conversation_read(
+        db=db, 
+        conversation_id=conversation_id, 
+        user_id=current_user.user_id,
+        up_to_message_id=up_to_message_id
+    )
+    return {"message": "Conversation marked as read", "marked_count": marked}
+
 @router.put("/{message_id}/read")
 def mark_message_as_read(
     message_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Mark a message as read."""
@@ -1,57 +1,63 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_active_user
-from app.database.session import get_db
-from app.models.user import User
+from app.database.async_session import get_async_db
 from app.schemas.notification import NotificationOut
-from app.services.notification import NotificationService
+from app.schemas.user import Principal
+from app.services.notification import AsyncNotificationService
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 @router.get("/", response_model=List[NotificationOut])
-def get_notifications(
+async def get_notifications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     unread_only: bool = Query(False),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """Get notifications for current user."""
-    return NotificationService.get_notifications(
+    notifications = await AsyncNotificationService.get_notifications(
         db=db, 
         user_id=current_user.user_id, 
         skip=skip, 
         limit=limit,
-        unread_only=unread_only
+        unread_only=unread_only,
+        cursor=cursor
     )
+    set_next_cursor(response, notifications)
+    return notifications
 
 @router.put("/{notification_id}/read")
-def mark_notification_as_read(
+async def mark_notification_as_read(
     notification_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """Mark a notification as read."""
-    NotificationService.mark_as_read(db=db, notification_id=notification_id, user_id=current_user.user_id)
+    await AsyncNotificationService.mark_as_read(db=db, notification_id=notification_id, user_id=current_user.user_id)
     return {"message": "Notification marked as read"}
 
 @router.put("/read-all")
-def mark_all_notifications_as_read(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def mark_all_notifications_as_read(
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """Mark all notifications as read."""
-    NotificationService.mark_all_as_read(db=db, user_id=current_user.user_id)
+    await AsyncNotificationService.mark_all_as_read(db=db, user_id=current_user.user_id)
     return {"message": "All notifications marked as read"}
 
 @router.get("/unread-count")
-def get_unread_count(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def get_unread_count(
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """Get unread notification count."""
-    count = NotificationService.get_unread_count(db=db, user_id=current_user.user_id)
+    count = await AsyncNotificationService.get_unread_count(db=db, user_id=current_user.user_id)
     return {"unread_count": count}
\ No newline at end of file
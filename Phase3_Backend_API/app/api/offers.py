@@ -5,8 +5,8 @@ from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_active_user, get_current_seller
 from app.database.session import get_db
-from app.models.user import User, SellerProfile
 from app.schemas.offer import OfferCreate, OfferOut, OfferUpdate
+from app.schemas.user import Principal
 from app.services.offer import OfferService
 
 router = APIRouter()
@@ -14,7 +14,7 @@ router = APIRouter()
 @router.post("/", response_model=OfferOut)
 def create_offer(
     offer_data: OfferCreate,
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Create a custom offer."""
@@ -22,7 +22,7 @@ def create_offer(
 
 @router.get("/sent", response_model=List[OfferOut])
 def get_sent_offers(
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get offers sent by current seller."""
@@ -30,7 +30,7 @@ def get_sent_offers(
 
 @router.get("/received", response_model=List[OfferOut])
 def get_received_offers(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get offers received by current user."""
@@ -39,7 +39,7 @@ def get_received_offers(
 @router.get("/{offer_id}", response_model=OfferOut)
 def get_offer_by_id(
     offer_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get offer by ID."""
@@ -48,7 +48,7 @@ def get_offer_by_id(
 @router.put("/{offer_id}/accept")
 def accept_offer(
     offer_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Accept an offer."""
@@ -58,7 +58,7 @@ def accept_offer(
 @router.put("/{offer_id}/reject")
 def reject_offer(
     offer_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Reject an offer."""
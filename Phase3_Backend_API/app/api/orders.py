@@ -1,56 +1,125 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_active_user, get_current_seller
-from app.database.session import get_db
-from app.models.user import User, SellerProfile
-from app.schemas.order import OrderCreate, OrderOut, OrderUpdate, OrderDeliveryCreate, OrderRevisionCreate
+from app.database.loading import statement_budget
+from app.database.session import SessionLocal, get_db
+from app.schemas.order import (
+    OrderBatchCreate, OrderBatchOut, OrderCreate, OrderDetailOut, OrderOut, OrderUpdate,
+    OrderDeliveryCreate, OrderRevisionCreate
+)
+from app.schemas.user import Principal
 from app.services.order import OrderService
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 @router.post("/", response_model=OrderOut)
 def create_order(
     order_data: OrderCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Create a new order."""
     return OrderService.create_order(db=db, order_data=order_data, buyer_id=current_user.user_id)
 
-@router.get("/buyer", response_model=List[OrderOut])
+@router.post("/batch", response_model=OrderBatchOut)
+def create_orders_batch(
+    batch: OrderBatchCreate,
+    current_user: Principal = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Create several orders at once (e.g. a cart checkout); results are reported per item."""
+    return OrderService.create_orders_batch(db=db, items=batch.items, buyer_id=current_user.user_id)
+
+@router.get("/buyer", response_model=List[OrderOut], dependencies=[Depends(statement_budget(2))])
 def get_buyer_orders(
+    response: Response,
     status_filter: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_active_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get orders for current buyer."""
-    return OrderService.get_buyer_orders(db=db, buyer_id=current_user.user_id, status_filter=status_filter)
+    orders = OrderService.get_buyer_orders(
+        db=db,
+        buyer_id=current_user.user_id,
+        status_filter=status_filter,
+        skip=skip,
+        limit=limit,
+        cursor=cursor
+    )
+    set_next_cursor(response, orders)
+    return orders
 
-@router.get("/seller", response_model=List[OrderOut])
+@router.get("/buyer/export")
+def export_buyer_orders(
+    status_filter: Optional[str] = Query(None),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """Stream the current buyer's full order history as NDJSON."""
+    return StreamingResponse(
+        OrderService.export_orders(SessionLocal, "buyer", current_user.user_id, status_filter),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="orders.ndjson"'}
+    )
+
+@router.get("/seller", response_model=List[OrderOut], dependencies=[Depends(statement_budget(2))])
 def get_seller_orders(
+    response: Response,
     status_filter: Optional[str] = Query(None),
-    current_seller: SellerProfile = Depends(get_current_seller),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get orders for current seller."""
-    return OrderService.get_seller_orders(db=db, seller_id=current_seller.user_id, status_filter=status_filter)
+    orders = OrderService.get_seller_orders(
+        db=db,
+        seller_id=current_seller.user_id,
+        status_filter=status_filter,
+        skip=skip,
+        limit=limit,
+        cursor=cursor
+    )
+    set_next_cursor(response, orders)
+    return orders
 
-@router.get("/{order_id}", response_model=OrderOut)
+@router.get("/seller/export")
+def export_seller_orders(
+    status_filter: Optional[str] = Query(None),
+    current_seller: Principal = Depends(get_current_seller)
+) -> Any:
+    """Stream the current seller's full order history as NDJSON."""
+    return StreamingResponse(
+        OrderService.export_orders(SessionLocal, "seller", current_seller.user_id, status_filter),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="orders.ndjson"'}
+    )
+
+@router.get("/{order_id}", response_model=OrderDetailOut, dependencies=[Depends(statement_budget(4))])
 def get_order_by_id(
     order_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
-    """Get order by ID."""
-    return OrderService.get_order_by_id(db=db, order_id=order_id, user_id=current_user.user_id)
+    """Get order by ID, with its deliveries and revision requests."""
+    return OrderService.get_order_by_id(
+        db=db, order_id=order_id, user_id=current_user.user_id, profile="order_detail"
+    )
 
 @router.put("/{order_id}/status")
 def update_order_status(
     order_id: int,
     order_update: OrderUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Update order status."""
@@ -66,7 +135,7 @@ def update_order_status(
 def deliver_order(
     order_id: int,
     delivery_data: OrderDeliveryCreate,
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Deliver an order."""
@@ -82,7 +151,7 @@ def deliver_order(
 def request_revision(
     order_id: int,
     revision_data: OrderRevisionCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Request a revision for an order."""
@@ -97,7 +166,7 @@ def request_revision(
 @router.post("/{order_id}/complete")
 def complete_order(
     order_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Complete an order (buyer only)."""
@@ -107,7 +176,7 @@ def complete_order(
 @router.post("/{order_id}/cancel")
 def cancel_order(
     order_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Cancel an order."""
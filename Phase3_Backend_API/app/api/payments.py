@@ -1,20 +1,22 @@
-from typing import Any, List
+from datetime import datetime
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_active_user, get_current_seller
 from app.database.session import get_db
-from app.models.user import User, SellerProfile
-from app.schemas.payment import PaymentOut, WithdrawalRequest
+from app.schemas.payment import PaymentOut, WithdrawalRequest, EarningsLedgerEntryOut, EarningsPeriodOut
+from app.schemas.user import Principal
 from app.services.payment import PaymentService
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 @router.get("/{payment_id}", response_model=PaymentOut)
 def get_payment_by_id(
     payment_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get payment by ID."""
@@ -22,24 +24,43 @@ def get_payment_by_id(
 
 @router.get("/earnings/summary")
 def get_earnings_summary(
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get earnings summary for current seller."""
     return PaymentService.get_earnings_summary(db=db, seller_id=current_seller.user_id)
 
-@router.get("/earnings/history", response_model=List[PaymentOut])
+@router.get("/earnings/history", response_model=List[EarningsLedgerEntryOut])
 def get_earnings_history(
-    current_seller: SellerProfile = Depends(get_current_seller),
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
-    """Get earnings history for current seller."""
-    return PaymentService.get_earnings_history(db=db, seller_id=current_seller.user_id)
+    """Get earnings history (ledger entries) for current seller."""
+    entries = PaymentService.get_earnings_history(
+        db=db, seller_id=current_seller.user_id, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, entries)
+    return entries
+
+@router.get("/earnings/periods", response_model=List[EarningsPeriodOut])
+def get_earnings_by_period(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    current_seller: Principal = Depends(get_current_seller),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Get monthly earnings for current seller from payments within the range, newest month first."""
+    return PaymentService.get_earnings_by_period(
+        db=db, seller_id=current_seller.user_id, start_date=start_date, end_date=end_date
+    )
 
 @router.post("/withdraw")
 def request_withdrawal(
     withdrawal_data: WithdrawalRequest,
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Request withdrawal of earnings."""
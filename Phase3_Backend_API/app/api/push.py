@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any
+
+from fastapi import APIRouter, Depends, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import get_connection_user
+from app.core.config import PUSH_HEARTBEAT_SECONDS
+from app.schemas.user import Principal
+from app.services.push import push_hub
+
+router = APIRouter()
+
+PING_MESSAGE = '{"event": "ping", "data": null}'
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    current_user: Principal = Depends(get_connection_user)
+) -> Any:
+    """Server-sent events stream of the current user's notifications and messages."""
+    async def stream():
+        subscription = push_hub.subscribe(current_user.user_id)
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.next_event(PUSH_HEARTBEAT_SECONDS)
+                if event is None:
+                    # Keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                name, data = event
+                yield f"event: {name}\ndata: {data}\n\n"
+        finally:
+            push_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def push_socket(
+    websocket: WebSocket,
+    current_user: Principal = Depends(get_connection_user)
+):
+    """WebSocket carrying the same events as /events."""
+    await websocket.accept()
+    subscription = push_hub.subscribe(current_user.user_id)
+
+    async def watch_disconnect():
+        # Clients send nothing meaningful; reading is how a close is noticed
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            subscription.close()
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        while not subscription.closed:
+            event = await subscription.next_event(PUSH_HEARTBEAT_SECONDS)
+            if subscription.closed:
+                break
+            await websocket.send_text(event[1] if event is not None else PING_MESSAGE)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        watcher.cancel()
+        push_hub.unsubscribe(subscription)
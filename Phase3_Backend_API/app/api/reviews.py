@@ -1,20 +1,21 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_active_user
 from app.database.session import get_db
-from app.models.user import User
 from app.schemas.review import ReviewCreate, ReviewOut, ReviewResponse
+from app.schemas.user import Principal
 from app.services.review import ReviewService
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=ReviewOut)
 def create_review(
     review_data: ReviewCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Create a review for a completed order."""
@@ -23,28 +24,36 @@ def create_review(
 @router.get("/gig/{gig_id}", response_model=List[ReviewOut])
 def get_gig_reviews(
     gig_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get reviews for a gig."""
-    return ReviewService.get_gig_reviews(db=db, gig_id=gig_id, skip=skip, limit=limit)
+    reviews = ReviewService.get_gig_reviews(db=db, gig_id=gig_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, reviews)
+    return reviews
 
 @router.get("/seller/{seller_id}", response_model=List[ReviewOut])
 def get_seller_reviews(
     seller_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get reviews for a seller."""
-    return ReviewService.get_seller_reviews(db=db, seller_id=seller_id, skip=skip, limit=limit)
+    reviews = ReviewService.get_seller_reviews(db=db, seller_id=seller_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, reviews)
+    return reviews
 
 @router.post("/{review_id}/response")
 def respond_to_review(
     review_id: int,
     response_data: ReviewResponse,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Respond to a review (seller only)."""
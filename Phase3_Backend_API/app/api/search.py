@@ -1,17 +1,21 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
+from app.core.config import RESPONSE_CACHE_FILTERS_TTL_SECONDS
 from app.database.session import get_db
 from app.schemas.gig import GigOut
 from app.schemas.user import UserOut
+from app.services.response_cache import SEARCH_FILTERS, cached_response
 from app.services.search import SearchService
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 @router.get("/", response_model=List[GigOut])
 def search_gigs(
+    response: Response,
     q: str = Query(..., min_length=1, description="Search query"),
     category_id: Optional[int] = Query(None),
     min_price: Optional[int] = Query(None, ge=0),
@@ -21,10 +25,11 @@ def search_gigs(
     sort_by: Optional[str] = Query("relevance", regex="^(relevance|price|delivery_time|rating)$"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
     db: Session = Depends(get_db)
 ) -> Any:
     """Search for gigs."""
-    return SearchService.search_gigs(
+    gigs = SearchService.search_gigs(
         db=db,
         query=q,
         category_id=category_id,
@@ -34,8 +39,11 @@ def search_gigs(
         seller_level=seller_level,
         sort_by=sort_by,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
+    set_next_cursor(response, gigs)
+    return gigs
 
 @router.get("/sellers", response_model=List[UserOut])
 def search_sellers(
@@ -68,8 +76,14 @@ def get_search_suggestions(
 
 @router.get("/filters")
 def get_search_filters(
+    request: Request,
+    response: Response,
     category_id: Optional[int] = Query(None),
     db: Session = Depends(get_db)
 ) -> Any:
     """Get available search filters."""
-    return SearchService.get_search_filters(db=db, category_id=category_id)
\ No newline at end of file
+    return cached_response(
+        request, response, SEARCH_FILTERS, {"category_id": category_id},
+        lambda: SearchService.get_search_filters(db=db, category_id=category_id),
+        ttl_seconds=RESPONSE_CACHE_FILTERS_TTL_SECONDS
+    )
\ No newline at end of file
@@ -1,28 +1,31 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_active_user, get_current_seller
+from app.database.async_session import get_async_db
 from app.database.session import get_db
 from app.models.user import User, SellerProfile
-from app.schemas.user import UserOut, UserUpdate, PasswordChange
+from app.schemas.user import UserOut, UserUpdate, PasswordChange, Principal
 from app.schemas.seller import SellerProfileCreate, SellerProfileOut, SellerProfileUpdate
-from app.services.user import UserService
+from app.services.user import UserService, AsyncUserService
 
 router = APIRouter()
 
 @router.get("/me", response_model=UserOut)
-def get_current_user_profile(
-    current_user: User = Depends(get_current_active_user)
+async def get_current_user_profile(
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """Get current user profile."""
-    return current_user
+    return await AsyncUserService.get_current_user(db, current_user.user_id)
 
 @router.put("/me", response_model=UserOut)
 def update_current_user(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Update current user profile."""
@@ -31,7 +34,7 @@ def update_current_user(
 @router.put("/me/password")
 def change_password(
     password_change: PasswordChange,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Change user password."""
@@ -41,23 +44,24 @@ def change_password(
 @router.post("/seller-profile", response_model=SellerProfileOut)
 def create_seller_profile(
     seller_data: SellerProfileCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Create seller profile for current user."""
     return UserService.create_seller_profile(db=db, user_id=current_user.user_id, seller_data=seller_data)
 
 @router.get("/seller-profile", response_model=SellerProfileOut)
-def get_current_seller_profile(
-    current_seller: SellerProfile = Depends(get_current_seller)
+async def get_current_seller_profile(
+    current_seller: Principal = Depends(get_current_seller),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """Get current user's seller profile."""
-    return current_seller
+    return await db.get(SellerProfile, current_seller.seller_id)
 
 @router.put("/seller-profile", response_model=SellerProfileOut)
 def update_seller_profile(
     seller_update: SellerProfileUpdate,
-    current_seller: SellerProfile = Depends(get_current_seller),
+    current_seller: Principal = Depends(get_current_seller),
     db: Session = Depends(get_db)
 ) -> Any:
     """Update current seller profile."""
@@ -0,0 +1,253 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a fixed TTL.
+
+    Caches are per process, so with several workers an invalidation only
+    reaches the worker that made the change; the TTL bounds how long the
+    others can serve a stale entry.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._on_remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        with self._lock:
+            self._store(key, value, ttl_seconds)
+
+    def _store(self, key: Hashable, value: Any, ttl_seconds: Optional[float]):
+        """Insert an entry and evict down to capacity (caller holds the lock)."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        self._on_add(key)
+        while self._over_capacity():
+            evicted, _ = self._entries.popitem(last=False)
+            self._on_remove(evicted)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._on_remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._on_clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    # Hooks for subclasses keeping secondary indexes; called with the lock held
+    def _over_capacity(self) -> bool:
+        return len(self._entries) > self.max_size
+
+    def _on_add(self, key: Hashable):
+        pass
+
+    def _on_remove(self, key: Hashable):
+        pass
+
+    def _on_clear(self):
+        pass
+
+class PrincipalCache(TTLCache):
+    """Authenticated principals keyed by (user_id, token jti).
+
+    Entries for a user are indexed so that every token of that user can be
+    dropped at once when their account changes.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, **kwargs):
+        super().__init__(max_size, ttl_seconds, **kwargs)
+        self._keys_by_user: Dict[int, Set[Tuple[int, Optional[str]]]] = {}
+
+    def _on_add(self, key):
+        self._keys_by_user.setdefault(key[0], set()).add(key)
+
+    def _on_remove(self, key):
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def _on_clear(self):
+        self._keys_by_user.clear()
+
+    def invalidate_user(self, user_id: int):
+        """Forget every cached principal of a user."""
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, ()):
+                self._entries.pop(key, None)
+
+class CounterCache(TTLCache):
+    """Integer counters that can be adjusted in place.
+
+    An adjustment keeps the entry's expiry, so a counter is still reloaded
+    from its source once the TTL is up, however often it changes.
+    """
+
+    def add(self, key: Hashable, delta: int) -> bool:
+        """Adjust a live counter, never below zero. False if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                return False
+            self._entries[key] = (entry[0], max(0, entry[1] + delta))
+            return True
+
+class _Flight:
+    """A computation in progress that other callers of the same key wait on."""
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.done = threading.Event()
+        self.value: Any = None
+
+class ResponseCache(TTLCache):
+    """Pre-serialized responses keyed by (route, normalized params).
+
+    Bounded by entry count and by the total size of the cached bodies.
+    Concurrent misses for one key are single-flighted: the first caller
+    computes the value while the others wait for it, so an expired hot
+    entry costs one query rather than one per waiting request. Entries are
+    indexed by route so a write can drop every cached page of a route; a
+    computation that started before such an invalidation is not stored.
+    """
+
+    def __init__(self, max_size: int, max_bytes: int, ttl_seconds: float, wait_seconds: float = 10, **kwargs):
+        super().__init__(max_size, ttl_seconds, **kwargs)
+        self.max_bytes = max_bytes
+        self.wait_seconds = wait_seconds
+        self.coalesced = 0
+        self._bytes = 0
+        self._sizes: Dict[Hashable, int] = {}
+        self._keys_by_route: Dict[str, Set[Hashable]] = {}
+        self._generations: Dict[str, int] = {}
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._route_stats: Dict[str, Dict[str, int]] = {}
+
+    def _over_capacity(self) -> bool:
+        return len(self._entries) > self.max_size or self._bytes > self.max_bytes
+
+    def _on_add(self, key):
+        self._bytes += len(self._entries[key][1].body) - self._sizes.get(key, 0)
+        self._sizes[key] = len(self._entries[key][1].body)
+        self._keys_by_route.setdefault(key[0], set()).add(key)
+
+    def _on_remove(self, key):
+        self._bytes -= self._sizes.pop(key, 0)
+        keys = self._keys_by_route.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_route[key[0]]
+
+    def _on_clear(self):
+        self._bytes = 0
+        self._sizes.clear()
+        self._keys_by_route.clear()
+        for route in self._generations:
+            self._generations[route] += 1
+
+    def _count(self, route: str, outcome: str):
+        with self._lock:
+            counts = self._route_stats.setdefault(route, {"hits": 0, "misses": 0, "coalesced": 0})
+            counts[outcome] += 1
+
+    def get_or_compute(self, key: Tuple[str, Any], compute: Callable[[], Any], ttl_seconds: Optional[float] = None) -> Tuple[Any, bool]:
+        """Cached value for key, computing it at most once concurrently.
+
+        Returns (value, hit). The value must have a ``body`` (bytes).
+        """
+        route = key[0]
+        value = self.get(key)
+        if value is not None:
+            self._count(route, "hits")
+            return value, True
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight(self._generations.get(route, 0))
+
+        if not leader:
+            flight.done.wait(self.wait_seconds)
+            if flight.value is not None:
+                with self._lock:
+                    self.coalesced += 1
+                self._count(route, "coalesced")
+                return flight.value, True
+            # The leader failed or is too slow; compute without caching
+            self._count(route, "misses")
+            return compute(), False
+
+        try:
+            value = compute()
+            flight.value = value
+            self._count(route, "misses")
+            # Checked and stored under one lock, so an invalidation cannot slip in between
+            with self._lock:
+                if self._generations.get(route, 0) == flight.generation:
+                    self._store(key, value, ttl_seconds)
+            return value, False
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def invalidate_route(self, route: str):
+        """Drop every cached response of a route."""
+        with self._lock:
+            self._generations[route] = self._generations.get(route, 0) + 1
+            for key in self._keys_by_route.pop(route, ()):
+                self._entries.pop(key, None)
+                self._bytes -= self._sizes.pop(key, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats["bytes"] = self._bytes
+            stats["max_bytes"] = self.max_bytes
+            stats["coalesced"] = self.coalesced
+            stats["routes"] = {route: dict(counts) for route, counts in self._route_stats.items()}
+        return stats
@@ -14,11 +14,72 @@ DB_NAME = os.getenv("DB_NAME", "SlateDB")
 # Use the raw ODBC connection string format that worked
 ODBC_CONNECTION_STR = f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={DB_SERVER},{DB_PORT};DATABASE={DB_NAME};UID={DB_USER};PWD={DB_PASSWORD};TrustServerCertificate=yes;Connection Timeout=30;"
 DATABASE_URL = f"mssql+pyodbc:///?odbc_connect={ODBC_CONNECTION_STR}"
+# Same database through the asyncio driver, used by async endpoints
+ASYNC_DATABASE_URL = f"mssql+aioodbc:///?odbc_connect={ODBC_CONNECTION_STR}"
+
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds before a connection is replaced
+
+# Test/development guard: lazy loads raise and endpoints fail when they
+# exceed their SQL statement budget
+DB_QUERY_GUARD = os.getenv("DB_QUERY_GUARD", "false").lower() in ("1", "true", "yes")
+
+# Slow-query log (per-fingerprint statement timings)
+SLOW_QUERY_LOG_ENABLED = os.getenv("SLOW_QUERY_LOG_ENABLED", "true").lower() in ("1", "true", "yes")
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))  # Slower executions keep a sample
+SLOW_QUERY_MAX_FINGERPRINTS = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "1000"))
+SLOW_QUERY_SAMPLE_SIZE = int(os.getenv("SLOW_QUERY_SAMPLE_SIZE", "500"))  # Durations kept per fingerprint for percentiles
+SLOW_QUERY_DUMP_PATH = os.getenv("SLOW_QUERY_DUMP_PATH", "slow_queries.json")
 
 # Security settings
 SECRET_KEY = os.getenv("SECRET_KEY", "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+# Search settings
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "inverted_index")  # inverted_index/database
+SUGGESTION_REFRESH_SECONDS = int(os.getenv("SUGGESTION_REFRESH_SECONDS", "300"))
+
+# Category tree snapshot settings
+CATEGORY_CACHE_TTL_SECONDS = int(os.getenv("CATEGORY_CACHE_TTL_SECONDS", "300"))
+
+# Response cache settings (anonymous reads of hot listing endpoints)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_FEATURED_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_FEATURED_TTL_SECONDS", "60"))
+RESPONSE_CACHE_LISTING_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_LISTING_TTL_SECONDS", "30"))
+RESPONSE_CACHE_FILTERS_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_FILTERS_TTL_SECONDS", "300"))
+
+# Engagement counter settings (gig impressions/clicks are written behind)
+ENGAGEMENT_FLUSH_SECONDS = float(os.getenv("ENGAGEMENT_FLUSH_SECONDS", "5"))
+ENGAGEMENT_MAX_PENDING_GIGS = int(os.getenv("ENGAGEMENT_MAX_PENDING_GIGS", "10000"))
+# Past this many buffered gigs, increments for further gigs are dropped
+ENGAGEMENT_HARD_MAX_PENDING_GIGS = int(os.getenv("ENGAGEMENT_HARD_MAX_PENDING_GIGS", "50000"))
+
+# Notification outbox settings (events are dispatched in the background)
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "2"))  # Doubles with each failed attempt
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))  # Dispatched events kept for inspection
+
+# Push channel settings (WebSocket/SSE)
+PUSH_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "100"))  # Events buffered per connection before a resync
+PUSH_HEARTBEAT_SECONDS = float(os.getenv("PUSH_HEARTBEAT_SECONDS", "25"))
+
+# Unread counter settings (badge counts for notifications and messages)
+UNREAD_COUNTER_STORE = os.getenv("UNREAD_COUNTER_STORE", "memory")
+UNREAD_COUNTER_MAX_USERS = int(os.getenv("UNREAD_COUNTER_MAX_USERS", "100000"))
+UNREAD_COUNTER_RECONCILE_SECONDS = int(os.getenv("UNREAD_COUNTER_RECONCILE_SECONDS", "300"))  # Counters are recounted after this
+
+# Notification retention settings (scripts/maintenance.py compact-notifications)
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "30"))  # Read notifications older than this are archived
+NOTIFICATION_RETENTION_BATCH_SIZE = int(os.getenv("NOTIFICATION_RETENTION_BATCH_SIZE", "1000"))  # Rows per short transaction
 
 # API settings
 API_V1_STR = "/api"
@@ -0,0 +1,75 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import REQUESTS, REQUEST_DURATION, REQUEST_DB_DURATION, REQUEST_DB_STATEMENTS
+from app.database.instrumentation import request_context, route_label, track_queries
+
+logger = logging.getLogger(__name__)
+
+# Long-lived streams (SSE, NDJSON exports) are measured to their first byte
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+
+class QueryMetricsMiddleware:
+    """Measures each request's latency and the SQL it executes.
+
+    Adds a Server-Timing header (total, db time with the statement count,
+    slowest statement) and feeds the per-route histograms served at
+    /metrics. The header is written when the response starts, after the
+    body has been serialized, so lazy loads during serialization count.
+    Streaming responses are recorded when they start (time to first byte),
+    so a connection held open for hours does not skew the histograms.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        recorded = False
+
+        def record(stats):
+            nonlocal recorded
+            recorded = True
+            elapsed = time.perf_counter() - started
+            method, route = scope["method"], route_label(scope)
+            REQUESTS.inc((method, route, str(status_code)))
+            REQUEST_DURATION.observe((method, route), elapsed)
+            REQUEST_DB_DURATION.observe((method, route), stats.db_seconds)
+            REQUEST_DB_STATEMENTS.observe((method, route), stats.statements)
+            if stats.slowest_statement is not None:
+                logger.debug(
+                    "%s %s: %d statements, %.1f ms in db, slowest %.1f ms: %s",
+                    method, route, stats.statements, stats.db_seconds * 1000,
+                    stats.slowest_seconds * 1000, stats.slowest_statement
+                )
+
+        with request_context(scope), track_queries() as stats:
+            async def send_with_timing(message: Message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    total_ms = (time.perf_counter() - started) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", ", ".join((
+                        f"app;dur={total_ms:.1f}",
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} statements"',
+                        f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}",
+                    )))
+                    if headers.get("content-type", "").startswith(STREAMING_MEDIA_TYPES):
+                        record(stats)
+                        stats.stop()
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if not recorded:
+                    record(stats)
@@ -0,0 +1,90 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.database.async_session import async_engine
+from app.database.session import engine
+from app.database.slow_queries import slow_query_log
+
+class QueryStats:
+    """SQL statements executed within one tracked scope (usually a request)."""
+
+    __slots__ = ("statements", "db_seconds", "slowest_seconds", "slowest_statement", "stopped")
+
+    def __init__(self):
+        self.stopped = False
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, seconds: float):
+        if self.stopped:
+            return
+        self.statements += 1
+        self.db_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def stop(self):
+        """Ignore statements from now on, although the scope stays open."""
+        self.stopped = True
+
+# Scopes currently tracking statements; nested scopes all see a statement.
+# Threadpool workers and greenlets inherit the request's context.
+_active: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+# ASGI scope of the request being served, for attributing statements to routes
+_current_request: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_request", default=None)
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """The matched route template, or "unmatched" (keeps label cardinality bounded)."""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+@contextmanager
+def request_context(scope: Dict[str, Any]) -> Iterator[None]:
+    """Attribute statements executed in the current context to a request."""
+    token = _current_request.set(scope)
+    try:
+        yield
+    finally:
+        _current_request.reset(token)
+
+def current_route() -> Optional[str]:
+    scope = _current_request.get()
+    return route_label(scope) if scope is not None else None
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the SQL statements executed in the current context."""
+    stats = QueryStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    for stats in _active.get():
+        stats.record(statement, elapsed)
+    slow_query_log.record(statement, parameters, elapsed, executemany, current_route())
+
+def _handle_error(exception_context):
+    # after_cursor_execute does not fire for a failed statement
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+for _target in (engine, async_engine.sync_engine):
+    event.listen(_target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_target, "after_cursor_execute", _after_cursor_execute)
+    event.listen(_target, "handle_error", _handle_error)
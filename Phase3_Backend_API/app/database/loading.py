@@ -0,0 +1,66 @@
+from typing import Dict, Tuple
+
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.core.config import DB_QUERY_GUARD
+from app.database.instrumentation import track_queries
+from app.models.gig import Gig, GigPackage
+from app.models.order import Order
+
+# Named eager-loading profiles: the relationships a response schema reads,
+# loaded up front so serialization never lazy loads per row. Flat schemas
+# get an empty profile, which still forbids lazy loads under the guard.
+LOADING_PROFILES: Dict[str, Tuple[LoaderOption, ...]] = {
+    # GigOut
+    "gig_card": (),
+    # GigDetailOut: active packages and images
+    "gig_detail": (
+        selectinload(Gig.packages.and_(GigPackage.is_active == True)),
+        selectinload(Gig.images),
+    ),
+    # OrderOut
+    "order_card": (),
+    # OrderDetailOut: deliveries and revisions
+    "order_detail": (
+        selectinload(Order.deliveries),
+        selectinload(Order.revisions),
+    ),
+}
+
+def apply_profile(query, profile: str):
+    """Add a loading profile's options to a Query or select().
+
+    With DB_QUERY_GUARD on, any relationship outside the profile raises
+    instead of silently lazy loading.
+    """
+    options = LOADING_PROFILES[profile]
+    if DB_QUERY_GUARD:
+        options = options + (raiseload("*"),)
+    return query.options(*options) if options else query
+
+class StatementBudgetExceeded(AssertionError):
+    """An endpoint issued more SQL statements than it budgets for."""
+
+def statement_budget(limit: int):
+    """Route dependency capping the SQL statements of a request.
+
+    Counts every statement from dependency resolution through response
+    serialization (so lazy loads are included) and fails the request when
+    the count exceeds `limit`. Only enforced with DB_QUERY_GUARD on; use
+    as ``dependencies=[Depends(statement_budget(n))]`` so it runs first.
+    """
+    async def guard():
+        if not DB_QUERY_GUARD:
+            yield
+            return
+
+        with track_queries() as stats:
+            yield
+
+        if stats.statements > limit:
+            raise StatementBudgetExceeded(
+                f"Request issued {stats.statements} SQL statements; its budget is {limit}"
+            )
+
+    return guard
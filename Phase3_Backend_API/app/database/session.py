@@ -1,23 +1,36 @@
 from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-
-from app.core.config import DATABASE_URL
-
-# Create SQLAlchemy engine with SQL Server specific configuration
-engine = create_engine(
-    DATABASE_URL, 
-    pool_pre_ping=True,
-    # Add these SQL Server specific configurations
-    connect_args={
-        "autocommit": False,
-    },
-    # Use StaticPool to avoid connection issues
-    poolclass=StaticPool,
-    # Disable implicit returning for SQL Server compatibility
-    implicit_returning=False
-)
+
+from app.core.config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE
+from app.database.pool import InstrumentedQueuePool, get_pool_stats as _get_pool_stats
+
+def create_pooled_engine(
+    url: str = DATABASE_URL,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: int = DB_POOL_TIMEOUT,
+    pool_recycle: int = DB_POOL_RECYCLE,
+    **kwargs
+):
+    """Create an engine with SQL Server specific configuration and a connection pool."""
+    return create_engine(
+        url, 
+        pool_pre_ping=True,
+        # Add these SQL Server specific configurations
+        connect_args={
+            "autocommit": False,
+        },
+        # Each request checks out its own connection; waits are measured
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        **kwargs
+    )
+
+engine = create_pooled_engine()
 
 # Add event listener to handle SQL Server specific settings
 @event.listens_for(engine, "connect")
@@ -37,4 +50,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_pool_stats():
+    """Connection pool occupancy and checkout metrics for the application engine."""
+    return _get_pool_stats(engine.pool)
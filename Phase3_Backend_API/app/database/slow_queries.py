@@ -0,0 +1,184 @@
+import hashlib
+import json
+import re
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import (
+    SLOW_QUERY_LOG_ENABLED, SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_MAX_FINGERPRINTS, SLOW_QUERY_SAMPLE_SIZE
+)
+
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w@#$])-?\d+(?:\.\d+)?(?![\w])")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Normalized text per raw statement; SQLAlchemy reuses the same strings
+_FINGERPRINT_CACHE_SIZE = 5000
+_BIND_REPR_LIMIT = 64
+_SAMPLES_PER_FINGERPRINT = 5
+_ROUTES_PER_FINGERPRINT = 5
+
+def normalize_statement(statement: str) -> str:
+    """Strip literals and collapse IN lists so equivalent statements compare equal."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    # IN lists of any length (chunked id lookups) share one fingerprint
+    return _PLACEHOLDER_LIST.sub("(?...)", normalized)
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+def _bind_repr(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    text = value if isinstance(value, str) else str(value)
+    return text if len(text) <= _BIND_REPR_LIMIT else text[:_BIND_REPR_LIMIT] + "..."
+
+def _sample_params(parameters: Any, executemany: bool) -> Any:
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "first": _sample_params(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: _bind_repr(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_bind_repr(value) for value in parameters]
+    return _bind_repr(parameters)
+
+class _Fingerprint:
+    __slots__ = ("fingerprint", "sql", "count", "total", "max", "slow", "durations", "routes", "samples")
+
+    def __init__(self, fingerprint: str, sql: str, sample_size: int):
+        self.fingerprint = fingerprint
+        self.sql = sql
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self.durations: Deque[float] = deque(maxlen=sample_size)
+        self.routes: Counter = Counter()
+        self.samples: Deque[Dict[str, Any]] = deque(maxlen=_SAMPLES_PER_FINGERPRINT)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.durations)
+        return {
+            "fingerprint": self.fingerprint,
+            "sql": self.sql,
+            "count": self.count,
+            "slow_count": self.slow,
+            "total_ms": round(self.total * 1000, 2),
+            "mean_ms": round(self.total * 1000 / self.count, 3),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "routes": dict(self.routes.most_common(_ROUTES_PER_FINGERPRINT)),
+            "samples": list(self.samples),
+        }
+
+class SlowQueryLog:
+    """Per-fingerprint timing of every executed statement.
+
+    Statements are normalized (literals stripped, IN lists collapsed) and
+    aggregated by fingerprint. Percentiles come from the most recent
+    `sample_size` durations. Executions slower than the threshold also
+    keep a sample of their bind parameters (truncated) and the route that
+    issued them. The number of fingerprints is capped; statements with
+    new fingerprints past the cap are only counted as dropped.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+        max_fingerprints: int = SLOW_QUERY_MAX_FINGERPRINTS,
+        sample_size: int = SLOW_QUERY_SAMPLE_SIZE,
+        enabled: bool = SLOW_QUERY_LOG_ENABLED
+    ):
+        self.threshold = threshold_ms / 1000
+        self.max_fingerprints = max_fingerprints
+        self.sample_size = sample_size
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[str, _Fingerprint] = {}
+        self._normalized: Dict[str, str] = {}
+        self.dropped = 0
+        self.started_at = datetime.utcnow()
+
+    def _normalize(self, statement: str) -> str:
+        normalized = self._normalized.get(statement)
+        if normalized is None:
+            normalized = normalize_statement(statement)
+            if len(self._normalized) >= _FINGERPRINT_CACHE_SIZE:
+                self._normalized.clear()
+            self._normalized[statement] = normalized
+        return normalized
+
+    def record(self, statement: str, parameters: Any, seconds: float, executemany: bool = False, route: Optional[str] = None):
+        """Account one executed statement."""
+        if not self.enabled:
+            return
+
+        sql = self._normalize(statement)
+        fingerprint = hashlib.sha1(sql.encode()).hexdigest()[:16]
+        slow = seconds >= self.threshold
+        sample = None
+        if slow:
+            sample = {
+                "at": datetime.utcnow().isoformat(),
+                "duration_ms": round(seconds * 1000, 3),
+                "route": route,
+                "params": _sample_params(parameters, executemany),
+            }
+
+        with self._lock:
+            entry = self._fingerprints.get(fingerprint)
+            if entry is None:
+                if len(self._fingerprints) >= self.max_fingerprints:
+                    self.dropped += 1
+                    return
+                entry = self._fingerprints[fingerprint] = _Fingerprint(fingerprint, sql, self.sample_size)
+
+            entry.count += 1
+            entry.total += seconds
+            entry.max = max(entry.max, seconds)
+            entry.durations.append(seconds)
+            entry.routes[route or "background"] += 1
+            if slow:
+                entry.slow += 1
+                entry.samples.append(sample)
+
+    def report(self, sort_by: str = "total_ms", limit: Optional[int] = None) -> Dict[str, Any]:
+        """Aggregates per fingerprint, heaviest first."""
+        with self._lock:
+            fingerprints = [entry.summary() for entry in self._fingerprints.values()]
+            dropped = self.dropped
+
+        fingerprints.sort(key=lambda entry: entry[sort_by], reverse=True)
+        return {
+            "since": self.started_at.isoformat(),
+            "threshold_ms": round(self.threshold * 1000, 3),
+            "fingerprints": len(fingerprints),
+            "dropped_statements": dropped,
+            "queries": fingerprints[:limit] if limit else fingerprints,
+        }
+
+    def dump(self, path: str, sort_by: str = "total_ms") -> Dict[str, Any]:
+        """Write the full report to a JSON file and return it."""
+        report = self.report(sort_by=sort_by)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._fingerprints.clear()
+            self.dropped = 0
+            self.started_at = datetime.utcnow()
+
+# Process-wide log fed by the engine instrumentation
+slow_query_log = SlowQueryLog()
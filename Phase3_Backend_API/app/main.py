@@ -1,12 +1,31 @@
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
 from app.api import api_router
 from app.core.config import PROJECT_NAME, API_V1_STR
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from app.core.middleware import QueryMetricsMiddleware
+from app.database.async_session import async_engine
 from app.database.session import get_db
+from app.services.engagement import engagement_counter
+from app.services.outbox import outbox_dispatcher
+from app.services.response_cache import CACHE_STATUS_HEADER
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    engagement_counter.start()
+    outbox_dispatcher.start()
+    yield
+    # Write out buffered impressions/clicks and due notifications before the process exits
+    engagement_counter.stop()
+    outbox_dispatcher.stop()
+    await async_engine.dispose()
 
-app = FastAPI(title=PROJECT_NAME)
+app = FastAPI(title=PROJECT_NAME, lifespan=lifespan)
 
 # Set up CORS
 app.add_middleware(
@@ -15,8 +34,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", CACHE_STATUS_HEADER],
 )
 
+# Per-request latency and SQL statement metrics (Server-Timing, /metrics)
+app.add_middleware(QueryMetricsMiddleware)
+
 @app.get("/")
 def root():
     return {"message": f"Welcome to {PROJECT_NAME} API"}
@@ -25,5 +48,10 @@ def root():
 def health():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 # Include API router
 app.include_router(api_router, prefix=API_V1_STR)
\ No newline at end of file
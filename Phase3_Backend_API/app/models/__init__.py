@@ -1,12 +1,13 @@
 from app.models.user import User, SellerProfile
 from app.models.category import Category
-from app.models.gig import Gig, GigPackage, GigImage
+from app.models.gig import Gig, GigPackage, GigImage, GigListingFacts
 from app.models.order import Order, OrderDelivery, OrderRevision
 from app.models.review import Review
-from app.models.message import Message
+from app.models.message import Message, ConversationSummary
 from app.models.offer import Offer
-from app.models.payment import Payment
-from app.models.notification import Notification
+from app.models.payment import Payment, SellerBalance, EarningsLedgerEntry, EarningsRollup
+from app.models.notification import Notification, NotificationArchive, OutboxEvent
 from app.models.skill import Skill, SellerSkill
 from app.models.tag import Tag, GigTag
-from app.models.favorite import Favorite
\ No newline at end of file
+from app.models.favorite import Favorite
+from app.models.ranking import RankingRun
\ No newline at end of file
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import TypeDecorator
+from datetime import datetime
 import json
 
 from app.database.session import Base
@@ -56,6 +57,7 @@ class Gig(Base, TimeStampMixin):
     orders = relationship("Order", back_populates="gig")
     gig_tags = relationship("GigTag", back_populates="gig")
     favorites = relationship("Favorite", back_populates="gig")
+    listing_facts = relationship("GigListingFacts", back_populates="gig", uselist=False)
 
 
 class GigPackage(Base, TimeStampMixin):
@@ -87,4 +89,27 @@ class GigImage(Base):
     created_at = Column(Float, nullable=False)
     
     # Relationships
-    gig = relationship("Gig", back_populates="images")
\ No newline at end of file
+    gig = relationship("Gig", back_populates="images")
+
+class GigListingFacts(Base):
+    """Denormalized per-gig listing attributes used for filtering and sorting.
+
+    Maintained by ListingFactsService whenever a gig, its packages or its
+    seller's profile change, so listing queries never aggregate gig_packages.
+    """
+    __tablename__ = "gig_listing_facts"
+    
+    gig_id = Column(Integer, ForeignKey("gigs.gig_id"), primary_key=True)
+    seller_id = Column(Integer, ForeignKey("seller_profiles.seller_id"), nullable=False, index=True)
+    category_id = Column(Integer, nullable=False)
+    subcategory_id = Column(Integer, nullable=True)
+    is_active = Column(Boolean, default=True, nullable=False)
+    min_price = Column(Integer, nullable=True)  # In cents, cheapest active package
+    min_delivery_time = Column(Integer, nullable=True)  # In days, fastest active package
+    seller_level = Column(String(20), nullable=True)
+    rating_average = Column(Float, default=0, nullable=False)  # 0 until the seller is reviewed
+    ranking_score = Column(Float, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    gig = relationship("Gig", back_populates="listing_facts")
@@ -18,4 +18,20 @@ class Message(Base):
     
     # Relationships
     sender = relationship("User", foreign_keys=[sender_id], back_populates="messages_sent")
-    recipient = relationship("User", foreign_keys=[recipient_id], back_populates="messages_received")
\ No newline at end of file
+    recipient = relationship("User", foreign_keys=[recipient_id], back_populates="messages_received")
+
+class ConversationSummary(Base):
+    """One inbox row per (user, conversation), maintained by MessageService."""
+    __tablename__ = "conversation_summaries"
+    
+    summary_id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    conversation_id = Column(String(100), nullable=False)
+    other_user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    last_message_id = Column(Integer, ForeignKey("messages.message_id"), nullable=False)
+    last_message_preview = Column(String(255), nullable=False)
+    last_message_date = Column(DateTime, nullable=False)
+    unread_count = Column(Integer, default=0, nullable=False)
+    
+    # Relationships
+    other_user = relationship("User", foreign_keys=[other_user_id])
@@ -14,7 +14,44 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     related_entity_id = Column(Integer, nullable=True)
     related_entity_type = Column(String(50), nullable=True)
+    # Key of the outbox event that produced it; dispatching twice is a no-op
+    idempotency_key = Column(String(64), nullable=True)
+    # Number of notifications a digest row stands for (server default covers the stored procedures)
+    coalesced_count = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="notifications")
\ No newline at end of file
+    user = relationship("User", back_populates="notifications")
+
+class NotificationArchive(Base):
+    """Read notifications moved out of the hot table by the retention job."""
+    __tablename__ = "notifications_archive"
+
+    notification_id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False)
+    type = Column(String(50), nullable=False)
+    content = Column(String(1000), nullable=False)
+    related_entity_id = Column(Integer, nullable=True)
+    related_entity_type = Column(String(50), nullable=True)
+    coalesced_count = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class OutboxEvent(Base):
+    """A notification-producing domain event, written in the same
+    transaction as the change that caused it and dispatched later."""
+    __tablename__ = "outbox_events"
+
+    event_id = Column(Integer, primary_key=True, index=True)
+    idempotency_key = Column(String(64), nullable=False, unique=True)
+    event_type = Column(String(50), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    content = Column(String(1000), nullable=False)
+    related_entity_id = Column(Integer, nullable=True)
+    related_entity_type = Column(String(50), nullable=True)
+    status = Column(String(20), nullable=False, default="pending")  # pending/dispatched/failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(String(500), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    dispatched_at = Column(DateTime, nullable=True)
@@ -19,4 +19,40 @@ class Payment(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
-    order = relationship("Order", back_populates="payment")
\ No newline at end of file
+    order = relationship("Order", back_populates="payment")
+
+class SellerBalance(Base):
+    """Running earnings totals per seller, maintained by SellerBalanceService."""
+    __tablename__ = "seller_balances"
+    
+    seller_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)  # Seller's user_id, as on orders
+    total_earnings = Column(Integer, default=0, nullable=False)  # In cents; completed payments
+    available_earnings = Column(Integer, default=0, nullable=False)  # Completed payments of completed orders
+    pending_earnings = Column(Integer, default=0, nullable=False)  # Pending payments of open orders
+    month_start = Column(DateTime, nullable=True)  # Month that month_earnings belongs to
+    month_earnings = Column(Integer, default=0, nullable=False)  # Completed payments created in that month
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+class EarningsLedgerEntry(Base):
+    """Append-only record of a seller's earnings movements, written by EarningsLedgerService."""
+    __tablename__ = "earnings_ledger"
+    
+    entry_id = Column(Integer, primary_key=True, index=True)
+    seller_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)  # Seller's user_id, as on orders
+    order_id = Column(Integer, ForeignKey("orders.order_id"), nullable=False)
+    payment_id = Column(Integer, ForeignKey("payments.payment_id"), nullable=False)
+    entry_type = Column(String(20), nullable=False)  # earning/reversal
+    amount = Column(Integer, nullable=False)  # In cents; negative for reversals
+    period_start = Column(DateTime, nullable=False)  # Month of the payment, as earnings periods are reported
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class EarningsRollup(Base):
+    """Completed earnings per seller and month, maintained alongside the ledger."""
+    __tablename__ = "earnings_monthly_rollups"
+    
+    rollup_id = Column(Integer, primary_key=True, index=True)
+    seller_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    period_start = Column(DateTime, nullable=False)  # First day of the month
+    earnings = Column(Integer, default=0, nullable=False)  # In cents
+    completed_orders = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
\ No newline at end of file
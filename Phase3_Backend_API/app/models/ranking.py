@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from datetime import datetime
+
+from app.database.session import Base
+
+class RankingRun(Base):
+    __tablename__ = "ranking_runs"
+    
+    run_id = Column(Integer, primary_key=True, index=True)
+    mode = Column(String(20), nullable=False)  # full/incremental
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Watermark for the next incremental run
+    finished_at = Column(DateTime, nullable=True)
+    gigs_scored = Column(Integer, default=0)
+    gigs_updated = Column(Integer, default=0)
+    duration_seconds = Column(Float, nullable=True)
@@ -108,4 +108,9 @@ class GigImageOut(GigImageBase):
     gig_id: int
     created_at: float
     
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+# Gig detail: the gig with its active packages and images
+class GigDetailOut(GigOut):
+    packages: List[GigPackageOut] = []
+    images: List[GigImageOut] = []
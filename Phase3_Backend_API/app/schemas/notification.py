@@ -10,6 +10,7 @@ class NotificationOut(BaseModel):
     is_read: bool
     related_entity_id: Optional[int] = None
     related_entity_type: Optional[str] = None
+    coalesced_count: int = 1
     created_at: datetime
     
     model_config = {"from_attributes": True}
\ No newline at end of file
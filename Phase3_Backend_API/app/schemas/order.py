@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, field_validator
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, field_validator
 
 # Order Schemas
 class OrderBase(BaseModel):
@@ -72,4 +72,27 @@ class OrderRevisionOut(OrderRevisionBase):
     response_date: Optional[datetime] = None
     status: str
     
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+# Order detail: the order with its deliveries and revision requests
+class OrderDetailOut(OrderOut):
+    deliveries: List[OrderDeliveryOut] = []
+    revisions: List[OrderRevisionOut] = []
+
+# Batch order creation (e.g. a cart checkout)
+MAX_BATCH_ORDERS = 50
+
+class OrderBatchCreate(BaseModel):
+    items: List[OrderCreate] = Field(..., min_length=1, max_length=MAX_BATCH_ORDERS)
+
+class OrderBatchItemResult(BaseModel):
+    index: int
+    status: str  # created/failed
+    order: Optional[OrderOut] = None
+    status_code: Optional[int] = None
+    detail: Optional[str] = None
+
+class OrderBatchOut(BaseModel):
+    created: int
+    failed: int
+    results: List[OrderBatchItemResult]
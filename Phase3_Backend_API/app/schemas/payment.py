@@ -25,4 +25,20 @@ class WithdrawalRequest(BaseModel):
     def validate_amount(cls, v):
         if v <= 0:
             raise ValueError('Amount must be greater than 0')
-        return v
\ No newline at end of file
+        return v
+
+class EarningsLedgerEntryOut(BaseModel):
+    entry_id: int
+    order_id: int
+    payment_id: int
+    entry_type: str
+    amount: int
+    period_start: datetime
+    created_at: datetime
+    
+    model_config = {"from_attributes": True}
+
+class EarningsPeriodOut(BaseModel):
+    period: str  # YYYY-MM
+    earnings: int
+    completed_orders: int
@@ -64,4 +64,13 @@ class Token(BaseModel):
 
 # Token data schema
 class TokenData(BaseModel):
-    user_id: Optional[int] = None
\ No newline at end of file
+    user_id: Optional[int] = None
+
+# Authenticated principal resolved from a token
+class Principal(BaseModel):
+    user_id: int
+    user_role: str
+    is_active: bool
+    seller_id: Optional[int] = None
+    
+    model_config = {"frozen": True}
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import CATEGORY_CACHE_TTL_SECONDS
+from app.models.category import Category
+from app.schemas.category import CategoryOut
+from app.services.response_cache import SEARCH_FILTERS, response_cache
+
+def _display_key(category: CategoryOut):
+    # ORDER BY display_order on SQL Server puts NULLs first
+    return (category.display_order is not None, category.display_order or 0, category.category_id)
+
+class CategorySnapshot:
+    """An immutable copy of the categories table.
+
+    Holds every category by id plus the parent -> active children adjacency
+    in display order. The version is a hash of the content, so reloading
+    unchanged data keeps the same version (and ETag).
+    """
+
+    def __init__(self, categories: List[CategoryOut]):
+        self.by_id: Dict[int, CategoryOut] = {category.category_id: category for category in categories}
+        self.active: List[CategoryOut] = sorted(
+            (category for category in categories if category.is_active), key=_display_key
+        )
+
+        self.children: Dict[Optional[int], List[CategoryOut]] = {}
+        for category in self.active:
+            self.children.setdefault(category.parent_category_id, []).append(category)
+
+        content = json.dumps(
+            [category.model_dump() for category in sorted(categories, key=lambda c: c.category_id)],
+            sort_keys=True, separators=(",", ":")
+        )
+        self.version = hashlib.sha256(content.encode()).hexdigest()[:32]
+
+    @property
+    def etag(self) -> str:
+        """Strong entity tag for responses derived from this snapshot."""
+        return f'"{self.version}"'
+
+    def get(self, category_id: int) -> Optional[CategoryOut]:
+        return self.by_id.get(category_id)
+
+    def subcategories(self, category_id: Optional[int]) -> List[CategoryOut]:
+        """Active children of a category (or top-level categories for None), in display order."""
+        return self.children.get(category_id, [])
+
+class CategoryTree:
+    """Process-wide category snapshot, loaded once and reloaded after a TTL.
+
+    There are no category write endpoints; after changing categories
+    directly in the database, call invalidate() (POST
+    /admin/categories/refresh) or wait for the TTL.
+    """
+
+    def __init__(self, ttl_seconds: int = CATEGORY_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CategorySnapshot] = None
+        self._loaded_at = 0.0
+        self.loads = 0
+
+    def _load(self, db: Session) -> CategorySnapshot:
+        categories = [CategoryOut.model_validate(category) for category in db.query(Category).all()]
+        self.loads += 1
+        return CategorySnapshot(categories)
+
+    def snapshot(self, db: Session) -> CategorySnapshot:
+        """Current snapshot, loading it from the database if missing or expired."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is snapshot:
+                self._snapshot = self._load(db)
+                self._loaded_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self):
+        """Drop the snapshot (and the filters built from it); the next request reloads it."""
+        with self._lock:
+            self._snapshot = None
+        response_cache.invalidate_route(SEARCH_FILTERS)
+
+    def stats(self):
+        """Version and load counters of the current snapshot."""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "categories": len(snapshot.by_id) if snapshot else 0,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if snapshot else None,
+            "ttl_seconds": self.ttl_seconds,
+            "loads": self.loads,
+        }
+
+# Process-wide tree shared by the category and search endpoints
+category_tree = CategoryTree()
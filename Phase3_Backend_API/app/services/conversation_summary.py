@@ -0,0 +1,218 @@
+from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func, insert, literal, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.message import Message, ConversationSummary
+from app.models.user import User
+from app.schemas.message import ConversationOut
+from app.utils.pagination import CursorPage, decode_cursor, encode_cursor, keyset_condition
+
+# Characters of the last message kept for the inbox preview
+PREVIEW_LENGTH = 255
+
+# Rows written per INSERT batch during a full rebuild
+REBUILD_BATCH_SIZE = 1000
+
+class ConversationSummaryService:
+    """Maintains conversation_summaries, the per-user inbox projection.
+
+    Write methods do not commit; MessageService calls them inside the same
+    transaction as the message change they reflect.
+    """
+
+    @staticmethod
+    def _upsert(db: Session, user_id: int, other_user_id: int, message: Message, unread_increment: int):
+        # A message that commits late must not replace a newer preview
+        newer = ConversationSummary.last_message_id < message.message_id
+        values = {
+            "last_message_id": message.message_id,
+            "last_message_preview": message.content[:PREVIEW_LENGTH],
+            "last_message_date": message.created_at
+        }
+        update_statement = update(ConversationSummary).where(
+            ConversationSummary.user_id == user_id,
+            ConversationSummary.conversation_id == message.conversation_id
+        ).values(
+            unread_count=ConversationSummary.unread_count + unread_increment,
+            **{name: case((newer, value), else_=getattr(ConversationSummary, name)) for name, value in values.items()}
+        ).execution_options(synchronize_session=False)
+
+        if db.execute(update_statement).rowcount:
+            return
+
+        try:
+            with db.begin_nested():
+                db.execute(insert(ConversationSummary).values(
+                    user_id=user_id,
+                    conversation_id=message.conversation_id,
+                    other_user_id=other_user_id,
+                    unread_count=unread_increment,
+                    **values
+                ))
+        except IntegrityError:
+            # The first message of a conversation sent concurrently created the row
+            db.execute(update_statement)
+
+    @staticmethod
+    def record_message(db: Session, message: Message):
+        """Reflect a newly sent (and flushed) message in both participants' inboxes."""
+        ConversationSummaryService._upsert(db, message.sender_id, message.recipient_id, message, 0)
+        if message.recipient_id != message.sender_id:
+            ConversationSummaryService._upsert(db, message.recipient_id, message.sender_id, message, 1)
+        db.flush()
+
+    @staticmethod
+    def _decrement_unread_statement(user_id: int, conversation_id: str, count: int):
+        return update(ConversationSummary).where(
+            ConversationSummary.user_id == user_id,
+            ConversationSummary.conversation_id == conversation_id
+        ).values(
+            unread_count=case(
+                (ConversationSummary.unread_count > count, ConversationSummary.unread_count - count),
+                else_=0
+            )
+        ).execution_options(synchronize_session=False)
+
+    @staticmethod
+    def decrement_unread(db: Session, user_id: int, conversation_id: str, count: int):
+        """Lower a user's unread counter for a conversation, never below zero."""
+        if count <= 0:
+            return
+
+        db.execute(ConversationSummaryService._decrement_unread_statement(user_id, conversation_id, count))
+
+    @staticmethod
+    def _unread_total_statement(user_id: int):
+        return select(func.coalesce(func.sum(ConversationSummary.unread_count), 0)).where(
+            ConversationSummary.user_id == user_id
+        )
+
+    @staticmethod
+    def _inbox_statement(user_id: int, limit: int, cursor: Optional[str]):
+        statement = select(
+            ConversationSummary, User.full_name
+        ).outerjoin(
+            User, User.user_id == ConversationSummary.other_user_id
+        ).where(
+            ConversationSummary.user_id == user_id
+        ).order_by(
+            ConversationSummary.last_message_date.desc(), ConversationSummary.last_message_id.desc()
+        )
+
+        if cursor:
+            key = decode_cursor(cursor, "last_message_date")
+            statement = statement.where(keyset_condition(
+                [ConversationSummary.last_message_date, ConversationSummary.last_message_id], key
+            ))
+
+        return statement.limit(limit)
+
+    @staticmethod
+    def _inbox_page(rows, limit: int) -> CursorPage:
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1][0]
+            next_cursor = encode_cursor("last_message_date", [last.last_message_date, last.last_message_id])
+
+        return CursorPage(
+            (
+                ConversationOut(
+                    conversation_id=summary.conversation_id,
+                    other_user_id=summary.other_user_id,
+                    other_user_name=full_name or "Unknown",
+                    last_message_content=summary.last_message_preview,
+                    last_message_date=summary.last_message_date,
+                    unread_count=summary.unread_count
+                )
+                for summary, full_name in rows
+            ),
+            next_cursor
+        )
+
+    @staticmethod
+    def get_inbox(db: Session, user_id: int, limit: int = 50, cursor: Optional[str] = None) -> CursorPage:
+        """Read a page of a user's inbox, most recently active first."""
+        rows = db.execute(ConversationSummaryService._inbox_statement(user_id, limit, cursor)).all()
+        return ConversationSummaryService._inbox_page(rows, limit)
+
+    @staticmethod
+    def _compute_summaries(db: Session) -> List[Dict[str, Any]]:
+        """Derive every inbox row from the messages table."""
+        # Each message appears once in the sender's inbox and once in the recipient's
+        participants = union_all(
+            db.query(
+                Message.message_id.label("message_id"),
+                Message.conversation_id.label("conversation_id"),
+                Message.sender_id.label("user_id"),
+                Message.recipient_id.label("other_user_id"),
+                Message.content.label("content"),
+                Message.created_at.label("created_at"),
+                literal(0).label("unread")
+            ),
+            db.query(
+                Message.message_id.label("message_id"),
+                Message.conversation_id.label("conversation_id"),
+                Message.recipient_id.label("user_id"),
+                Message.sender_id.label("other_user_id"),
+                Message.content.label("content"),
+                Message.created_at.label("created_at"),
+                case((Message.is_read == False, 1), else_=0).label("unread")
+            ).filter(Message.recipient_id != Message.sender_id)
+        ).subquery()
+
+        ranked = db.query(
+            participants,
+            func.row_number().over(
+                partition_by=(participants.c.user_id, participants.c.conversation_id),
+                order_by=(participants.c.created_at.desc(), participants.c.message_id.desc())
+            ).label("position"),
+            func.sum(participants.c.unread).over(
+                partition_by=(participants.c.user_id, participants.c.conversation_id)
+            ).label("unread_count")
+        ).subquery()
+
+        rows = db.query(ranked).filter(ranked.c.position == 1).all()
+
+        return [
+            {
+                "user_id": row.user_id,
+                "conversation_id": row.conversation_id,
+                "other_user_id": row.other_user_id,
+                "last_message_id": row.message_id,
+                "last_message_preview": row.content[:PREVIEW_LENGTH],
+                "last_message_date": row.created_at,
+                "unread_count": row.unread_count or 0
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Rebuild conversation_summaries from the messages table."""
+        rows = ConversationSummaryService._compute_summaries(db)
+
+        db.query(ConversationSummary).delete(synchronize_session=False)
+        for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+            db.execute(insert(ConversationSummary), rows[start:start + REBUILD_BATCH_SIZE])
+        db.commit()
+
+        return len(rows)
+
+class AsyncConversationSummaryService:
+    """ConversationSummaryService for async endpoints."""
+
+    @staticmethod
+    async def decrement_unread(db: AsyncSession, user_id: int, conversation_id: str, count: int):
+        """Lower a user's unread counter for a conversation, never below zero."""
+        if count <= 0:
+            return
+
+        await db.execute(ConversationSummaryService._decrement_unread_statement(user_id, conversation_id, count))
+
+    @staticmethod
+    async def get_inbox(db: AsyncSession, user_id: int, limit: int = 50, cursor: Optional[str] = None) -> CursorPage:
+        """Read a page of a user's inbox, most recently active first."""
+        rows = (await db.execute(ConversationSummaryService._inbox_statement(user_id, limit, cursor))).all()
+        return ConversationSummaryService._inbox_page(rows, limit)
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.order import Order
+from app.models.payment import Payment, EarningsLedgerEntry, EarningsRollup
+from app.utils.pagination import CursorPage, decode_cursor, encode_cursor, keyset_condition
+
+# Rows written per INSERT batch during a full rebuild
+REBUILD_BATCH_SIZE = 1000
+
+def month_of(value: datetime) -> datetime:
+    """First instant of the month containing `value`."""
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def next_month(value: datetime) -> datetime:
+    """First instant of the month after the one containing `value`."""
+    return (month_of(value) + timedelta(days=32)).replace(day=1)
+
+class EarningsLedgerService:
+    """Maintains the earnings ledger and its monthly rollups.
+
+    A payment entering "completed" appends an earning entry; leaving it
+    appends a reversal. Each entry adjusts the rollup row for the
+    payment's month, so period reports read one row per month instead of
+    grouping the seller's payments. Periods follow the payment's creation
+    month, as fn_GetEarningsByPeriod always has. Only rebuild commits.
+    """
+
+    @staticmethod
+    def record_payment_change(db: Session, order: Order, payment: Payment, old_payment_status: Optional[str]):
+        """Append a ledger entry if the payment moved in or out of "completed"."""
+        was_completed = old_payment_status == "completed"
+        is_completed = payment.status == "completed"
+        if was_completed == is_completed:
+            return
+
+        sign = 1 if is_completed else -1
+        period_start = month_of(payment.created_at or datetime.utcnow())
+        db.add(EarningsLedgerEntry(
+            seller_id=order.seller_id,
+            order_id=order.order_id,
+            payment_id=payment.payment_id,
+            entry_type="earning" if is_completed else "reversal",
+            amount=sign * payment.seller_amount,
+            period_start=period_start
+        ))
+
+        update_statement = update(EarningsRollup).where(
+            EarningsRollup.seller_id == order.seller_id,
+            EarningsRollup.period_start == period_start
+        ).values(
+            earnings=EarningsRollup.earnings + sign * payment.seller_amount,
+            completed_orders=EarningsRollup.completed_orders + sign
+        ).execution_options(synchronize_session=False)
+
+        if db.execute(update_statement).rowcount:
+            return
+
+        try:
+            with db.begin_nested():
+                db.execute(insert(EarningsRollup).values(
+                    seller_id=order.seller_id,
+                    period_start=period_start,
+                    earnings=sign * payment.seller_amount,
+                    completed_orders=sign
+                ))
+        except IntegrityError:
+            # Another completion created this month's rollup first
+            db.execute(update_statement)
+
+    @staticmethod
+    def get_periods(
+        db: Session,
+        seller_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Earnings per month from completed payments created within the range.
+
+        Months wholly inside the range come from the rollups; the partial
+        months at either end are summed from their payments, so a range
+        that starts or ends mid-month counts only the payments inside it.
+        """
+        # Rollups cover [full_from, full_to); anything else in range is an edge
+        full_from = None
+        if start_date:
+            full_from = start_date if start_date == month_of(start_date) else next_month(start_date)
+        full_to = month_of(end_date) if end_date else None
+
+        query = db.query(EarningsRollup).filter(EarningsRollup.seller_id == seller_id)
+        if full_from:
+            query = query.filter(EarningsRollup.period_start >= full_from)
+        if full_to:
+            query = query.filter(EarningsRollup.period_start < full_to)
+        periods = {rollup.period_start: [rollup.earnings, rollup.completed_orders] for rollup in query}
+
+        edges = []
+        if full_from and full_from != start_date:
+            edges.append(Payment.created_at < full_from)
+        if full_to:
+            edges.append(Payment.created_at >= full_to)
+        if edges:
+            statement = select(Payment.seller_amount, Payment.created_at).join(
+                Order, Payment.order_id == Order.order_id
+            ).where(Order.seller_id == seller_id, Payment.status == "completed", or_(*edges))
+            if start_date:
+                statement = statement.where(Payment.created_at >= start_date)
+            if end_date:
+                statement = statement.where(Payment.created_at <= end_date)
+            for row in db.execute(statement):
+                totals = periods.setdefault(month_of(row.created_at), [0, 0])
+                totals[0] += row.seller_amount
+                totals[1] += 1
+
+        return [
+            {"period": period_start.strftime("%Y-%m"), "earnings": earnings, "completed_orders": count}
+            for period_start, (earnings, count) in sorted(periods.items(), reverse=True)
+            if count > 0
+        ]
+
+    @staticmethod
+    def get_history(db: Session, seller_id: int, limit: int = 20, cursor: Optional[str] = None) -> CursorPage:
+        """A page of ledger entries, newest first."""
+        statement = select(EarningsLedgerEntry).where(EarningsLedgerEntry.seller_id == seller_id)
+        if cursor:
+            key = decode_cursor(cursor, "entry_id")
+            statement = statement.where(keyset_condition([EarningsLedgerEntry.entry_id], key))
+
+        entries = db.scalars(statement.order_by(EarningsLedgerEntry.entry_id.desc()).limit(limit)).all()
+
+        next_cursor = None
+        if len(entries) == limit:
+            next_cursor = encode_cursor("entry_id", [entries[-1].entry_id])
+        return CursorPage(entries, next_cursor)
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Rebuild the ledger and rollups from completed payments (one earning entry each)."""
+        payments = db.execute(
+            select(
+                Order.seller_id, Payment.order_id, Payment.payment_id, Payment.seller_amount, Payment.created_at
+            ).join(Order, Payment.order_id == Order.order_id).where(
+                Payment.status == "completed"
+            ).order_by(Payment.created_at, Payment.payment_id)
+        ).all()
+
+        entries = []
+        rollups: Dict[Tuple[int, datetime], List[int]] = {}
+        for row in payments:
+            period_start = month_of(row.created_at)
+            entries.append({
+                "seller_id": row.seller_id,
+                "order_id": row.order_id,
+                "payment_id": row.payment_id,
+                "entry_type": "earning",
+                "amount": row.seller_amount,
+                "period_start": period_start,
+                "created_at": row.created_at
+            })
+            totals = rollups.setdefault((row.seller_id, period_start), [0, 0])
+            totals[0] += row.seller_amount
+            totals[1] += 1
+
+        rollup_rows = [
+            {"seller_id": seller_id, "period_start": period_start, "earnings": earnings, "completed_orders": count}
+            for (seller_id, period_start), (earnings, count) in rollups.items()
+        ]
+
+        db.execute(delete(EarningsLedgerEntry))
+        db.execute(delete(EarningsRollup))
+        for rows, model in ((entries, EarningsLedgerEntry), (rollup_rows, EarningsRollup)):
+            for i in range(0, len(rows), REBUILD_BATCH_SIZE):
+                db.execute(insert(model), rows[i:i + REBUILD_BATCH_SIZE])
+        db.commit()
+
+        return len(entries)
@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam
+
+from app.core.config import (
+    ENGAGEMENT_FLUSH_SECONDS, ENGAGEMENT_MAX_PENDING_GIGS, ENGAGEMENT_HARD_MAX_PENDING_GIGS
+)
+from app.database.session import SessionLocal
+from app.models.gig import Gig
+
+logger = logging.getLogger(__name__)
+
+gigs_table = Gig.__table__
+
+# One statement, executed once per pending gig in a single executemany
+INCREMENT_STATEMENT = gigs_table.update().where(
+    gigs_table.c.gig_id == bindparam("b_gig_id")
+).values(
+    impression_count=gigs_table.c.impression_count + bindparam("b_impressions"),
+    click_count=gigs_table.c.click_count + bindparam("b_clicks"),
+    # Traffic is not an edit; leave updated_at (and incremental ranking) alone
+    updated_at=gigs_table.c.updated_at
+)
+
+class EngagementCounter:
+    """Write-behind aggregator for gig impression and click counts.
+
+    Views and clicks only bump an in-memory counter per gig. A background
+    thread periodically writes all pending increments with one batched
+    UPDATE, so the read path never opens a write transaction or takes a row
+    lock on a hot gig. The buffer is bounded by the number of distinct
+    gigs: past `max_pending_gigs` the flusher is woken early, and past
+    `hard_max_pending_gigs` (e.g. while the database is down) increments
+    for gigs not already buffered are dropped and counted. Requests never
+    flush themselves. After a failed flush the flusher waits a full
+    interval before trying again.
+    """
+
+    def __init__(
+        self,
+        flush_seconds: float = ENGAGEMENT_FLUSH_SECONDS,
+        max_pending_gigs: int = ENGAGEMENT_MAX_PENDING_GIGS,
+        hard_max_pending_gigs: int = ENGAGEMENT_HARD_MAX_PENDING_GIGS,
+        session_factory=SessionLocal
+    ):
+        self.flush_seconds = flush_seconds
+        self.max_pending_gigs = max_pending_gigs
+        self.hard_max_pending_gigs = max(hard_max_pending_gigs, max_pending_gigs)
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Dict[int, List[int]] = {}
+        self._last_flush_failed = False
+        self._stats = {
+            "recorded_impressions": 0,
+            "recorded_clicks": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "dropped_impressions": 0,
+            "dropped_clicks": 0,
+            "flushed_rows": 0,
+            "flushed_impressions": 0,
+            "flushed_clicks": 0,
+            "last_flush_at": None,
+            "last_flush_ms": None,
+        }
+
+    def _add(self, gig_id: int, impressions: int, clicks: int):
+        """Buffer increments for a gig (caller holds the lock)."""
+        counts = self._pending.get(gig_id)
+        if counts is None:
+            if len(self._pending) >= self.hard_max_pending_gigs:
+                self._stats["dropped_impressions"] += impressions
+                self._stats["dropped_clicks"] += clicks
+                return
+            counts = self._pending[gig_id] = [0, 0]
+        counts[0] += impressions
+        counts[1] += clicks
+
+    def _record(self, gig_id: int, impressions: int, clicks: int):
+        with self._lock:
+            self._add(gig_id, impressions, clicks)
+            self._stats["recorded_impressions"] += impressions
+            self._stats["recorded_clicks"] += clicks
+            pending_gigs = len(self._pending)
+
+        if pending_gigs >= self.max_pending_gigs:
+            self._wake.set()
+
+    def record_impression(self, gig_id: int):
+        """Count one view of a gig."""
+        self._record(gig_id, 1, 0)
+
+    def record_click(self, gig_id: int):
+        """Count one click on a gig."""
+        self._record(gig_id, 0, 1)
+
+    def _requeue(self, pending: Dict[int, List[int]]):
+        with self._lock:
+            for gig_id, (impressions, clicks) in pending.items():
+                self._add(gig_id, impressions, clicks)
+
+    def flush(self) -> int:
+        """Write all pending increments to the database. Returns the rows written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+
+            if not pending:
+                self._last_flush_failed = False
+                return 0
+
+            rows = [
+                {"b_gig_id": gig_id, "b_impressions": impressions, "b_clicks": clicks}
+                for gig_id, (impressions, clicks) in sorted(pending.items())
+            ]
+
+            started = time.perf_counter()
+            db = self.session_factory()
+            try:
+                db.execute(INCREMENT_STATEMENT, rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                # Keep the counts for the next attempt rather than losing them
+                self._requeue(pending)
+                with self._lock:
+                    self._stats["failed_flushes"] += 1
+                self._last_flush_failed = True
+                logger.exception("Failed to flush gig engagement counters")
+                return 0
+            finally:
+                db.close()
+
+            self._last_flush_failed = False
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["flushed_rows"] += len(rows)
+                self._stats["flushed_impressions"] += sum(row["b_impressions"] for row in rows)
+                self._stats["flushed_clicks"] += sum(row["b_clicks"] for row in rows)
+                self._stats["last_flush_at"] = datetime.utcnow()
+                self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            return len(rows)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+            if self._last_flush_failed:
+                # Do not let wake-ups from a full buffer hammer a failing database
+                self._stopping.wait(self.flush_seconds)
+
+    def start(self):
+        """Start the background flusher thread."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="engagement-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher and write whatever is still pending."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            thread.join()
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters describing buffered and flushed engagement."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending_gigs"] = len(self._pending)
+            stats["pending_impressions"] = sum(counts[0] for counts in self._pending.values())
+            stats["pending_clicks"] = sum(counts[1] for counts in self._pending.values())
+        stats["max_pending_gigs"] = self.max_pending_gigs
+        stats["hard_max_pending_gigs"] = self.hard_max_pending_gigs
+        stats["flush_seconds"] = self.flush_seconds
+        stats["running"] = self._thread is not None
+        return stats
+
+# Process-wide aggregator, started and stopped with the application
+engagement_counter = EngagementCounter()
@@ -3,10 +3,16 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, asc, and_, or_
 
-from app.models.gig import Gig, GigPackage, GigImage
+from app.models.gig import Gig, GigPackage, GigImage, GigListingFacts
 from app.models.user import SellerProfile
 from app.models.category import Category
+from app.database.loading import apply_profile
 from app.schemas.gig import GigCreate, GigUpdate, GigPackageCreate
+from app.services.listing_facts import ListingFactsService
+from app.services.response_cache import invalidate_gig_listings
+from app.services.search_index import search_backend
+from app.services.suggestions import suggestion_index
+from app.utils.pagination import CursorPage, decode_cursor, encode_cursor, keyset_condition
 
 class GigService:
     @staticmethod
@@ -22,17 +28,25 @@ class GigService:
         seller_level: Optional[str] = None,
         sort_by: str = "ranking",
         sort_order: str = "desc",
-        search: Optional[str] = None
-    ) -> List[Gig]:
-        """Get gigs with filtering and sorting."""
-        query = db.query(Gig).filter(Gig.is_active == True)
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get gigs with filtering and sorting.
+
+        Pass the previous page's next_cursor as `cursor` to page by keyset
+        instead of `skip`.
+        """
+        # Filtering and sorting run against the listing facts projection
+        query = apply_profile(db.query(Gig), "gig_card").join(
+            GigListingFacts, Gig.gig_id == GigListingFacts.gig_id
+        ).filter(GigListingFacts.is_active == True)
         
         # Apply filters
         if category_id:
-            query = query.filter(Gig.category_id == category_id)
+            query = query.filter(GigListingFacts.category_id == category_id)
         
         if subcategory_id:
-            query = query.filter(Gig.subcategory_id == subcategory_id)
+            query = query.filter(GigListingFacts.subcategory_id == subcategory_id)
         
         if search:
             search_filter = or_(
@@ -42,59 +56,76 @@ class GigService:
             )
             query = query.filter(search_filter)
         
-        # Price filtering (get min price from packages)
-        if min_price or max_price:
-            from sqlalchemy import func
-            subquery = db.query(
-                GigPackage.gig_id,
-                func.min(GigPackage.price).label('min_price')
-            ).filter(GigPackage.is_active == True).group_by(GigPackage.gig_id).subquery()
-            
-            query = query.join(subquery, Gig.gig_id == subquery.c.gig_id)
-            
-            if min_price:
-                query = query.filter(subquery.c.min_price >= min_price)
-            if max_price:
-                query = query.filter(subquery.c.min_price <= max_price)
+        # Price filtering (cheapest active package)
+        if min_price:
+            query = query.filter(GigListingFacts.min_price >= min_price)
+        if max_price:
+            query = query.filter(GigListingFacts.min_price <= max_price)
         
         # Delivery time filtering
         if delivery_time:
-            from sqlalchemy import func
-            delivery_subquery = db.query(
-                GigPackage.gig_id,
-                func.min(GigPackage.delivery_time).label('min_delivery')
-            ).filter(GigPackage.is_active == True).group_by(GigPackage.gig_id).subquery()
-            
-            query = query.join(delivery_subquery, Gig.gig_id == delivery_subquery.c.gig_id)
-            query = query.filter(delivery_subquery.c.min_delivery <= delivery_time)
+            query = query.filter(GigListingFacts.min_delivery_time <= delivery_time)
         
         # Seller level filtering
         if seller_level:
-            query = query.join(SellerProfile, Gig.seller_id == SellerProfile.seller_id)
-            query = query.filter(SellerProfile.account_level == seller_level)
+            query = query.filter(GigListingFacts.seller_level == seller_level)
         
         # Apply sorting
         if sort_by == "ranking":
-            order_field = Gig.ranking_score
+            order_field = GigListingFacts.ranking_score
         elif sort_by == "price":
-            # This would require a subquery for min price
-            order_field = Gig.created_at  # Fallback
+            # Gigs without an active package have no price to sort by
+            order_field = GigListingFacts.min_price
+            query = query.filter(GigListingFacts.min_price.isnot(None))
         elif sort_by == "delivery_time":
-            order_field = Gig.created_at  # Fallback
-        else:  # rating or default
-            order_field = Gig.ranking_score
+            order_field = GigListingFacts.min_delivery_time
+            query = query.filter(GigListingFacts.min_delivery_time.isnot(None))
+        elif sort_by == "rating":
+            order_field = GigListingFacts.rating_average
+        else:
+            order_field = GigListingFacts.ranking_score
         
         if sort_order == "desc":
-            query = query.order_by(desc(order_field))
+            query = query.order_by(desc(order_field), desc(Gig.gig_id))
+        else:
+            query = query.order_by(asc(order_field), asc(Gig.gig_id))
+        
+        # Keyset pagination continues after the last row of the previous page
+        sort_key = f"{sort_by}:{sort_order}"
+        if cursor:
+            key = decode_cursor(cursor, sort_key)
+            query = query.filter(
+                keyset_condition([order_field, Gig.gig_id], key, descending=sort_order == "desc")
+            )
         else:
-            query = query.order_by(asc(order_field))
+            query = query.offset(skip)
+        
+        rows = query.add_columns(order_field).limit(limit).all()
         
-        return query.offset(skip).limit(limit).all()
+        next_cursor = None
+        if len(rows) == limit:
+            last_gig, last_value = rows[-1]
+            next_cursor = encode_cursor(sort_key, [last_value, last_gig.gig_id])
+        
+        return CursorPage((gig for gig, _ in rows), next_cursor)
 
     @staticmethod
-    def get_gig_by_id(db: Session, gig_id: int) -> Optional[Gig]:
-        """Get gig by ID."""
-        return db.query(Gig).filter(Gig.gig_id == gig_id, Gig.is_active == True).first()
+    def get_featured_gigs(db: Session, limit: int = 10) -> List[Gig]:
+        """Get featured gigs by ranking."""
+        return apply_profile(db.query(Gig), "gig_card").filter(
+            Gig.is_featured == True,
+            Gig.is_active == True
+        ).order_by(desc(Gig.ranking_score)).limit(limit).all()
+
+    @staticmethod
+    def get_seller_gigs(db: Session, seller_id: int) -> List[Gig]:
+        """Get all gigs of a seller, including inactive ones."""
+        return apply_profile(db.query(Gig), "gig_card").filter(Gig.seller_id == seller_id).all()
+
+    @staticmethod
+    def get_gig_by_id(db: Session, gig_id: int, profile: str = "gig_card") -> Optional[Gig]:
+        """Get gig by ID, loading the relationships of the given profile."""
+        return apply_profile(db.query(Gig), profile).filter(Gig.gig_id == gig_id, Gig.is_active == True).first()
 
     @staticmethod
     def create_gig(db: Session, gig_data: GigCreate, seller_id: int) -> Gig:
@@ -155,9 +186,15 @@ class GigService:
         )
         
         db.add(gig)
+        db.flush()
+        ListingFactsService.refresh_gigs(db, [gig.gig_id])
         db.commit()
         db.refresh(gig)
         
+        search_backend.index_gig(db, gig)
+        suggestion_index.index_gig(gig)
+        invalidate_gig_listings()
+        
         return gig
 
     @staticmethod
@@ -178,8 +215,14 @@ class GigService:
         for field, value in update_data.items():
             setattr(gig, field, value)
         
+        db.flush()
+        ListingFactsService.refresh_gigs(db, [gig.gig_id])
         db.commit()
         db.refresh(gig)
+        
+        search_backend.index_gig(db, gig)
+        suggestion_index.index_gig(gig)
+        invalidate_gig_listings()
         return gig
 
     @staticmethod
@@ -197,7 +240,13 @@ class GigService:
             )
         
         gig.is_active = False
+        db.flush()
+        ListingFactsService.refresh_gigs(db, [gig_id])
         db.commit()
+        
+        search_backend.remove_gig(gig_id)
+        suggestion_index.remove_gig(gig_id)
+        invalidate_gig_listings()
         return True
 
     @staticmethod
@@ -242,7 +291,10 @@ class GigService:
         )
         
         db.add(package)
+        db.flush()
+        ListingFactsService.refresh_gigs(db, [gig_id])
         db.commit()
         db.refresh(package)
+        invalidate_gig_listings()
         
         return package
\ No newline at end of file
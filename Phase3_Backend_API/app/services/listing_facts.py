@@ -0,0 +1,115 @@
+from typing import Optional, List, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+
+from app.models.gig import Gig, GigPackage, GigListingFacts
+from app.models.user import SellerProfile
+
+# Rows written per INSERT batch during a full rebuild
+REBUILD_BATCH_SIZE = 1000
+
+class ListingFactsService:
+    """Maintains the gig_listing_facts projection.
+
+    None of these methods commit; callers run them inside the same
+    transaction as the write that changed the underlying rows.
+    """
+
+    @staticmethod
+    def _compute_facts(db: Session, gig_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Compute listing facts for the given gigs (or all gigs)."""
+        package_query = db.query(
+            GigPackage.gig_id,
+            func.min(GigPackage.price).label('min_price'),
+            func.min(GigPackage.delivery_time).label('min_delivery_time')
+        ).filter(GigPackage.is_active == True)
+        if gig_ids is not None:
+            package_query = package_query.filter(GigPackage.gig_id.in_(gig_ids))
+        package_subquery = package_query.group_by(GigPackage.gig_id).subquery()
+
+        query = db.query(
+            Gig.gig_id,
+            Gig.seller_id,
+            Gig.category_id,
+            Gig.subcategory_id,
+            Gig.is_active,
+            Gig.ranking_score,
+            package_subquery.c.min_price,
+            package_subquery.c.min_delivery_time,
+            SellerProfile.account_level,
+            SellerProfile.rating_average
+        ).outerjoin(
+            package_subquery, Gig.gig_id == package_subquery.c.gig_id
+        ).outerjoin(
+            SellerProfile, Gig.seller_id == SellerProfile.seller_id
+        )
+        if gig_ids is not None:
+            query = query.filter(Gig.gig_id.in_(gig_ids))
+
+        return [
+            {
+                "gig_id": row.gig_id,
+                "seller_id": row.seller_id,
+                "category_id": row.category_id,
+                "subcategory_id": row.subcategory_id,
+                "is_active": bool(row.is_active),
+                "min_price": row.min_price,
+                "min_delivery_time": row.min_delivery_time,
+                "seller_level": row.account_level,
+                "rating_average": row.rating_average or 0.0,
+                "ranking_score": row.ranking_score or 0.0
+            }
+            for row in query.all()
+        ]
+
+    @staticmethod
+    def refresh_gigs(db: Session, gig_ids: List[int]):
+        """Recompute the listing facts of specific gigs."""
+        if not gig_ids:
+            return
+
+        existing = {
+            facts.gig_id: facts
+            for facts in db.query(GigListingFacts).filter(GigListingFacts.gig_id.in_(gig_ids)).all()
+        }
+
+        for values in ListingFactsService._compute_facts(db, gig_ids):
+            facts = existing.get(values["gig_id"])
+            if facts is None:
+                db.add(GigListingFacts(**values))
+            else:
+                for field, value in values.items():
+                    setattr(facts, field, value)
+
+        db.flush()
+
+    @staticmethod
+    def refresh_seller(db: Session, seller_id: int):
+        """Copy a seller's level and rating onto all of their gigs' facts."""
+        # Column query so values changed by triggers in this transaction are seen
+        seller = db.query(
+            SellerProfile.account_level,
+            SellerProfile.rating_average
+        ).filter(SellerProfile.seller_id == seller_id).first()
+        if not seller:
+            return
+
+        db.query(GigListingFacts).filter(GigListingFacts.seller_id == seller_id).update(
+            {
+                "seller_level": seller.account_level,
+                "rating_average": seller.rating_average or 0.0
+            },
+            synchronize_session=False
+        )
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Rebuild the whole projection from gigs, packages and seller profiles."""
+        rows = ListingFactsService._compute_facts(db)
+
+        db.query(GigListingFacts).delete(synchronize_session=False)
+        for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+            db.execute(insert(GigListingFacts), rows[start:start + REBUILD_BATCH_SIZE])
+        db.commit()
+
+        return len(rows)
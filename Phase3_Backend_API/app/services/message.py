@@ -1,13 +1,18 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
 
 from app.models.message import Message
 from app.models.user import User
-from app.models.notification import Notification
-from app.schemas.message import MessageCreate, ConversationOut
+from app.schemas.message import MessageCreate, MessageOut
+from app.services.conversation_summary import ConversationSummaryService, AsyncConversationSummaryService
+from app.services.outbox import OutboxService
+from app.services.push import push_hub
+from app.services.unread import MESSAGES, unread_counters
+from app.utils.pagination import CursorPage, decode_cursor, encode_cursor, keyset_condition
 
 class MessageService:
     @staticmethod
@@ -40,106 +45,139 @@ class MessageService:
         )
         
         db.add(message)
+        db.flush()
+        
+        ConversationSummaryService.record_message(db, message)
         
         # Create notification for recipient
-        notification = Notification(
+        OutboxService.publish(
+            db,
             user_id=message_data.recipient_id,
-            type="new_message",
+            event_type="new_message",
             content="You have received a new message",
             related_entity_id=message.message_id,
             related_entity_type="message"
         )
-        
-        db.add(notification)
         db.commit()
         db.refresh(message)
         
+        if message.recipient_id != sender_id:
+            unread_counters.add(MESSAGES, message.recipient_id, 1)
+        push_hub.publish(message.recipient_id, "message", MessageOut.model_validate(message))
+        
         return message
 
     @staticmethod
-    def get_conversations(db: Session, user_id: int) -> List[ConversationOut]:
-        """Get all conversations for a user."""
-        # Get all unique conversation IDs for the user
-        conversations = db.query(Message.conversation_id).filter(
-            or_(Message.sender_id == user_id, Message.recipient_id == user_id)
-        ).distinct().all()
-        
-        conversation_list = []
-        
-        for (conversation_id,) in conversations:
-            # Get the last message in this conversation
-            last_message = db.query(Message).filter(
-                Message.conversation_id == conversation_id
-            ).order_by(Message.created_at.desc()).first()
-            
-            if last_message:
-                # Determine the other user in the conversation
-                other_user_id = (
-                    last_message.recipient_id if last_message.sender_id == user_id 
-                    else last_message.sender_id
-                )
-                
-                other_user = db.query(User).filter(User.user_id == other_user_id).first()
-                
-                # Count unread messages
-                unread_count = db.query(Message).filter(
-                    and_(
-                        Message.conversation_id == conversation_id,
-                        Message.recipient_id == user_id,
-                        Message.is_read == False
-                    )
-                ).count()
-                
-                conversation_list.append(ConversationOut(
-                    conversation_id=conversation_id,
-                    other_user_id=other_user_id,
-                    other_user_name=other_user.full_name if other_user else "Unknown",
-                    last_message_content=last_message.content,
-                    last_message_date=last_message.created_at,
-                    unread_count=unread_count
-                ))
-        
-        # Sort by last message date
-        conversation_list.sort(key=lambda x: x.last_message_date, reverse=True)
-        
-        return conversation_list
-
-    @staticmethod
-    def get_conversation_messages(
+    def get_conversations(
         db: Session, 
-        conversation_id: str, 
         user_id: int, 
-        skip: int = 0, 
-        limit: int = 50
-    ) -> List[Message]:
-        """Get messages in a conversation."""
-        # Verify user is part of this conversation
+        limit: int = 50, 
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get conversations for a user, most recently active first."""
+        # Served from the maintained conversation_summaries projection
+        return ConversationSummaryService.get_inbox(db, user_id, limit=limit, cursor=cursor)
+
+    @staticmethod
+    def _check_participant(conversation_id: str, user_id: int):
+        """Verify user is part of the conversation."""
         user_ids = conversation_id.split('-')
         if str(user_id) not in user_ids:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have access to this conversation"
             )
+
+    @staticmethod
+    def _mark_read_statement(conversation_id: str, user_id: int, up_to_message_id: Optional[int]):
+        statement = update(Message).where(
+            Message.conversation_id == conversation_id,
+            Message.recipient_id == user_id,
+            Message.is_read == False
+        )
+        if up_to_message_id is not None:
+            statement = statement.where(Message.message_id <= up_to_message_id)
+        
+        return statement.values(is_read=True)
+
+    @staticmethod
+    def _mark_read_up_to(
+        db: Session, 
+        conversation_id: str, 
+        user_id: int, 
+        up_to_message_id: Optional[int] = None
+    ) -> int:
+        """Mark a user's unread messages in a conversation as read in one UPDATE.
+
+        Only messages with an id at or below the watermark are touched, so
+        messages that arrive while the client is reading stay unread.
+        Returns the number of messages marked; the caller adjusts the
+        unread counter once it has committed.
+        """
+        statement = MessageService._mark_read_statement(conversation_id, user_id, up_to_message_id)
+        # "evaluate" keeps message objects already in the session in step without a SELECT
+        marked = db.execute(statement, execution_options={"synchronize_session": "evaluate"}).rowcount
+        ConversationSummaryService.decrement_unread(db, user_id, conversation_id, marked)
+        
+        return marked
+
+    @staticmethod
+    def mark_conversation_read(
+        db: Session, 
+        conversation_id: str, 
+        user_id: int, 
+        up_to_message_id: Optional[int] = None
+    ) -> int:
+        """Mark messages in a conversation as read, up to a message id if given."""
+        MessageService._check_participant(conversation_id, user_id)
         
-        messages = db.query(Message).filter(
+        marked = MessageService._mark_read_up_to(db, conversation_id, user_id, up_to_message_id)
+        db.commit()
+        unread_counters.add(MESSAGES, user_id, -marked)
+        
+        return marked
+
+    @staticmethod
+    def get_conversation_messages(
+        db: Session, 
+        conversation_id: str, 
+        user_id: int, 
+        skip: int = 0, 
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get messages in a conversation.
+
+        Pages walk backwards in time; the next cursor points at the oldest
+        message of the current page.
+        """
+        MessageService._check_participant(conversation_id, user_id)
+        
+        query = db.query(Message).filter(
             Message.conversation_id == conversation_id
-        ).order_by(Message.created_at.desc()).offset(skip).limit(limit).all()
-        
-        # Mark messages as read for the current user
-        unread_messages = db.query(Message).filter(
-            and_(
-                Message.conversation_id == conversation_id,
-                Message.recipient_id == user_id,
-                Message.is_read == False
-            )
-        ).all()
+        ).order_by(Message.created_at.desc(), Message.message_id.desc())
         
-        for message in unread_messages:
-            message.is_read = True
+        if cursor:
+            key = decode_cursor(cursor, "created_at")
+            query = query.filter(keyset_condition([Message.created_at, Message.message_id], key))
+        else:
+            query = query.offset(skip)
         
-        db.commit()
+        messages = query.limit(limit).all()
+        
+        next_cursor = None
+        if len(messages) == limit:
+            next_cursor = encode_cursor("created_at", [messages[-1].created_at, messages[-1].message_id])
+        
+        # Everything up to the newest message on this page has now been seen
+        if messages:
+            marked = MessageService._mark_read_up_to(
+                db, conversation_id, user_id, max(message.message_id for message in messages)
+            )
+            db.commit()
+            unread_counters.add(MESSAGES, user_id, -marked)
         
-        return list(reversed(messages))  # Return in chronological order
+        return CursorPage(reversed(messages), next_cursor)  # Return in chronological order
 
     @staticmethod
     def mark_as_read(db: Session, message_id: int, user_id: int):
@@ -155,5 +193,51 @@ class MessageService:
                 detail="Message not found or you don't have permission"
             )
         
-        message.is_read = True
-        db.commit()
\ No newline at end of file
+        marked = 0
+        if not message.is_read:
+            message.is_read = True
+            ConversationSummaryService.decrement_unread(db, user_id, message.conversation_id, 1)
+            marked = 1
+        
+        db.commit()
+        unread_counters.add(MESSAGES, user_id, -marked)
+
+class AsyncMessageService:
+    """MessageService read paths for async endpoints."""
+
+    @staticmethod
+    async def get_conversations(
+        db: AsyncSession, 
+        user_id: int, 
+        limit: int = 50, 
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get conversations for a user, most recently active first."""
+        return await AsyncConversationSummaryService.get_inbox(db, user_id, limit=limit, cursor=cursor)
+
+    @staticmethod
+    async def mark_conversation_read(
+        db: AsyncSession, 
+        conversation_id: str, 
+        user_id: int, 
+        up_to_message_id: Optional[int] = None
+    ) -> int:
+        """Mark messages in a conversation as read, up to a message id if given."""
+        MessageService._check_participant(conversation_id, user_id)
+        
+        statement = MessageService._mark_read_statement(conversation_id, user_id, up_to_message_id)
+        marked = (await db.execute(statement, execution_options={"synchronize_session": False})).rowcount
+        await AsyncConversationSummaryService.decrement_unread(db, user_id, conversation_id, marked)
+        await db.commit()
+        unread_counters.add(MESSAGES, user_id, -marked)
+        
+        return marked
+
+    @staticmethod
+    async def get_unread_count(db: AsyncSession, user_id: int) -> int:
+        """Get a user's unread message count, summed from the inbox only when the cached counter is missing or due."""
+        count = unread_counters.get(MESSAGES, user_id)
+        if count is None:
+            count = await db.scalar(ConversationSummaryService._unread_total_statement(user_id))
+            unread_counters.set(MESSAGES, user_id, count)
+        return count
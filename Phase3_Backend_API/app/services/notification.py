@@ -1,56 +1,172 @@
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException, status
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.notification import Notification
+from app.services.unread import NOTIFICATIONS, unread_counters
+from app.utils.pagination import CursorPage, decode_cursor, encode_cursor, keyset_condition
 
 class NotificationService:
+    @staticmethod
+    def _notifications_statement(
+        user_id: int,
+        skip: int,
+        limit: int,
+        unread_only: bool,
+        cursor: Optional[str]
+    ):
+        statement = select(Notification).where(Notification.user_id == user_id)
+
+        if unread_only:
+            statement = statement.where(Notification.is_read == False)
+
+        statement = statement.order_by(Notification.created_at.desc(), Notification.notification_id.desc())
+
+        if cursor:
+            key = decode_cursor(cursor, "created_at")
+            statement = statement.where(
+                keyset_condition([Notification.created_at, Notification.notification_id], key)
+            )
+        else:
+            statement = statement.offset(skip)
+
+        return statement.limit(limit)
+
+    @staticmethod
+    def _page(notifications: List[Notification], limit: int) -> CursorPage:
+        next_cursor = None
+        if len(notifications) == limit:
+            last = notifications[-1]
+            next_cursor = encode_cursor("created_at", [last.created_at, last.notification_id])
+
+        return CursorPage(notifications, next_cursor)
+
+    @staticmethod
+    def _mark_as_read_statement(notification_id: int, user_id: int):
+        # Only an unread row is updated, so the rowcount says whether the counter drops
+        return update(Notification).where(
+            Notification.notification_id == notification_id,
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        ).values(is_read=True)
+
+    @staticmethod
+    def _exists_statement(notification_id: int, user_id: int):
+        return select(Notification.notification_id).where(
+            Notification.notification_id == notification_id,
+            Notification.user_id == user_id
+        )
+
+    @staticmethod
+    def _mark_all_as_read_statement(user_id: int):
+        return update(Notification).where(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        ).values(is_read=True)
+
+    @staticmethod
+    def _unread_count_statement(user_id: int):
+        return select(func.count(Notification.notification_id)).where(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        )
+
+    @staticmethod
+    def _not_found():
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notification not found"
+        )
+
     @staticmethod
     def get_notifications(
-        db: Session, 
-        user_id: int, 
-        skip: int = 0, 
+        db: Session,
+        user_id: int,
+        skip: int = 0,
         limit: int = 20,
-        unread_only: bool = False
-    ) -> List[Notification]:
+        unread_only: bool = False,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
         """Get notifications for a user."""
-        query = db.query(Notification).filter(Notification.user_id == user_id)
-        
-        if unread_only:
-            query = query.filter(Notification.is_read == False)
-        
-        return query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+        statement = NotificationService._notifications_statement(user_id, skip, limit, unread_only, cursor)
+        return NotificationService._page(db.scalars(statement).all(), limit)
 
     @staticmethod
     def mark_as_read(db: Session, notification_id: int, user_id: int):
         """Mark a notification as read."""
-        notification = db.query(Notification).filter(
-            Notification.notification_id == notification_id,
-            Notification.user_id == user_id
-        ).first()
-        
-        if not notification:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Notification not found"
-            )
-        
-        notification.is_read = True
+        result = db.execute(NotificationService._mark_as_read_statement(notification_id, user_id))
+        if not result.rowcount:
+            exists = db.scalar(NotificationService._exists_statement(notification_id, user_id))
+            db.rollback()
+            if exists is None:
+                raise NotificationService._not_found()
+            return
+
         db.commit()
+        unread_counters.add(NOTIFICATIONS, user_id, -1)
 
     @staticmethod
     def mark_all_as_read(db: Session, user_id: int):
         """Mark all notifications as read for a user."""
-        db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.is_read == False
-        ).update({"is_read": True})
+        result = db.execute(NotificationService._mark_all_as_read_statement(user_id))
         db.commit()
+        # Adjust rather than zero: a notification dispatched meanwhile stays counted
+        unread_counters.add(NOTIFICATIONS, user_id, -result.rowcount)
 
     @staticmethod
     def get_unread_count(db: Session, user_id: int) -> int:
-        """Get unread notification count."""
-        return db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.is_read == False
-        ).count()
\ No newline at end of file
+        """Get unread notification count, counted only when the cached counter is missing or due."""
+        count = unread_counters.get(NOTIFICATIONS, user_id)
+        if count is None:
+            count = db.scalar(NotificationService._unread_count_statement(user_id))
+            unread_counters.set(NOTIFICATIONS, user_id, count)
+        return count
+
+class AsyncNotificationService:
+    """NotificationService for async endpoints; runs the same statements on an AsyncSession."""
+
+    @staticmethod
+    async def get_notifications(
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        unread_only: bool = False,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get notifications for a user."""
+        statement = NotificationService._notifications_statement(user_id, skip, limit, unread_only, cursor)
+        return NotificationService._page((await db.scalars(statement)).all(), limit)
+
+    @staticmethod
+    async def mark_as_read(db: AsyncSession, notification_id: int, user_id: int):
+        """Mark a notification as read."""
+        result = await db.execute(NotificationService._mark_as_read_statement(notification_id, user_id))
+        if not result.rowcount:
+            exists = await db.scalar(NotificationService._exists_statement(notification_id, user_id))
+            await db.rollback()
+            if exists is None:
+                raise NotificationService._not_found()
+            return
+
+        await db.commit()
+        unread_counters.add(NOTIFICATIONS, user_id, -1)
+
+    @staticmethod
+    async def mark_all_as_read(db: AsyncSession, user_id: int):
+        """Mark all notifications as read for a user."""
+        result = await db.execute(NotificationService._mark_all_as_read_statement(user_id))
+        await db.commit()
+        # Adjust rather than zero: a notification dispatched meanwhile stays counted
+        unread_counters.add(NOTIFICATIONS, user_id, -result.rowcount)
+
+    @staticmethod
+    async def get_unread_count(db: AsyncSession, user_id: int) -> int:
+        """Get unread notification count, counted only when the cached counter is missing or due."""
+        count = unread_counters.get(NOTIFICATIONS, user_id)
+        if count is None:
+            count = await db.scalar(NotificationService._unread_count_statement(user_id))
+            unread_counters.set(NOTIFICATIONS, user_id, count)
+        return count
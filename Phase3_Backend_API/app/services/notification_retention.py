@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import NOTIFICATION_RETENTION_DAYS, NOTIFICATION_RETENTION_BATCH_SIZE
+from app.models.message import Message
+from app.models.notification import Notification, NotificationArchive
+
+# Repeated notifications of these types are merged into one digest row.
+# The group key says what "repeated" means: per conversation for messages,
+# per order for order updates.
+DIGESTS = {
+    "new_message": {
+        "content": "You have received {count} new messages",
+        "group_key": Message.conversation_id,
+        "join": (Message, Message.message_id == Notification.related_entity_id),
+    },
+    "order_update": {
+        "content": "Your order has been updated {count} times",
+        "group_key": Notification.related_entity_id,
+        "join": None,
+    },
+}
+
+ARCHIVE_COLUMNS = (
+    "notification_id", "user_id", "type", "content", "related_entity_id",
+    "related_entity_type", "coalesced_count", "created_at"
+)
+
+class NotificationRetentionService:
+    """Keeps the notifications table bounded.
+
+    Coalescing merges runs of same-type notifications into a digest row;
+    archiving moves read notifications past the retention period to
+    notifications_archive. Both work in batches that each commit, so no
+    transaction holds locks on the hot table for long.
+
+    These run in the maintenance process, so the API's cached unread
+    badges are not told about merged rows; they overcount until their
+    reconciliation interval (UNREAD_COUNTER_RECONCILE_SECONDS) recounts.
+    """
+
+    @staticmethod
+    def _digest_groups(db: Session, notification_type: str, limit: int) -> List[Any]:
+        digest = DIGESTS[notification_type]
+        group_key = digest["group_key"].label("group_key")
+        statement = select(
+            Notification.user_id,
+            Notification.is_read,
+            group_key,
+            func.count(Notification.notification_id).label("rows"),
+            func.sum(Notification.coalesced_count).label("total"),
+            func.max(Notification.notification_id).label("keep_id")
+        )
+        if digest["join"] is not None:
+            statement = statement.join(*digest["join"])
+        return db.execute(
+            statement.where(Notification.type == notification_type).group_by(
+                Notification.user_id, Notification.is_read, digest["group_key"]
+            ).having(func.count(Notification.notification_id) > 1).limit(limit)
+        ).all()
+
+    @staticmethod
+    def coalesce(db: Session, batch_size: int = NOTIFICATION_RETENTION_BATCH_SIZE) -> int:
+        """Merge repeated notifications into digests. Returns the rows removed."""
+        removed = 0
+        for notification_type, digest in DIGESTS.items():
+            while True:
+                groups = NotificationRetentionService._digest_groups(db, notification_type, batch_size)
+                if not groups:
+                    break
+
+                batch_removed = 0
+                for group in groups:
+                    members = Notification.related_entity_id.in_(
+                        select(Message.message_id).where(Message.conversation_id == group.group_key)
+                    ) if digest["join"] is not None else Notification.related_entity_id == group.group_key
+                    condition = (
+                        Notification.user_id == group.user_id,
+                        Notification.type == notification_type,
+                        Notification.is_read == group.is_read,
+                        members
+                    )
+                    # The newest row becomes the digest and keeps its link.
+                    # Count only the rows actually deleted: one marked read
+                    # since the group was read no longer matches.
+                    with db.begin_nested() as savepoint:
+                        kept = db.scalar(select(Notification.coalesced_count).where(
+                            Notification.notification_id == group.keep_id, *condition
+                        ))
+                        if kept is None:
+                            continue
+                        merged = db.scalars(
+                            delete(Notification).where(
+                                Notification.notification_id < group.keep_id, *condition
+                            ).returning(Notification.coalesced_count),
+                            execution_options={"synchronize_session": False}
+                        ).all()
+                        if not merged:
+                            continue
+
+                        total = kept + sum(merged)
+                        updated = db.execute(
+                            update(Notification).where(
+                                Notification.notification_id == group.keep_id, *condition
+                            ).values(content=digest["content"].format(count=total), coalesced_count=total),
+                            execution_options={"synchronize_session": False}
+                        ).rowcount
+                        if not updated:
+                            # The digest row itself changed; leave the group for the next run
+                            savepoint.rollback()
+                            continue
+                        batch_removed += len(merged)
+                db.commit()
+
+                removed += batch_removed
+                if len(groups) < batch_size or not batch_removed:
+                    break
+
+        return removed
+
+    @staticmethod
+    def archive(
+        db: Session,
+        older_than_days: int = NOTIFICATION_RETENTION_DAYS,
+        batch_size: int = NOTIFICATION_RETENTION_BATCH_SIZE
+    ) -> int:
+        """Move read notifications older than the cutoff to the archive. Returns the rows moved."""
+        # Ids go into IN lists; stay under SQL Server's parameter limit
+        batch_size = min(batch_size, 1000)
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        columns = [getattr(Notification, name) for name in ARCHIVE_COLUMNS]
+        moved = 0
+        while True:
+            ids = db.scalars(
+                select(Notification.notification_id).where(
+                    Notification.is_read == True,
+                    Notification.created_at < cutoff
+                ).order_by(Notification.notification_id).limit(batch_size)
+            ).all()
+            if not ids:
+                break
+
+            db.execute(
+                insert(NotificationArchive).from_select(
+                    ARCHIVE_COLUMNS,
+                    select(*columns).where(Notification.notification_id.in_(ids), Notification.is_read == True)
+                )
+            )
+            moved += db.execute(
+                delete(Notification).where(Notification.notification_id.in_(ids), Notification.is_read == True),
+                execution_options={"synchronize_session": False}
+            ).rowcount
+            db.commit()
+
+            if len(ids) < batch_size:
+                break
+
+        return moved
+
+    @staticmethod
+    def stats(db: Session) -> Dict[str, Any]:
+        """Row counts of the hot and archive tables."""
+        return {
+            "notifications": db.scalar(select(func.count(Notification.notification_id))),
+            "unread_notifications": db.scalar(
+                select(func.count(Notification.notification_id)).where(Notification.is_read == False)
+            ),
+            "archived_notifications": db.scalar(select(func.count(NotificationArchive.notification_id))),
+        }
@@ -5,8 +5,8 @@ from sqlalchemy.orm import Session
 
 from app.models.offer import Offer
 from app.models.user import User, SellerProfile
-from app.models.notification import Notification
 from app.schemas.offer import OfferCreate
+from app.services.outbox import OutboxService
 
 class OfferService:
     @staticmethod
@@ -45,17 +45,17 @@ class OfferService:
         )
         
         db.add(offer)
+        db.flush()
         
         # Create notification for buyer
-        notification = Notification(
+        OutboxService.publish(
+            db,
             user_id=offer_data.buyer_id,
-            type="new_offer",
+            event_type="new_offer",
             content="You have received a custom offer",
             related_entity_id=offer.offer_id,
             related_entity_type="offer"
         )
-        
-        db.add(notification)
         db.commit()
         db.refresh(offer)
         
@@ -125,14 +125,14 @@ class OfferService:
         # Create notification for seller
         seller_profile = db.query(SellerProfile).filter(SellerProfile.seller_id == offer.seller_id).first()
         if seller_profile:
-            notification = Notification(
+            OutboxService.publish(
+                db,
                 user_id=seller_profile.user_id,
-                type="offer_accepted",
+                event_type="offer_accepted",
                 content="Your offer has been accepted",
                 related_entity_id=offer_id,
                 related_entity_type="offer"
             )
-            db.add(notification)
         
         db.commit()
 
@@ -162,13 +162,13 @@ class OfferService:
         # Create notification for seller
         seller_profile = db.query(SellerProfile).filter(SellerProfile.seller_id == offer.seller_id).first()
         if seller_profile:
-            notification = Notification(
+            OutboxService.publish(
+                db,
                 user_id=seller_profile.user_id,
-                type="offer_rejected",
+                event_type="offer_rejected",
                 content="Your offer has been rejected",
                 related_entity_id=offer_id,
                 related_entity_type="offer"
             )
-            db.add(notification)
         
         db.commit()
\ No newline at end of file
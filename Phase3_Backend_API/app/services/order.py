@@ -1,14 +1,24 @@
-from typing import Optional, List
+from typing import Any, Callable, Dict, Iterator, Optional, List
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
+from app.database.loading import apply_profile
 from app.models.order import Order, OrderDelivery, OrderRevision
 from app.models.gig import Gig, GigPackage
 from app.models.user import User, SellerProfile
 from app.models.payment import Payment
-from app.models.notification import Notification
-from app.schemas.order import OrderCreate, OrderUpdate, OrderDeliveryCreate, OrderRevisionCreate
+from app.schemas.order import OrderCreate, OrderOut, OrderUpdate, OrderDeliveryCreate, OrderRevisionCreate
+from app.services.earnings import EarningsLedgerService
+from app.services.listing_facts import ListingFactsService
+from app.services.outbox import OutboxService
+from app.services.ranking import RankingService
+from app.services.seller_balance import SellerBalanceService
+from app.utils.pagination import CursorPage, decode_cursor, encode_cursor, keyset_condition
+
+# Rows read per round trip when streaming an order export
+EXPORT_BATCH_SIZE = 500
 
 class OrderService:
     @staticmethod
@@ -87,25 +97,150 @@ class OrderService:
         )
         
         db.add(payment)
+        SellerBalanceService.apply_payment_change(db, order, payment, None, None)
         
         # Create notification for seller
-        notification = Notification(
+        OutboxService.publish(
+            db,
             user_id=seller.user_id,
-            type="new_order",
+            event_type="new_order",
             content="You have received a new order",
             related_entity_id=order.order_id,
             related_entity_type="order"
         )
-        
-        db.add(notification)
         db.commit()
         
         return order
 
     @staticmethod
-    def get_order_by_id(db: Session, order_id: int, user_id: int) -> Order:
-        """Get order by ID with permission check."""
-        order = db.query(Order).filter(Order.order_id == order_id).first()
+    def create_orders_batch(db: Session, items: List[OrderCreate], buyer_id: int) -> Dict[str, Any]:
+        """Create several orders in one transaction, reporting the outcome per item.
+
+        Gigs, packages and sellers are validated with one IN lookup each;
+        items failing a check are reported with the error create_order
+        would raise, and the rest are written with bulk INSERTs of orders,
+        payments and outbox events. The new order ids come back from the
+        orders INSERT in parameter order.
+        """
+        gig_ids = {item.gig_id for item in items}
+        gigs = {
+            row.gig_id: row for row in db.execute(
+                select(Gig.gig_id, Gig.seller_id).where(Gig.gig_id.in_(gig_ids), Gig.is_active == True)
+            )
+        }
+        packages = {
+            row.package_id: row for row in db.execute(
+                select(
+                    GigPackage.package_id, GigPackage.gig_id, GigPackage.price,
+                    GigPackage.delivery_time, GigPackage.revision_count
+                ).where(GigPackage.package_id.in_({item.package_id for item in items}), GigPackage.is_active == True)
+            )
+        }
+        seller_users = dict(db.execute(
+            select(SellerProfile.seller_id, SellerProfile.user_id).where(
+                SellerProfile.seller_id.in_({gig.seller_id for gig in gigs.values()})
+            )
+        ).all())
+
+        created_at = datetime.utcnow()
+        results: List[Dict[str, Any]] = []
+        order_rows: List[Dict[str, Any]] = []
+        for index, item in enumerate(items):
+            gig = gigs.get(item.gig_id)
+            package = packages.get(item.package_id)
+            seller_user_id = seller_users.get(gig.seller_id) if gig else None
+            if gig is None:
+                error = (status.HTTP_404_NOT_FOUND, "Gig not found")
+            elif package is None or package.gig_id != item.gig_id:
+                error = (status.HTTP_404_NOT_FOUND, "Package not found")
+            elif seller_user_id is None:
+                error = (status.HTTP_404_NOT_FOUND, "Seller not found")
+            elif seller_user_id == buyer_id:
+                error = (status.HTTP_400_BAD_REQUEST, "Cannot order your own gig")
+            else:
+                error = None
+
+            if error:
+                results.append({"index": index, "status": "failed", "status_code": error[0], "detail": error[1]})
+                continue
+
+            results.append({"index": index, "status": "created"})
+            order_rows.append({
+                "gig_id": item.gig_id,
+                "package_id": item.package_id,
+                "buyer_id": buyer_id,
+                "seller_id": seller_user_id,
+                "requirements": item.requirements,
+                "price": package.price,
+                "delivery_time": package.delivery_time,
+                "expected_delivery_date": created_at + timedelta(days=package.delivery_time),
+                "revision_count": package.revision_count,
+                "revisions_used": 0,
+                "status": "pending",
+                "is_late": False,
+                "created_at": created_at,
+                "updated_at": created_at
+            })
+
+        if order_rows:
+            orders = Order.__table__
+            order_ids = db.scalars(
+                insert(orders).returning(orders.c.order_id, sort_by_parameter_order=True),
+                order_rows
+            ).all()
+            created = iter([{**row, "order_id": order_id} for row, order_id in zip(order_rows, order_ids)])
+
+            payment_rows = []
+            events = []
+            balance_deltas: Dict[int, Dict[str, int]] = {}
+            for result in results:
+                if result["status"] != "created":
+                    continue
+                order = result["order"] = next(created)
+
+                platform_fee = int(order["price"] * 0.2)  # 20% platform fee
+                seller_amount = order["price"] - platform_fee
+                payment_rows.append({
+                    "order_id": order["order_id"],
+                    "amount": order["price"],
+                    "platform_fee": platform_fee,
+                    "seller_amount": seller_amount,
+                    "currency": "USD",
+                    "payment_method": "credit_card",
+                    "status": "pending",
+                    "created_at": created_at
+                })
+                delta = SellerBalanceService.new_payment_delta(seller_amount, created_at)
+                totals = balance_deltas.setdefault(order["seller_id"], dict.fromkeys(delta, 0))
+                for bucket, amount in delta.items():
+                    totals[bucket] += amount
+                events.append({
+                    "user_id": order["seller_id"],
+                    "event_type": "new_order",
+                    "content": "You have received a new order",
+                    "related_entity_id": order["order_id"],
+                    "related_entity_type": "order"
+                })
+
+            db.execute(insert(Payment), payment_rows)
+            for seller_id, delta in balance_deltas.items():
+                SellerBalanceService.apply_delta(db, seller_id, delta)
+            OutboxService.publish_many(db, events)
+            db.commit()
+
+        return {
+            "created": len(order_rows),
+            "failed": len(results) - len(order_rows),
+            "results": results
+        }
+
+    @staticmethod
+    def get_order_by_id(db: Session, order_id: int, user_id: int, profile: Optional[str] = None) -> Order:
+        """Get order by ID with permission check, optionally with a loading profile."""
+        query = db.query(Order)
+        if profile:
+            query = apply_profile(query, profile)
+        order = query.filter(Order.order_id == order_id).first()
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -122,24 +257,100 @@ class OrderService:
         return order
 
     @staticmethod
-    def get_buyer_orders(db: Session, buyer_id: int, status_filter: Optional[str] = None) -> List[Order]:
-        """Get orders for a buyer."""
-        query = db.query(Order).filter(Order.buyer_id == buyer_id)
-        
+    def _party_filter(party: str, user_id: int, status_filter: Optional[str]) -> list:
+        column = Order.buyer_id if party == "buyer" else Order.seller_id
+        conditions = [column == user_id]
         if status_filter:
-            query = query.filter(Order.status == status_filter)
-        
-        return query.order_by(Order.created_at.desc()).all()
+            conditions.append(Order.status == status_filter)
+        return conditions
+
+    @staticmethod
+    def _list_orders(
+        db: Session,
+        party: str,
+        user_id: int,
+        status_filter: Optional[str],
+        skip: int,
+        limit: int,
+        cursor: Optional[str]
+    ) -> CursorPage:
+        """Page a party's orders newest first, by offset or by (created_at, order_id) cursor."""
+        query = apply_profile(db.query(Order), "order_card").filter(
+            *OrderService._party_filter(party, user_id, status_filter)
+        ).order_by(Order.created_at.desc(), Order.order_id.desc())
+
+        if cursor:
+            key = decode_cursor(cursor, "created_at")
+            query = query.filter(keyset_condition([Order.created_at, Order.order_id], key))
+        else:
+            query = query.offset(skip)
+
+        orders = query.limit(limit).all()
+
+        next_cursor = None
+        if len(orders) == limit:
+            next_cursor = encode_cursor("created_at", [orders[-1].created_at, orders[-1].order_id])
+
+        return CursorPage(orders, next_cursor)
 
     @staticmethod
-    def get_seller_orders(db: Session, seller_id: int, status_filter: Optional[str] = None) -> List[Order]:
+    def get_buyer_orders(
+        db: Session,
+        buyer_id: int,
+        status_filter: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
+        """Get orders for a buyer."""
+        return OrderService._list_orders(db, "buyer", buyer_id, status_filter, skip, limit, cursor)
+
+    @staticmethod
+    def get_seller_orders(
+        db: Session,
+        seller_id: int,
+        status_filter: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
         """Get orders for a seller."""
-        query = db.query(Order).filter(Order.seller_id == seller_id)
-        
-        if status_filter:
-            query = query.filter(Order.status == status_filter)
-        
-        return query.order_by(Order.created_at.desc()).all()
+        return OrderService._list_orders(db, "seller", seller_id, status_filter, skip, limit, cursor)
+
+    @staticmethod
+    def export_orders(
+        session_factory: Callable[[], Session],
+        party: str,
+        user_id: int,
+        status_filter: Optional[str] = None
+    ) -> Iterator[str]:
+        """Yield a party's full order history as NDJSON lines, newest first.
+
+        Rows are read in keyset batches of plain column tuples, so memory
+        stays bounded by one batch whatever the history size. The export
+        opens its own session because it outlives the request's.
+        """
+        orders = Order.__table__
+        conditions = OrderService._party_filter(party, user_id, status_filter)
+        db = session_factory()
+        try:
+            key = None
+            while True:
+                statement = select(orders).where(*conditions)
+                if key:
+                    statement = statement.where(keyset_condition([Order.created_at, Order.order_id], key))
+                rows = db.execute(
+                    statement.order_by(Order.created_at.desc(), Order.order_id.desc()).limit(EXPORT_BATCH_SIZE)
+                ).mappings().all()
+
+                for row in rows:
+                    yield OrderOut.model_validate(dict(row)).model_dump_json() + "\n"
+
+                if len(rows) < EXPORT_BATCH_SIZE:
+                    break
+                key = [rows[-1]["created_at"], rows[-1]["order_id"]]
+        finally:
+            db.close()
 
     @staticmethod
     def update_order_status(db: Session, order_id: int, order_update: OrderUpdate, user_id: int) -> Order:
@@ -162,7 +373,13 @@ class OrderService:
                 detail=f"Cannot change status from {order.status} to {order_update.status}"
             )
         
+        old_status = order.status
         order.status = order_update.status
+        
+        payment = db.query(Payment).filter(Payment.order_id == order_id).first()
+        if payment:
+            SellerBalanceService.apply_payment_change(db, order, payment, payment.status, old_status)
+        
         db.commit()
         db.refresh(order)
         
@@ -206,15 +423,14 @@ class OrderService:
             order.status = "in_progress"
         
         # Create notification for buyer
-        notification = Notification(
+        OutboxService.publish(
+            db,
             user_id=order.buyer_id,
-            type="order_delivered" if delivery_data.is_final_delivery else "order_update",
+            event_type="order_delivered" if delivery_data.is_final_delivery else "order_update",
             content="Your order has been delivered" if delivery_data.is_final_delivery else "Your order has been updated",
             related_entity_id=order_id,
             related_entity_type="order"
         )
-        
-        db.add(notification)
         db.commit()
 
     @staticmethod
@@ -258,15 +474,14 @@ class OrderService:
         order.revisions_used += 1
         
         # Create notification for seller
-        notification = Notification(
+        OutboxService.publish(
+            db,
             user_id=order.seller_id,
-            type="revision_requested",
+            event_type="revision_requested",
             content="A revision has been requested for your order",
             related_entity_id=order_id,
             related_entity_type="order"
         )
-        
-        db.add(notification)
         db.commit()
 
     @staticmethod
@@ -290,23 +505,30 @@ class OrderService:
             )
         
         # Update order status
+        old_status = order.status
         order.status = "completed"
         
         # Update payment status
         payment = db.query(Payment).filter(Payment.order_id == order_id).first()
         if payment:
+            old_payment_status = payment.status
             payment.status = "completed"
+            SellerBalanceService.apply_payment_change(db, order, payment, old_payment_status, old_status)
+            EarningsLedgerService.record_payment_change(db, order, payment, old_payment_status)
         
         # Create notification for seller
-        notification = Notification(
+        OutboxService.publish(
+            db,
             user_id=order.seller_id,
-            type="order_completed",
+            event_type="order_completed",
             content="Your order has been completed and payment released",
             related_entity_id=order_id,
             related_entity_type="order"
         )
+        db.flush()
         
-        db.add(notification)
+        RankingService.refresh_gigs(db, [order.gig_id])
+        ListingFactsService.refresh_gigs(db, [order.gig_id])
         db.commit()
 
     @staticmethod
@@ -334,22 +556,25 @@ class OrderService:
             )
         
         # Update order status
+        old_status = order.status
         order.status = "cancelled"
         
         # Update payment status
         payment = db.query(Payment).filter(Payment.order_id == order_id).first()
         if payment:
+            old_payment_status = payment.status
             payment.status = "refunded"
+            SellerBalanceService.apply_payment_change(db, order, payment, old_payment_status, old_status)
+            EarningsLedgerService.record_payment_change(db, order, payment, old_payment_status)
         
         # Create notification for the other party
         notify_user_id = order.seller_id if user_id == order.buyer_id else order.buyer_id
-        notification = Notification(
+        OutboxService.publish(
+            db,
             user_id=notify_user_id,
-            type="order_cancelled",
+            event_type="order_cancelled",
             content="An order has been cancelled",
             related_entity_id=order_id,
             related_entity_type="order"
         )
-        
-        db.add(notification)
         db.commit()
\ No newline at end of file
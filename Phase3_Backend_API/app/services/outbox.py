@@ -0,0 +1,354 @@
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, event, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    OUTBOX_POLL_SECONDS, OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_BASE_SECONDS
+)
+from app.core.metrics import OUTBOX_DISPATCHED, OUTBOX_FAILURES, OUTBOX_LAG
+from app.database.session import SessionLocal
+from app.models.notification import Notification, OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+events_table = OutboxEvent.__table__
+notifications_table = Notification.__table__
+
+# Session.info flag: the transaction wrote events, wake the dispatcher on commit
+_PUBLISHED_KEY = "outbox_published"
+
+# Claimed rows stay locked until the batch commits; other dispatchers skip them
+_CLAIM_HINT = "WITH (UPDLOCK, ROWLOCK, READPAST)"
+
+# Receives the notifications created by one dispatched batch, as plain dicts
+Channel = Callable[[List[Dict[str, Any]]], None]
+
+class OutboxService:
+    @staticmethod
+    def publish(
+        db: Session,
+        user_id: int,
+        event_type: str,
+        content: str,
+        related_entity_id: Optional[int] = None,
+        related_entity_type: Optional[str] = None,
+        idempotency_key: Optional[str] = None
+    ):
+        """Record a notification event in the caller's transaction (does not commit)."""
+        db.add(OutboxEvent(
+            idempotency_key=idempotency_key or uuid.uuid4().hex,
+            event_type=event_type,
+            user_id=user_id,
+            content=content,
+            related_entity_id=related_entity_id,
+            related_entity_type=related_entity_type
+        ))
+        db.info[_PUBLISHED_KEY] = True
+
+    @staticmethod
+    def publish_many(db: Session, events: List[Dict[str, Any]]):
+        """Record several events with one bulk INSERT (does not commit).
+
+        Each event is a dict of publish's keyword arguments.
+        """
+        if not events:
+            return
+        db.execute(insert(events_table), [
+            {
+                "idempotency_key": event.get("idempotency_key") or uuid.uuid4().hex,
+                "event_type": event["event_type"],
+                "user_id": event["user_id"],
+                "content": event["content"],
+                "related_entity_id": event.get("related_entity_id"),
+                "related_entity_type": event.get("related_entity_type"),
+            }
+            for event in events
+        ])
+        db.info[_PUBLISHED_KEY] = True
+
+    @staticmethod
+    def backlog(db: Session) -> Dict[str, Any]:
+        """Pending and failed event counts and the age of the oldest pending event."""
+        pending, oldest = db.execute(
+            select(func.count(OutboxEvent.event_id), func.min(OutboxEvent.created_at)).where(
+                OutboxEvent.status == "pending"
+            )
+        ).one()
+        failed = db.scalar(select(func.count(OutboxEvent.event_id)).where(OutboxEvent.status == "failed"))
+        return {
+            "pending_events": pending,
+            "failed_events": failed,
+            "oldest_pending_seconds": round((datetime.utcnow() - oldest).total_seconds(), 3) if oldest else None,
+        }
+
+    @staticmethod
+    def retry_failed(db: Session) -> int:
+        """Give events that exhausted their attempts a fresh set."""
+        result = db.execute(
+            update(OutboxEvent).where(OutboxEvent.status == "failed").values(
+                status="pending", attempts=0, next_attempt_at=datetime.utcnow()
+            ),
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
+        outbox_dispatcher.wake()
+        return result.rowcount
+
+    @staticmethod
+    def purge(db: Session, older_than_days: int) -> int:
+        """Delete events dispatched more than `older_than_days` ago."""
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        result = db.execute(
+            delete(OutboxEvent).where(OutboxEvent.status == "dispatched", OutboxEvent.dispatched_at < cutoff)
+        )
+        db.commit()
+        return result.rowcount
+
+class OutboxDispatcher:
+    """Background dispatcher turning outbox events into notifications.
+
+    Requests only append an event row to their own transaction. A thread
+    claims due events in batches, skips those whose idempotency key
+    already produced a notification, writes the rest with one bulk INSERT
+    and marks the batch dispatched in the same transaction, so an event
+    yields exactly one notification however often it is retried. The new
+    notifications are then handed to the registered delivery channels.
+    A failing batch is retried one event at a time; a failing event backs
+    off exponentially and is marked failed after `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        poll_seconds: float = OUTBOX_POLL_SECONDS,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        retry_base_seconds: float = OUTBOX_RETRY_BASE_SECONDS,
+        session_factory=SessionLocal
+    ):
+        self.poll_seconds = poll_seconds
+        # Event ids and keys are used in IN lists; stay under the parameter limit
+        self.batch_size = min(batch_size, 1000)
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.session_factory = session_factory
+        self._channels: List[Channel] = []
+        self._lock = threading.Lock()
+        self._dispatch_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "batches": 0,
+            "dispatched": 0,
+            "duplicates": 0,
+            "retried": 0,
+            "failed": 0,
+            "channel_errors": 0,
+            "last_batch_at": None,
+            "last_batch_ms": None,
+            "last_lag_seconds": None,
+        }
+
+    def add_channel(self, channel: Channel):
+        """Register a delivery channel called after each dispatched batch."""
+        self._channels.append(channel)
+
+    def wake(self):
+        self._wake.set()
+
+    def _claim(self, db: Session, event_ids: Optional[List[int]] = None) -> List[Any]:
+        statement = select(events_table).with_hint(events_table, _CLAIM_HINT, "mssql").where(
+            events_table.c.status == "pending"
+        )
+        if event_ids is None:
+            statement = statement.where(events_table.c.next_attempt_at <= datetime.utcnow()).order_by(
+                events_table.c.next_attempt_at, events_table.c.event_id
+            ).limit(self.batch_size)
+        else:
+            statement = statement.where(events_table.c.event_id.in_(event_ids))
+        return db.execute(statement).all()
+
+    def _dispatch(self, db: Session, events: List[Any]) -> List[Dict[str, Any]]:
+        """Write notifications for claimed events and mark them dispatched (commits)."""
+        keys = [row.idempotency_key for row in events]
+        existing = set(db.scalars(
+            select(notifications_table.c.idempotency_key).where(notifications_table.c.idempotency_key.in_(keys))
+        ))
+
+        rows = [
+            {
+                "user_id": row.user_id,
+                "type": row.event_type,
+                "content": row.content,
+                "is_read": False,
+                "related_entity_id": row.related_entity_id,
+                "related_entity_type": row.related_entity_type,
+                "idempotency_key": row.idempotency_key,
+                # The notification dates from the change, not from its dispatch
+                "created_at": row.created_at,
+            }
+            for row in events if row.idempotency_key not in existing
+        ]
+        if rows:
+            db.execute(insert(notifications_table), rows)
+
+        now = datetime.utcnow()
+        db.execute(
+            update(events_table).where(events_table.c.event_id.in_([row.event_id for row in events])).values(
+                status="dispatched", dispatched_at=now, last_error=None
+            )
+        )
+
+        created = []
+        if rows and self._channels:
+            created = [
+                dict(row) for row in db.execute(
+                    select(notifications_table).where(
+                        notifications_table.c.idempotency_key.in_([row["idempotency_key"] for row in rows])
+                    ).order_by(notifications_table.c.notification_id)
+                ).mappings()
+            ]
+        db.commit()
+
+        lag = 0.0
+        for row in events:
+            lag = (now - row.created_at).total_seconds()
+            OUTBOX_DISPATCHED.inc((row.event_type,))
+            OUTBOX_LAG.observe((row.event_type,), lag)
+        with self._lock:
+            self._stats["dispatched"] += len(rows)
+            self._stats["duplicates"] += len(existing)
+            self._stats["last_lag_seconds"] = round(lag, 3)
+
+        return created
+
+    def _defer(self, db: Session, row: Any, error: Exception):
+        """Schedule a failed event for another attempt, or give up on it."""
+        attempts = row.attempts + 1
+        failed = attempts >= self.max_attempts
+        db.execute(
+            update(events_table).where(events_table.c.event_id == row.event_id).values(
+                attempts=attempts,
+                status="failed" if failed else "pending",
+                next_attempt_at=datetime.utcnow() + timedelta(seconds=self.retry_base_seconds * 2 ** (attempts - 1)),
+                last_error=str(error)[:500]
+            )
+        )
+        db.commit()
+        outcome = "failed" if failed else "retry"
+        OUTBOX_FAILURES.inc((outcome,))
+        with self._lock:
+            self._stats["failed" if failed else "retried"] += 1
+
+    def _deliver(self, notifications: List[Dict[str, Any]]):
+        for channel in self._channels:
+            try:
+                channel(notifications)
+            except Exception:
+                # Notifications are stored either way; delivery is best effort
+                with self._lock:
+                    self._stats["channel_errors"] += 1
+                logger.exception("Outbox delivery channel %r failed", channel)
+
+    def run_once(self) -> int:
+        """Dispatch one batch of due events. Returns the number of events claimed."""
+        with self._dispatch_lock:
+            started = time.perf_counter()
+            created: List[Dict[str, Any]] = []
+            db = self.session_factory()
+            try:
+                events = self._claim(db)
+                if not events:
+                    db.rollback()
+                    return 0
+
+                try:
+                    created = self._dispatch(db, events)
+                except Exception:
+                    db.rollback()
+                    logger.warning("Outbox batch of %d events failed; retrying one at a time", len(events), exc_info=True)
+                    # Isolate the failing events so they do not hold up the rest
+                    for row in events:
+                        try:
+                            claimed = self._claim(db, [row.event_id])
+                            if claimed:
+                                created.extend(self._dispatch(db, claimed))
+                        except Exception as exc:
+                            db.rollback()
+                            logger.exception("Outbox event %s failed to dispatch", row.event_id)
+                            self._defer(db, row, exc)
+            except Exception:
+                db.rollback()
+                logger.exception("Failed to claim outbox events")
+                return 0
+            finally:
+                db.close()
+
+            with self._lock:
+                self._stats["batches"] += 1
+                self._stats["last_batch_at"] = datetime.utcnow()
+                self._stats["last_batch_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        if created:
+            self._deliver(created)
+        return len(events)
+
+    def drain(self) -> int:
+        """Dispatch until no due events remain. Returns the events claimed."""
+        total = 0
+        while True:
+            claimed = self.run_once()
+            total += claimed
+            if claimed < self.batch_size:
+                return total
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            self.drain()
+
+    def start(self):
+        """Start the background dispatcher thread."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the dispatcher and dispatch whatever is already due."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            thread.join()
+        self.drain()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters describing dispatched and failed events."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["batch_size"] = self.batch_size
+        stats["poll_seconds"] = self.poll_seconds
+        stats["channels"] = len(self._channels)
+        stats["running"] = self._thread is not None
+        return stats
+
+# Process-wide dispatcher, started and stopped with the application
+outbox_dispatcher = OutboxDispatcher()
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session: Session):
+    if session.info.pop(_PUBLISHED_KEY, False):
+        outbox_dispatcher.wake()
+
+@event.listens_for(Session, "after_rollback")
+def _forget_published(session: Session):
+    session.info.pop(_PUBLISHED_KEY, None)
@@ -1,12 +1,16 @@
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import and_
 
 from app.models.payment import Payment
 from app.models.order import Order
 from app.models.user import SellerProfile
 from app.schemas.payment import WithdrawalRequest
+from app.services.earnings import EarningsLedgerService
+from app.services.seller_balance import SellerBalanceService
+from app.utils.pagination import CursorPage
 
 class PaymentService:
     @staticmethod
@@ -31,61 +35,37 @@ class PaymentService:
     @staticmethod
     def get_earnings_summary(db: Session, seller_id: int) -> Dict[str, Any]:
         """Get earnings summary for a seller."""
-        # Total earnings
-        total_earnings = db.query(func.sum(Payment.seller_amount)).join(Order).filter(
-            Order.seller_id == seller_id,
-            Payment.status == "completed"
-        ).scalar() or 0
-        
-        # Available for withdrawal (completed payments)
-        available_earnings = db.query(func.sum(Payment.seller_amount)).join(Order).filter(
-            Order.seller_id == seller_id,
-            Payment.status == "completed",
-            Order.status == "completed"
-        ).scalar() or 0
-        
-        # Pending earnings (in escrow)
-        pending_earnings = db.query(func.sum(Payment.seller_amount)).join(Order).filter(
-            Order.seller_id == seller_id,
-            Payment.status == "pending",
-            Order.status.in_(["pending", "in_progress", "delivered"])
-        ).scalar() or 0
-        
-        # This month's earnings
-        from datetime import datetime, timedelta
-        start_of_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        monthly_earnings = db.query(func.sum(Payment.seller_amount)).join(Order).filter(
-            Order.seller_id == seller_id,
-            Payment.status == "completed",
-            Payment.created_at >= start_of_month
-        ).scalar() or 0
+        # Maintained incrementally on order changes; a primary key lookup
+        balance = SellerBalanceService.get_summary(db, seller_id)
         
         return {
-            "total_earnings": total_earnings,
-            "available_earnings": available_earnings,
-            "pending_earnings": pending_earnings,
-            "monthly_earnings": monthly_earnings,
+            "total_earnings": balance["total_earnings"],
+            "available_earnings": balance["available_earnings"],
+            "pending_earnings": balance["pending_earnings"],
+            "monthly_earnings": balance["month_earnings"],
             "currency": "USD"
         }
 
     @staticmethod
-    def get_earnings_history(db: Session, seller_id: int) -> List[Payment]:
-        """Get earnings history for a seller."""
-        return db.query(Payment).join(Order).filter(
-            Order.seller_id == seller_id,
-            Payment.status == "completed"
-        ).order_by(Payment.created_at.desc()).all()
+    def get_earnings_history(db: Session, seller_id: int, limit: int = 20, cursor: Optional[str] = None) -> CursorPage:
+        """Get a page of a seller's earnings ledger, newest first."""
+        return EarningsLedgerService.get_history(db, seller_id, limit=limit, cursor=cursor)
+
+    @staticmethod
+    def get_earnings_by_period(
+        db: Session,
+        seller_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Get monthly earnings for a seller."""
+        return EarningsLedgerService.get_periods(db, seller_id, start_date=start_date, end_date=end_date)
 
     @staticmethod
     def request_withdrawal(db: Session, seller_id: int, withdrawal_data: WithdrawalRequest):
         """Request withdrawal of earnings."""
         # Check available balance
-        available_earnings = db.query(func.sum(Payment.seller_amount)).join(Order).filter(
-            Order.seller_id == seller_id,
-            Payment.status == "completed",
-            Order.status == "completed"
-        ).scalar() or 0
+        available_earnings = SellerBalanceService.get_summary(db, seller_id)["available_earnings"]
         
         if withdrawal_data.amount > available_earnings:
             raise HTTPException(
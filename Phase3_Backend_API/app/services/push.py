@@ -0,0 +1,123 @@
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import PUSH_QUEUE_SIZE
+from app.services.outbox import outbox_dispatcher
+
+# (event name, JSON text of {"event": ..., "data": ...})
+PushEvent = Tuple[str, str]
+
+RESYNC_EVENT: PushEvent = ("resync", json.dumps({"event": "resync", "data": None}))
+
+class Subscription:
+    """One connected client: a bounded queue on the event loop serving it."""
+
+    __slots__ = ("user_id", "loop", "queue", "closed")
+
+    def __init__(self, user_id: int, queue_size: int):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def _offer(self, event: Optional[PushEvent]) -> bool:
+        """Queue an event (runs on the subscription's loop). False if it overflowed."""
+        if self.closed and event is not None:
+            return True
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+            return True
+        # The client is not keeping up: drop the backlog and have it refetch
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(RESYNC_EVENT if event is not None else None)
+        return False
+
+    async def next_event(self, timeout: float) -> Optional[PushEvent]:
+        """The next event, or None after `timeout` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        """Stop the subscription; a waiting next_event returns None."""
+        self.closed = True
+        self._offer(None)
+
+class PushHub:
+    """In-process fan-out of push events to connected clients by user id.
+
+    Publishing is thread-safe and never blocks the publisher: each event is
+    encoded once and handed to the loop of every subscription of the user.
+    A client whose queue fills up has its backlog replaced by a single
+    "resync" event, so memory per connection stays bounded. Only clients
+    connected to this process are reached; clients should refetch over
+    HTTP whenever they (re)connect or receive "resync".
+    """
+
+    def __init__(self, queue_size: int = PUSH_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._stats = {"published": 0, "delivered": 0, "resyncs": 0, "connections_opened": 0}
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Register a connection; must be called on the loop that serves it."""
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+            self._stats["connections_opened"] += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.closed = True
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def _deliver(self, subscription: Subscription, event: PushEvent):
+        delivered = subscription._offer(event)
+        with self._lock:
+            self._stats["delivered" if delivered else "resyncs"] += 1
+
+    def publish(self, user_id: int, event: str, data: Any):
+        """Push an event to every connection of a user."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+            self._stats["published"] += 1
+        if not subscriptions:
+            return
+
+        message: PushEvent = (event, json.dumps(jsonable_encoder({"event": event, "data": data})))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(self._deliver, subscription, message)
+            except RuntimeError:
+                # The serving loop has shut down
+                self.unsubscribe(subscription)
+
+    def publish_notifications(self, notifications: List[Dict[str, Any]]):
+        """Outbox delivery channel: push newly dispatched notifications."""
+        for notification in notifications:
+            notification = {key: value for key, value in notification.items() if key != "idempotency_key"}
+            self.publish(notification["user_id"], "notification", notification)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["connected_users"] = len(self._subscriptions)
+            stats["connections"] = sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+        stats["queue_size"] = self.queue_size
+        return stats
+
+# Process-wide hub; notifications arrive through the outbox dispatcher
+push_hub = PushHub()
+outbox_dispatcher.add_channel(push_hub.publish_notifications)
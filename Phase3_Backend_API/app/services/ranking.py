@@ -0,0 +1,270 @@
+import calendar
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import bindparam, case, func
+from sqlalchemy.orm import Session
+
+from app.models.gig import Gig, GigImage, GigListingFacts
+from app.models.order import Order
+from app.models.ranking import RankingRun
+from app.models.review import Review
+from app.models.tag import GigTag
+from app.models.user import SellerProfile
+from app.services.response_cache import invalidate_gig_listings
+
+# Gigs per IN list and per write batch; stays under SQL Server's 2100 parameter limit
+BATCH_SIZE = 1000
+
+# Scores closer than this to the stored value are not rewritten
+SCORE_TOLERANCE = 1e-9
+
+gigs_table = Gig.__table__
+facts_table = GigListingFacts.__table__
+
+# updated_at is kept as is: a new score is not a change to the gig itself,
+# and bumping it would make every scored gig look touched to the next run
+UPDATE_GIG_SCORE = gigs_table.update().where(
+    gigs_table.c.gig_id == bindparam("b_gig_id")
+).values(ranking_score=bindparam("b_score"), updated_at=gigs_table.c.updated_at)
+
+UPDATE_FACTS_SCORE = facts_table.update().where(
+    facts_table.c.gig_id == bindparam("b_gig_id")
+).values(ranking_score=bindparam("b_score"))
+
+def one_month_before(moment: datetime) -> datetime:
+    """Same as DATEADD(MONTH, -1, moment): the day is clamped to the shorter month."""
+    year, month = (moment.year, moment.month - 1) if moment.month > 1 else (moment.year - 1, 12)
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+def _chunks(ids: List[int]) -> Iterable[List[int]]:
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+def compute_scores(stats: Dict[str, list]) -> List[float]:
+    """Score every gig in a column-oriented stats batch.
+
+    Same weights as fn_CalculateRankingScore: seller performance (40%),
+    gig performance (35%) and content quality (25%). Each component is
+    computed a column at a time over the whole batch.
+    """
+    seller = [
+        0.4 * (
+            (3 if rating is None else rating) * 0.5
+            + (80 if completion is None else completion) * 0.002
+            + (100 - (60 if response is None else response)) * 0.003
+        ) if has_seller else 0.0
+        for has_seller, rating, completion, response in zip(
+            stats["has_seller"], stats["rating_average"], stats["completion_rate"], stats["response_time"]
+        )
+    ]
+
+    gig = [
+        0.35 * (
+            completed * 0.01
+            + (2 if conversion is None else conversion) * 0.1
+            + reviews * 0.05
+            + (5 if recent > 10 else recent * 0.5)
+        )
+        for completed, conversion, reviews, recent in zip(
+            stats["completed_orders"], stats["conversion_rate"], stats["review_count"], stats["recent_orders"]
+        )
+    ]
+
+    description = [
+        10 if length > 1000 else 8 if length > 500 else 5 if length > 200 else 3
+        for length in stats["description_length"]
+    ]
+    images = [10 if count >= 5 else 7 if count >= 3 else count * 2 for count in stats["image_count"]]
+    tags = [10 if count >= 5 else count * 2 for count in stats["tag_count"]]
+    content = [0.25 * (d * 0.4 + i * 0.3 + t * 0.3) for d, i, t in zip(description, images, tags)]
+
+    return [s + g + c for s, g, c in zip(seller, gig, content)]
+
+class RankingService:
+    """Recomputes gig ranking scores in the application.
+
+    Stats are read with one grouped query per source table for a whole
+    batch of gigs instead of a scalar UDF running correlated subqueries per
+    gig. Scores are written back to gigs and gig_listing_facts with batched
+    UPDATEs, skipping gigs whose score did not change.
+    """
+
+    @staticmethod
+    def _grouped_counts(query, key_column, gig_ids: Optional[List[int]]) -> Dict[int, Any]:
+        if gig_ids is not None:
+            query = query.filter(key_column.in_(gig_ids))
+        return {row[0]: row for row in query.group_by(key_column).all()}
+
+    @staticmethod
+    def _load_stats(db: Session, gig_ids: Optional[List[int]] = None, now: Optional[datetime] = None) -> Dict[str, list]:
+        """Read the ranking inputs of the given gigs (or all gigs) as columns."""
+        recent_cutoff = one_month_before(now or datetime.utcnow())
+
+        gig_query = db.query(
+            Gig.gig_id,
+            Gig.conversion_rate,
+            func.length(Gig.description).label("description_length"),
+            Gig.ranking_score,
+            SellerProfile.seller_id.label("profile_id"),
+            SellerProfile.rating_average,
+            SellerProfile.completion_rate,
+            SellerProfile.response_time
+        ).outerjoin(
+            SellerProfile, Gig.seller_id == SellerProfile.seller_id
+        )
+        if gig_ids is not None:
+            gig_query = gig_query.filter(Gig.gig_id.in_(gig_ids))
+        gigs = gig_query.order_by(Gig.gig_id).all()
+
+        orders = RankingService._grouped_counts(
+            db.query(
+                Order.gig_id,
+                func.sum(case((Order.status == "completed", 1), else_=0)),
+                func.sum(case((Order.created_at > recent_cutoff, 1), else_=0))
+            ),
+            Order.gig_id, gig_ids
+        )
+        reviews = RankingService._grouped_counts(
+            db.query(Order.gig_id, func.count(Review.review_id)).join(Review, Review.order_id == Order.order_id),
+            Order.gig_id, gig_ids
+        )
+        images = RankingService._grouped_counts(
+            db.query(GigImage.gig_id, func.count(GigImage.image_id)), GigImage.gig_id, gig_ids
+        )
+        tags = RankingService._grouped_counts(
+            db.query(GigTag.gig_id, func.count(GigTag.gig_tag_id)), GigTag.gig_id, gig_ids
+        )
+
+        no_orders = (None, 0, 0)
+        return {
+            "gig_id": [g.gig_id for g in gigs],
+            "current_score": [g.ranking_score for g in gigs],
+            "has_seller": [g.profile_id is not None for g in gigs],
+            "rating_average": [g.rating_average for g in gigs],
+            "completion_rate": [g.completion_rate for g in gigs],
+            "response_time": [g.response_time for g in gigs],
+            "conversion_rate": [g.conversion_rate for g in gigs],
+            "description_length": [g.description_length or 0 for g in gigs],
+            "completed_orders": [orders.get(g.gig_id, no_orders)[1] or 0 for g in gigs],
+            "recent_orders": [orders.get(g.gig_id, no_orders)[2] or 0 for g in gigs],
+            "review_count": [reviews[g.gig_id][1] if g.gig_id in reviews else 0 for g in gigs],
+            "image_count": [images[g.gig_id][1] if g.gig_id in images else 0 for g in gigs],
+            "tag_count": [tags[g.gig_id][1] if g.gig_id in tags else 0 for g in gigs],
+        }
+
+    @staticmethod
+    def _score_batch(db: Session, gig_ids: Optional[List[int]] = None) -> Dict[str, int]:
+        """Score a batch of gigs and write back the changed scores (no commit)."""
+        stats = RankingService._load_stats(db, gig_ids)
+        scores = compute_scores(stats)
+
+        changed = [
+            {"b_gig_id": gig_id, "b_score": score}
+            for gig_id, current, score in zip(stats["gig_id"], stats["current_score"], scores)
+            if current is None or abs(current - score) > SCORE_TOLERANCE
+        ]
+        for start in range(0, len(changed), BATCH_SIZE):
+            batch = changed[start:start + BATCH_SIZE]
+            db.execute(UPDATE_GIG_SCORE, batch)
+            db.execute(UPDATE_FACTS_SCORE, batch)
+
+        return {"scored": len(scores), "updated": len(changed)}
+
+    @staticmethod
+    def refresh_gigs(db: Session, gig_ids: List[int]):
+        """Rescore specific gigs inside the caller's transaction."""
+        for chunk in _chunks(sorted(set(gig_ids))):
+            RankingService._score_batch(db, chunk)
+
+    @staticmethod
+    def touched_gig_ids(db: Session, since: datetime, now: Optional[datetime] = None) -> List[int]:
+        """Gigs whose ranking inputs may have changed since a point in time."""
+        now = now or datetime.utcnow()
+        gig_ids: Set[int] = set()
+
+        gig_ids.update(gig_id for (gig_id,) in db.query(Gig.gig_id).filter(Gig.updated_at > since))
+        gig_ids.update(gig_id for (gig_id,) in db.query(Order.gig_id).filter(Order.updated_at > since).distinct())
+        # Orders that have aged out of the one-month "recent orders" window
+        gig_ids.update(gig_id for (gig_id,) in db.query(Order.gig_id).filter(
+            Order.created_at > one_month_before(since),
+            Order.created_at <= one_month_before(now)
+        ).distinct())
+
+        # New reviews change the gig's review count and the seller's rating
+        reviewed = db.query(Order.gig_id, Order.seller_id).join(
+            Review, Review.order_id == Order.order_id
+        ).filter(Review.created_at > since).distinct().all()
+        gig_ids.update(gig_id for gig_id, _ in reviewed)
+
+        seller_ids = {
+            seller_id for (seller_id,) in db.query(SellerProfile.seller_id).filter(SellerProfile.updated_at > since)
+        }
+        reviewed_users = list({user_id for _, user_id in reviewed})
+        for chunk in _chunks(reviewed_users):
+            seller_ids.update(
+                seller_id for (seller_id,) in db.query(SellerProfile.seller_id).filter(SellerProfile.user_id.in_(chunk))
+            )
+        for chunk in _chunks(list(seller_ids)):
+            gig_ids.update(gig_id for (gig_id,) in db.query(Gig.gig_id).filter(Gig.seller_id.in_(chunk)))
+
+        return sorted(gig_ids)
+
+    @staticmethod
+    def run(db: Session, mode: str = "incremental") -> Dict[str, Any]:
+        """Recompute ranking scores and record the run.
+
+        Full mode rescores every gig. Incremental mode rescores only gigs
+        touched since the last finished run started, and falls back to a
+        full run when there is none. Returns a throughput report.
+        """
+        if mode not in ("full", "incremental"):
+            raise ValueError(f"Unknown ranking mode '{mode}'")
+
+        since = None
+        if mode == "incremental":
+            last_run = db.query(RankingRun).filter(
+                RankingRun.finished_at != None
+            ).order_by(RankingRun.started_at.desc()).first()
+            if last_run is None:
+                mode = "full"
+            else:
+                since = last_run.started_at
+
+        run = RankingRun(mode=mode, started_at=datetime.utcnow())
+        db.add(run)
+        db.commit()
+
+        started = time.perf_counter()
+        scored = updated = 0
+        if mode == "full":
+            result = RankingService._score_batch(db)
+            scored, updated = result["scored"], result["updated"]
+            db.commit()
+        else:
+            for chunk in _chunks(RankingService.touched_gig_ids(db, since, now=run.started_at)):
+                result = RankingService._score_batch(db, chunk)
+                scored += result["scored"]
+                updated += result["updated"]
+                db.commit()
+        duration = time.perf_counter() - started
+
+        run.finished_at = datetime.utcnow()
+        run.gigs_scored = scored
+        run.gigs_updated = updated
+        run.duration_seconds = duration
+        db.commit()
+
+        if updated:
+            invalidate_gig_listings()
+
+        return {
+            "run_id": run.run_id,
+            "mode": mode,
+            "gigs_scored": scored,
+            "gigs_updated": updated,
+            "duration_seconds": round(duration, 3),
+            "gigs_per_second": round(scored / duration, 1) if duration > 0 else None
+        }
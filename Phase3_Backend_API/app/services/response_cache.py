@@ -0,0 +1,89 @@
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.cache import ResponseCache
+from app.core.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_LISTING_TTL_SECONDS
+from app.utils.pagination import NEXT_CURSOR_HEADER, set_next_cursor
+
+# Cached routes; GigService writes invalidate all gig listings
+GIG_LIST = "gigs.list"
+GIG_FEATURED = "gigs.featured"
+GIG_CATEGORY = "gigs.category"
+SEARCH_FILTERS = "search.filters"
+GIG_LISTINGS = (GIG_LIST, GIG_FEATURED, GIG_CATEGORY)
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+class CachedResponse:
+    """A rendered JSON body plus the headers it was served with."""
+
+    __slots__ = ("body", "headers")
+
+    def __init__(self, body: bytes, headers: Dict[str, str]):
+        self.body = body
+        self.headers = headers
+
+# Process-wide cache of anonymous responses
+response_cache = ResponseCache(
+    max_size=RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=RESPONSE_CACHE_MAX_BYTES,
+    ttl_seconds=RESPONSE_CACHE_LISTING_TTL_SECONDS
+)
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+def _render(result: Any, response_model: Any) -> CachedResponse:
+    # Serialize the way FastAPI would for the route's response_model
+    if response_model is None:
+        content = jsonable_encoder(result)
+    else:
+        adapter = _adapters.get(response_model)
+        if adapter is None:
+            adapter = _adapters[response_model] = TypeAdapter(response_model)
+        content = adapter.dump_python(adapter.validate_python(result, from_attributes=True), mode="json", by_alias=True)
+
+    headers = {}
+    next_cursor = getattr(result, "next_cursor", None)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return CachedResponse(JSONResponse(content).body, headers)
+
+def is_anonymous(request: Request) -> bool:
+    return "authorization" not in request.headers
+
+def cached_response(
+    request: Request,
+    response: Response,
+    route: str,
+    params: Dict[str, Any],
+    load: Callable[[], Any],
+    response_model: Any = None,
+    ttl_seconds: Optional[float] = None
+) -> Any:
+    """Serve an anonymous request from the response cache, loading it on a miss.
+
+    Authenticated requests always call load() and are serialized by FastAPI
+    as usual. The key is the route plus the endpoint's resolved parameters,
+    so omitted and explicitly default query parameters share an entry.
+    """
+    if not is_anonymous(request):
+        result = load()
+        set_next_cursor(response, result)
+        return result
+
+    key = (route, tuple(sorted(params.items())))
+    cached, hit = response_cache.get_or_compute(key, lambda: _render(load(), response_model), ttl_seconds)
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers={**cached.headers, CACHE_STATUS_HEADER: "HIT" if hit else "MISS"}
+    )
+
+def invalidate_gig_listings():
+    """Drop cached gig listings after a gig, package or ranking change."""
+    for route in GIG_LISTINGS:
+        response_cache.invalidate_route(route)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
@@ -8,6 +8,8 @@ from app.models.order import Order
 from app.models.gig import Gig
 from app.models.user import SellerProfile
 from app.schemas.review import ReviewCreate, ReviewResponse
+from app.services.listing_facts import ListingFactsService
+from app.utils.pagination import CursorPage, decode_cursor, encode_cursor, keyset_condition
 
 class ReviewService:
     @staticmethod
@@ -62,22 +64,58 @@ class ReviewService:
         )
         
         db.add(review)
+        db.flush()
+        
+        # trg_update_seller_rating has recalculated the seller's rating by now
+        seller = db.query(SellerProfile.seller_id).filter(SellerProfile.user_id == order.seller_id).first()
+        if seller:
+            ListingFactsService.refresh_seller(db, seller.seller_id)
+        
         db.commit()
         db.refresh(review)
         
         return review
 
     @staticmethod
-    def get_gig_reviews(db: Session, gig_id: int, skip: int = 0, limit: int = 20) -> List[Review]:
+    def _paginate(query, skip: int, limit: int, cursor: Optional[str]) -> CursorPage:
+        """Page reviews newest first, by offset or by (created_at, review_id) cursor."""
+        query = query.order_by(Review.created_at.desc(), Review.review_id.desc())
+        
+        if cursor:
+            key = decode_cursor(cursor, "created_at")
+            query = query.filter(keyset_condition([Review.created_at, Review.review_id], key))
+        else:
+            query = query.offset(skip)
+        
+        reviews = query.limit(limit).all()
+        
+        next_cursor = None
+        if len(reviews) == limit:
+            next_cursor = encode_cursor("created_at", [reviews[-1].created_at, reviews[-1].review_id])
+        
+        return CursorPage(reviews, next_cursor)
+
+    @staticmethod
+    def get_gig_reviews(
+        db: Session, 
+        gig_id: int, 
+        skip: int = 0, 
+        limit: int = 20, 
+        cursor: Optional[str] = None
+    ) -> CursorPage:
         """Get reviews for a gig."""
-        reviews = db.query(Review).join(Order).filter(
-            Order.gig_id == gig_id
-        ).order_by(Review.created_at.desc()).offset(skip).limit(limit).all()
+        query = db.query(Review).join(Order).filter(Order.gig_id == gig_id)
         
-        return reviews
+        return ReviewService._paginate(query, skip, limit, cursor)
 
     @staticmethod
-    def get_seller_reviews(db: Session, seller_id: int, skip: int = 0, limit: int = 20) -> List[Review]:
+    def get_seller_reviews(
+        db: Session, 
+        seller_id: int, 
+        skip: int = 0, 
+        limit: int = 20, 
+        cursor: Optional[str] = None
+    ) -> CursorPage:
         """Get reviews for a seller."""
         # Get seller's user_id from seller_id
         seller = db.query(SellerProfile).filter(SellerProfile.seller_id == seller_id).first()
@@ -87,11 +125,9 @@ class ReviewService:
                 detail="Seller not found"
             )
         
-        reviews = db.query(Review).filter(
-            Review.reviewee_id == seller.user_id
-        ).order_by(Review.created_at.desc()).offset(skip).limit(limit).all()
+        query = db.query(Review).filter(Review.reviewee_id == seller.user_id)
         
-        return reviews
+        return ReviewService._paginate(query, skip, limit, cursor)
 
     @staticmethod
     def respond_to_review(db: Session, review_id: int, response_data: ReviewResponse, seller_id: int):
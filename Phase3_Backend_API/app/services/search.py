@@ -1,11 +1,17 @@
+import bisect
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, desc, asc, func
+from sqlalchemy import or_, desc
 
-from app.models.gig import Gig, GigPackage
+from app.models.gig import Gig, GigListingFacts
 from app.models.user import User, SellerProfile
-from app.models.category import Category
-from app.models.tag import Tag, GigTag
+from app.services.category import category_tree
+from app.services.search_index import search_backend
+from app.services.suggestions import suggestion_index
+from app.utils.pagination import CursorPage, decode_cursor, encode_cursor
+
+# Maximum number of candidate IDs bound into a single IN (...) clause
+CANDIDATE_CHUNK_SIZE = 1000
 
 class SearchService:
     @staticmethod
@@ -19,64 +25,119 @@ class SearchService:
         seller_level: Optional[str] = None,
         sort_by: str = "relevance",
         skip: int = 0,
-        limit: int = 20
-    ) -> List[Gig]:
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> CursorPage:
         """Search for gigs with various filters."""
-        gig_query = db.query(Gig).filter(Gig.is_active == True)
+        # Text matching and relevance scoring happen in the search backend
+        matches = search_backend.search(db, query, category_id=category_id)
+        if not matches:
+            return CursorPage()
+        
+        # Each result is ranked by a (sort value, gig_id) key, ascending
+        if sort_by == "relevance" and not (min_price or max_price or delivery_time or seller_level):
+            # Backend order is final, so no database filtering is needed
+            ranked = [((-score, gig_id), gig_id) for gig_id, score in matches]
+        else:
+            candidates = SearchService._filter_candidates(
+                db,
+                dict(matches),
+                min_price=min_price,
+                max_price=max_price,
+                delivery_time=delivery_time,
+                seller_level=seller_level
+            )
+            
+            # Sorting (gigs without an active package have no price or delivery time)
+            if sort_by == "price":
+                ranked = [
+                    ((c["min_price"], c["gig_id"]), c["gig_id"])
+                    for c in candidates if c["min_price"] is not None
+                ]
+            elif sort_by == "delivery_time":
+                ranked = [
+                    ((c["min_delivery_time"], c["gig_id"]), c["gig_id"])
+                    for c in candidates if c["min_delivery_time"] is not None
+                ]
+            elif sort_by == "rating":
+                ranked = [((-c["rating_average"], c["gig_id"]), c["gig_id"]) for c in candidates]
+            else:
+                ranked = [((-c["score"], c["gig_id"]), c["gig_id"]) for c in candidates]
+            ranked.sort()
+        
+        # Keyset pagination resumes right after the cursor's key
+        if cursor:
+            start = bisect.bisect_right(ranked, tuple(decode_cursor(cursor, sort_by)), key=lambda r: r[0])
+        else:
+            start = skip
+        page = ranked[start:start + limit]
         
-        # Text search
-        search_conditions = or_(
-            Gig.title.ilike(f"%{query}%"),
-            Gig.description.ilike(f"%{query}%"),
-            Gig.search_tags.ilike(f"%{query}%")
-        )
-        gig_query = gig_query.filter(search_conditions)
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = encode_cursor(sort_by, list(page[-1][0]))
         
-        # Category filter
-        if category_id:
-            gig_query = gig_query.filter(Gig.category_id == category_id)
-        
-        # Price filters
-        if min_price or max_price:
-            price_subquery = db.query(
-                GigPackage.gig_id,
-                func.min(GigPackage.price).label('min_price')
-            ).filter(GigPackage.is_active == True).group_by(GigPackage.gig_id).subquery()
-            
-            gig_query = gig_query.join(price_subquery, Gig.gig_id == price_subquery.c.gig_id)
+        return CursorPage(SearchService._load_gigs(db, [gig_id for _, gig_id in page]), next_cursor)
+
+    @staticmethod
+    def _filter_candidates(
+        db: Session,
+        scores: Dict[int, float],
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        delivery_time: Optional[int] = None,
+        seller_level: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Apply listing filters to the gigs matched by the search backend."""
+        candidate_ids = list(scores)
+        candidates = []
+        
+        # SQL Server caps a statement at 2100 parameters, so filter in chunks
+        for start in range(0, len(candidate_ids), CANDIDATE_CHUNK_SIZE):
+            chunk = candidate_ids[start:start + CANDIDATE_CHUNK_SIZE]
+            facts_query = db.query(
+                GigListingFacts.gig_id,
+                GigListingFacts.min_price,
+                GigListingFacts.min_delivery_time,
+                GigListingFacts.rating_average
+            ).filter(
+                GigListingFacts.is_active == True,
+                GigListingFacts.gig_id.in_(chunk)
+            )
             
+            # Price filters
             if min_price:
-                gig_query = gig_query.filter(price_subquery.c.min_price >= min_price)
+                facts_query = facts_query.filter(GigListingFacts.min_price >= min_price)
             if max_price:
-                gig_query = gig_query.filter(price_subquery.c.min_price <= max_price)
-        
-        # Delivery time filter
-        if delivery_time:
-            delivery_subquery = db.query(
-                GigPackage.gig_id,
-                func.min(GigPackage.delivery_time).label('min_delivery')
-            ).filter(GigPackage.is_active == True).group_by(GigPackage.gig_id).subquery()
+                facts_query = facts_query.filter(GigListingFacts.min_price <= max_price)
             
-            gig_query = gig_query.join(delivery_subquery, Gig.gig_id == delivery_subquery.c.gig_id)
-            gig_query = gig_query.filter(delivery_subquery.c.min_delivery <= delivery_time)
-        
-        # Seller level filter
-        if seller_level:
-            gig_query = gig_query.join(SellerProfile, Gig.seller_id == SellerProfile.seller_id)
-            gig_query = gig_query.filter(SellerProfile.account_level == seller_level)
-        
-        # Sorting
-        if sort_by == "relevance":
-            # Create a relevance score based on text matching
-            gig_query = gig_query.order_by(desc(Gig.ranking_score))
-        elif sort_by == "price":
-            gig_query = gig_query.order_by(asc(Gig.gig_id))  # Would need price subquery
-        elif sort_by == "delivery_time":
-            gig_query = gig_query.order_by(asc(Gig.gig_id))  # Would need delivery subquery
-        elif sort_by == "rating":
-            gig_query = gig_query.order_by(desc(Gig.ranking_score))
-        
-        return gig_query.offset(skip).limit(limit).all()
+            # Delivery time filter
+            if delivery_time:
+                facts_query = facts_query.filter(GigListingFacts.min_delivery_time <= delivery_time)
+            
+            # Seller level filter
+            if seller_level:
+                facts_query = facts_query.filter(GigListingFacts.seller_level == seller_level)
+            
+            for row in facts_query.all():
+                candidates.append({
+                    "gig_id": row.gig_id,
+                    "score": scores[row.gig_id],
+                    "min_price": row.min_price,
+                    "min_delivery_time": row.min_delivery_time,
+                    "rating_average": row.rating_average
+                })
+        
+        return candidates
+
+    @staticmethod
+    def _load_gigs(db: Session, gig_ids: List[int]) -> List[Gig]:
+        """Load gigs by ID, preserving the given order."""
+        if not gig_ids:
+            return []
+        
+        gigs = db.query(Gig).filter(Gig.gig_id.in_(gig_ids), Gig.is_active == True).all()
+        position = {gig_id: i for i, gig_id in enumerate(gig_ids)}
+        return sorted(gigs, key=lambda gig: position[gig.gig_id])
 
     @staticmethod
     def search_sellers(
@@ -124,46 +185,23 @@ class SearchService:
     @staticmethod
     def get_search_suggestions(db: Session, query: str, limit: int = 10) -> List[str]:
         """Get search suggestions based on query."""
-        suggestions = []
-        
-        # Get suggestions from gig titles
-        gig_titles = db.query(Gig.title).filter(
-            Gig.title.ilike(f"%{query}%"),
-            Gig.is_active == True
-        ).limit(limit // 2).all()
-        
-        suggestions.extend([title[0] for title in gig_titles])
-        
-        # Get suggestions from tags
-        tags = db.query(Tag.name).filter(
-            Tag.name.ilike(f"%{query}%")
-        ).order_by(desc(Tag.frequency)).limit(limit // 2).all()
-        
-        suggestions.extend([tag[0] for tag in tags])
-        
-        return list(set(suggestions))[:limit]
+        # Served from the in-memory prefix index built from gig titles and tags
+        return suggestion_index.suggest(db, query, limit=limit)
 
     @staticmethod
     def get_search_filters(db: Session, category_id: Optional[int] = None) -> Dict[str, Any]:
         """Get available search filters."""
         filters = {}
         
-        # Get categories
+        # Get categories from the in-memory snapshot
+        snapshot = category_tree.snapshot(db)
         if category_id:
-            subcategories = db.query(Category).filter(
-                Category.parent_category_id == category_id,
-                Category.is_active == True
-            ).all()
             filters["subcategories"] = [
-                {"id": cat.category_id, "name": cat.name} for cat in subcategories
+                {"id": cat.category_id, "name": cat.name} for cat in snapshot.subcategories(category_id)
             ]
         else:
-            categories = db.query(Category).filter(
-                Category.parent_category_id.is_(None),
-                Category.is_active == True
-            ).order_by(Category.display_order).all()
             filters["categories"] = [
-                {"id": cat.category_id, "name": cat.name} for cat in categories
+                {"id": cat.category_id, "name": cat.name} for cat in snapshot.subcategories(None)
             ]
         
         # Get seller levels
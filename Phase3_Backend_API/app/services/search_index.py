@@ -0,0 +1,272 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import SEARCH_BACKEND
+from app.models.gig import Gig
+from app.models.tag import Tag, GigTag
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Term frequencies are weighted per field before BM25 scoring, so a hit in
+# the title counts for more than the same hit buried in the description.
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "search_tags": 2.0,
+    "tags": 2.0,
+    "description": 1.0,
+}
+
+# The last query token also matches longer terms it is a prefix of
+# ("web" finds "website"), so results do not wait for the word to be
+# finished. Short prefixes are not expanded, and expansion is capped at the
+# terms found in the most gigs.
+MIN_PREFIX_LENGTH = 3
+MAX_PREFIX_EXPANSIONS = 50
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+class SearchBackend(ABC):
+    """Interface for gig text search backends."""
+
+    @abstractmethod
+    def search(self, db: Session, query: str, category_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return (gig_id, score) pairs matching the query, best first."""
+
+    def index_gig(self, db: Session, gig: Gig):
+        """Add or refresh a gig in the index."""
+
+    def remove_gig(self, gig_id: int):
+        """Drop a gig from the index."""
+
+class DatabaseSearchBackend(SearchBackend):
+    """Substring matching in the database, ranked by the stored ranking score."""
+
+    def search(self, db: Session, query: str, category_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        gig_query = db.query(Gig.gig_id, Gig.ranking_score).filter(
+            Gig.is_active == True,
+            or_(
+                Gig.title.ilike(f"%{query}%"),
+                Gig.description.ilike(f"%{query}%"),
+                Gig.search_tags.ilike(f"%{query}%")
+            )
+        )
+        if category_id:
+            gig_query = gig_query.filter(Gig.category_id == category_id)
+
+        rows = gig_query.all()
+        return sorted(((row.gig_id, row.ranking_score or 0.0) for row in rows), key=lambda m: (-m[1], m[0]))
+
+class InvertedIndexBackend(SearchBackend):
+    """In-memory inverted index over active gigs with BM25 scoring.
+
+    The index is built from the database on first use and then kept current
+    by GigService as gigs are created, updated and deleted. Query cost is
+    proportional to the postings of the query terms, not the catalog size.
+
+    Matching is by whole token, plus prefix expansion of the last query
+    token; unlike the database backend's substring match, a query does not
+    match in the middle of a word ("web" does not find "cobweb").
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._postings: Dict[str, Dict[int, float]] = {}
+        # Terms of _postings in sorted order, for prefix lookups
+        self._terms: List[str] = []
+        self._doc_terms: Dict[int, Dict[str, float]] = {}
+        self._doc_lengths: Dict[int, float] = {}
+        self._doc_categories: Dict[int, int] = {}
+        self._total_length = 0.0
+
+    @staticmethod
+    def _weighted_terms(fields: Dict[str, Optional[str]]) -> Dict[str, float]:
+        terms: Dict[str, float] = defaultdict(float)
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            for token in tokenize(text):
+                terms[token] += weight
+        return terms
+
+    def _add_document(self, gig_id: int, category_id: int, fields: Dict[str, Optional[str]]):
+        self._remove_document(gig_id)
+
+        terms = self._weighted_terms(fields)
+        if not terms:
+            return
+
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if self._loaded:
+                    bisect.insort(self._terms, term)
+            postings[gig_id] = tf
+
+        length = sum(terms.values())
+        self._doc_terms[gig_id] = terms
+        self._doc_lengths[gig_id] = length
+        self._doc_categories[gig_id] = category_id
+        self._total_length += length
+
+    def _remove_document(self, gig_id: int):
+        terms = self._doc_terms.pop(gig_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(gig_id, None)
+                if not postings:
+                    del self._postings[term]
+                    i = bisect.bisect_left(self._terms, term)
+                    if i < len(self._terms) and self._terms[i] == term:
+                        del self._terms[i]
+
+        self._total_length -= self._doc_lengths.pop(gig_id, 0.0)
+        self._doc_categories.pop(gig_id, None)
+
+    def rebuild(self, db: Session):
+        """Rebuild the whole index from the database."""
+        gigs = db.query(
+            Gig.gig_id, Gig.category_id, Gig.title, Gig.description, Gig.search_tags
+        ).filter(Gig.is_active == True).all()
+
+        tag_names: Dict[int, List[str]] = defaultdict(list)
+        for gig_id, name in db.query(GigTag.gig_id, Tag.name).join(Tag, GigTag.tag_id == Tag.tag_id).all():
+            tag_names[gig_id].append(name)
+
+        with self._lock:
+            # Sorted once at the end rather than per inserted term
+            self._loaded = False
+            self._postings = {}
+            self._terms = []
+            self._doc_terms = {}
+            self._doc_lengths = {}
+            self._doc_categories = {}
+            self._total_length = 0.0
+
+            for gig in gigs:
+                self._add_document(gig.gig_id, gig.category_id, {
+                    "title": gig.title,
+                    "description": gig.description,
+                    "search_tags": gig.search_tags,
+                    "tags": " ".join(tag_names.get(gig.gig_id, [])),
+                })
+
+            self._terms = sorted(self._postings)
+            self._loaded = True
+
+    def ensure_loaded(self, db: Session):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.rebuild(db)
+
+    def index_gig(self, db: Session, gig: Gig):
+        if not self._loaded:
+            # Nothing to keep in sync yet; the first search loads everything.
+            return
+
+        if not gig.is_active:
+            self.remove_gig(gig.gig_id)
+            return
+
+        tag_names = [
+            name for (name,) in db.query(Tag.name).join(GigTag, GigTag.tag_id == Tag.tag_id).filter(
+                GigTag.gig_id == gig.gig_id
+            ).all()
+        ]
+
+        with self._lock:
+            self._add_document(gig.gig_id, gig.category_id, {
+                "title": gig.title,
+                "description": gig.description,
+                "search_tags": gig.search_tags,
+                "tags": " ".join(tag_names),
+            })
+
+    def remove_gig(self, gig_id: int):
+        with self._lock:
+            self._remove_document(gig_id)
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """Longer indexed terms starting with prefix, the most widely used first."""
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return []
+
+        start = bisect.bisect_right(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\uffff")
+        return heapq.nlargest(
+            MAX_PREFIX_EXPANSIONS, self._terms[start:end], key=lambda term: len(self._postings[term])
+        )
+
+    def search(self, db: Session, query: str, category_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        self.ensure_loaded(db)
+
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if doc_count == 0:
+                return []
+            avg_length = self._total_length / doc_count
+
+            # Each query token scores a gig once, by its best matching term
+            alternatives = {token: [token] for token in tokens}
+            alternatives[tokens[-1]] = [tokens[-1]] + self._expand_prefix(tokens[-1])
+
+            for terms in alternatives.values():
+                best: Dict[int, float] = {}
+                for term in terms:
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for gig_id, tf in postings.items():
+                        if category_id and self._doc_categories.get(gig_id) != category_id:
+                            continue
+                        norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[gig_id] / avg_length)
+                        score = idf * tf * (self.k1 + 1) / (tf + norm)
+                        if score > best.get(gig_id, 0.0):
+                            best[gig_id] = score
+
+                for gig_id, score in best.items():
+                    scores[gig_id] += score
+
+        return sorted(scores.items(), key=lambda m: (-m[1], m[0]))
+
+SEARCH_BACKENDS = {
+    "inverted_index": InvertedIndexBackend,
+    "database": DatabaseSearchBackend,
+}
+
+def get_search_backend(name: str = SEARCH_BACKEND) -> SearchBackend:
+    """Instantiate the configured search backend."""
+    try:
+        return SEARCH_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown search backend '{name}'")
+
+# Process-wide backend shared by SearchService and GigService
+search_backend = get_search_backend()
@@ -0,0 +1,176 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.order import Order
+from app.models.payment import Payment, SellerBalance
+
+# Order statuses whose pending payment counts as earnings in escrow
+OPEN_ORDER_STATUSES = ("pending", "in_progress", "delivered")
+
+BUCKETS = ("total_earnings", "available_earnings", "pending_earnings", "month_earnings")
+
+# Rows written per INSERT batch during a full rebuild
+REBUILD_BATCH_SIZE = 1000
+
+def start_of_month() -> datetime:
+    """Start of the current month (local time, as the summary has always used)."""
+    return datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def _contribution(
+    seller_amount: int,
+    created_at: datetime,
+    payment_status: Optional[str],
+    order_status: Optional[str],
+    month_start: datetime
+) -> Dict[str, int]:
+    """What one payment adds to each balance bucket in a given state."""
+    completed = payment_status == "completed"
+    return {
+        "total_earnings": seller_amount if completed else 0,
+        "available_earnings": seller_amount if completed and order_status == "completed" else 0,
+        "pending_earnings": seller_amount if payment_status == "pending" and order_status in OPEN_ORDER_STATUSES else 0,
+        "month_earnings": seller_amount if completed and created_at >= month_start else 0,
+    }
+
+class SellerBalanceService:
+    """Maintains the seller_balances table.
+
+    Each order status change moves the order's payment between buckets
+    with one UPDATE, so reading a seller's earnings is a primary key
+    lookup. The month bucket rolls over on the first change (or read) in a
+    new month. Except for get_summary, these methods do not commit.
+    """
+
+    @staticmethod
+    def _summary_statement(month_start: datetime, seller_ids: Optional[List[int]] = None):
+        """All four buckets per seller in one pass over payments joined to orders."""
+        amount = Payment.seller_amount
+        completed = Payment.status == "completed"
+
+        def bucket(condition, name):
+            return func.coalesce(func.sum(case((condition, amount), else_=0)), 0).label(name)
+
+        statement = select(
+            Order.seller_id,
+            bucket(completed, "total_earnings"),
+            bucket(and_(completed, Order.status == "completed"), "available_earnings"),
+            bucket(and_(Payment.status == "pending", Order.status.in_(OPEN_ORDER_STATUSES)), "pending_earnings"),
+            bucket(and_(completed, Payment.created_at >= month_start), "month_earnings")
+        ).join(Order, Payment.order_id == Order.order_id).group_by(Order.seller_id)
+
+        if seller_ids is not None:
+            statement = statement.where(Order.seller_id.in_(seller_ids))
+        return statement
+
+    @staticmethod
+    def compute(db: Session, seller_id: int) -> Dict[str, int]:
+        """A seller's balance computed from the payment history."""
+        row = db.execute(SellerBalanceService._summary_statement(start_of_month(), [seller_id])).first()
+        return {bucket: (getattr(row, bucket) if row else 0) for bucket in BUCKETS}
+
+    @staticmethod
+    def _create(db: Session, seller_id: int) -> Dict[str, int]:
+        values = SellerBalanceService.compute(db, seller_id)
+        db.execute(insert(SellerBalance).values(seller_id=seller_id, month_start=start_of_month(), **values))
+        return values
+
+    @staticmethod
+    def apply_payment_change(
+        db: Session,
+        order: Order,
+        payment: Payment,
+        old_payment_status: Optional[str],
+        old_order_status: Optional[str]
+    ):
+        """Move an order's payment between buckets after a status change.
+
+        Pass None for the old statuses when the payment is new.
+        """
+        month_start = start_of_month()
+        created_at = payment.created_at or datetime.utcnow()
+        before = _contribution(payment.seller_amount, created_at, old_payment_status, old_order_status, month_start)
+        after = _contribution(payment.seller_amount, created_at, payment.status, order.status, month_start)
+        SellerBalanceService.apply_delta(
+            db, order.seller_id, {bucket: after[bucket] - before[bucket] for bucket in BUCKETS}
+        )
+
+    @staticmethod
+    def new_payment_delta(seller_amount: int, created_at: datetime, order_status: str = "pending") -> Dict[str, int]:
+        """What a new pending payment adds to its seller's buckets."""
+        return _contribution(seller_amount, created_at, "pending", order_status, start_of_month())
+
+    @staticmethod
+    def apply_delta(db: Session, seller_id: int, delta: Dict[str, int]):
+        """Add per-bucket amounts to a seller's balance, creating it from the history if missing."""
+        if not any(delta.values()):
+            return
+
+        month_start = start_of_month()
+        update_statement = update(SellerBalance).where(SellerBalance.seller_id == seller_id).values(
+            total_earnings=SellerBalance.total_earnings + delta["total_earnings"],
+            available_earnings=SellerBalance.available_earnings + delta["available_earnings"],
+            pending_earnings=SellerBalance.pending_earnings + delta["pending_earnings"],
+            # A bucket from an earlier month restarts from this change
+            month_earnings=case(
+                (SellerBalance.month_start == month_start, SellerBalance.month_earnings + delta["month_earnings"]),
+                else_=delta["month_earnings"]
+            ),
+            month_start=month_start
+        ).execution_options(synchronize_session=False)
+
+        if db.execute(update_statement).rowcount:
+            return
+
+        # First change for this seller: start from the full history,
+        # which already includes this change once flushed
+        db.flush()
+        try:
+            with db.begin_nested():
+                SellerBalanceService._create(db, seller_id)
+        except IntegrityError:
+            # Created concurrently from a history that cannot include this
+            # uncommitted change, so apply it on top
+            db.execute(update_statement)
+
+    @staticmethod
+    def get_summary(db: Session, seller_id: int) -> Dict[str, int]:
+        """Current balance of a seller, created from the history on first use."""
+        balance = db.get(SellerBalance, seller_id)
+        if balance is None:
+            try:
+                values = SellerBalanceService._create(db, seller_id)
+                db.commit()
+            except IntegrityError:
+                # Created concurrently by an order change
+                db.rollback()
+                balance = db.get(SellerBalance, seller_id)
+            else:
+                return values
+
+        month_earnings = balance.month_earnings if balance.month_start == start_of_month() else 0
+        return {
+            "total_earnings": balance.total_earnings,
+            "available_earnings": balance.available_earnings,
+            "pending_earnings": balance.pending_earnings,
+            "month_earnings": month_earnings,
+        }
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Recompute every seller's balance from the payment history."""
+        month_start = start_of_month()
+        rows = [
+            {"seller_id": row.seller_id, "month_start": month_start, **{bucket: getattr(row, bucket) for bucket in BUCKETS}}
+            for row in db.execute(SellerBalanceService._summary_statement(month_start))
+        ]
+
+        db.execute(delete(SellerBalance))
+        for i in range(0, len(rows), REBUILD_BATCH_SIZE):
+            db.execute(insert(SellerBalance), rows[i:i + REBUILD_BATCH_SIZE])
+        db.commit()
+
+        return len(rows)
@@ -0,0 +1,216 @@
+import bisect
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import SUGGESTION_REFRESH_SECONDS
+from app.models.gig import Gig
+from app.models.tag import Tag
+
+# Upper bound on memoized prefix results
+PREFIX_CACHE_SIZE = 10000
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase text and collapse whitespace."""
+    return " ".join((text or "").lower().split())
+
+class SuggestionIndex:
+    """Typeahead suggestions served from memory.
+
+    Phrases come from active gig titles and tag names. Each phrase is
+    weighted by its tag frequency plus the number of active gigs using it
+    as a title, and is reachable from the start of any of its words. Keys
+    live in a sorted array, so a prefix lookup is a bisect plus a top-k
+    over the matching range; results are memoized per prefix.
+    """
+
+    def __init__(self, refresh_seconds: int = SUGGESTION_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        # Gig changes seen while a rebuild runs, as (gig_id, title or None)
+        self._journal: Optional[List[Tuple[int, Optional[str]]]] = None
+        self._loaded_at: Optional[float] = None
+        self._display: Dict[str, str] = {}
+        self._tag_weights: Dict[str, float] = {}
+        self._title_counts: Dict[str, int] = {}
+        self._gig_titles: Dict[int, str] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._prefix_cache: "OrderedDict[str, Tuple[int, List[str]]]" = OrderedDict()
+
+    @staticmethod
+    def _search_keys(phrase: str) -> List[str]:
+        words = phrase.split(" ")
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def _weight(self, phrase: str) -> float:
+        return self._tag_weights.get(phrase, 0.0) + self._title_counts.get(phrase, 0)
+
+    def _add_phrase_keys(self, phrase: str):
+        for key in self._search_keys(phrase):
+            entry = (key, phrase)
+            i = bisect.bisect_left(self._keys, entry)
+            if i == len(self._keys) or self._keys[i] != entry:
+                self._keys.insert(i, entry)
+            self._invalidate_prefixes(key)
+
+    def _remove_phrase_keys(self, phrase: str):
+        for key in self._search_keys(phrase):
+            entry = (key, phrase)
+            i = bisect.bisect_left(self._keys, entry)
+            if i < len(self._keys) and self._keys[i] == entry:
+                del self._keys[i]
+            self._invalidate_prefixes(key)
+
+    def _invalidate_prefixes(self, key: str):
+        for i in range(1, len(key) + 1):
+            self._prefix_cache.pop(key[:i], None)
+
+    def _invalidate_phrase(self, phrase: str):
+        for key in self._search_keys(phrase):
+            self._invalidate_prefixes(key)
+
+    def _add_title(self, gig_id: int, title: str):
+        phrase = normalize(title)
+        if not phrase:
+            return
+        self._gig_titles[gig_id] = phrase
+        self._display.setdefault(phrase, title.strip())
+        self._title_counts[phrase] = self._title_counts.get(phrase, 0) + 1
+        self._add_phrase_keys(phrase)
+
+    def _remove_title(self, gig_id: int):
+        phrase = self._gig_titles.pop(gig_id, None)
+        if phrase is None:
+            return
+        count = self._title_counts.get(phrase, 0) - 1
+        if count > 0:
+            self._title_counts[phrase] = count
+            self._invalidate_phrase(phrase)
+            return
+
+        self._title_counts.pop(phrase, None)
+        if phrase in self._tag_weights:
+            self._invalidate_phrase(phrase)
+        else:
+            self._display.pop(phrase, None)
+            self._remove_phrase_keys(phrase)
+
+    def rebuild(self, db: Session):
+        """Reload all phrases from gig titles and tags.
+
+        The new index is built without holding the lock, so lookups keep
+        using the current one meanwhile. Gig changes made during the build
+        are journaled and replayed on top of it before it is swapped in.
+        """
+        with self._lock:
+            self._journal = []
+
+        try:
+            titles = db.query(Gig.gig_id, Gig.title).filter(Gig.is_active == True).all()
+            tags = db.query(Tag.name, Tag.frequency).all()
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+
+        display: Dict[str, str] = {}
+        tag_weights: Dict[str, float] = {}
+        title_counts: Dict[str, int] = {}
+        gig_titles: Dict[int, str] = {}
+
+        for name, frequency in tags:
+            phrase = normalize(name)
+            if phrase:
+                display[phrase] = name.strip()
+                tag_weights[phrase] = float(frequency or 0)
+
+        for gig_id, title in titles:
+            phrase = normalize(title)
+            if phrase:
+                gig_titles[gig_id] = phrase
+                display.setdefault(phrase, title.strip())
+                title_counts[phrase] = title_counts.get(phrase, 0) + 1
+
+        keys = sorted((key, phrase) for phrase in display for key in self._search_keys(phrase))
+
+        with self._lock:
+            journal, self._journal = self._journal, None
+            self._display = display
+            self._tag_weights = tag_weights
+            self._title_counts = title_counts
+            self._gig_titles = gig_titles
+            self._keys = keys
+            self._prefix_cache = OrderedDict()
+            for gig_id, title in journal:
+                self._remove_title(gig_id)
+                if title is not None:
+                    self._add_title(gig_id, title)
+            self._loaded_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session):
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at <= self.refresh_seconds:
+            return
+
+        # The first load has to be waited for; a refresh is done by one
+        # request while the others keep serving the current index.
+        if not self._refresh_lock.acquire(blocking=loaded_at is None):
+            return
+        try:
+            if self._loaded_at == loaded_at:
+                self.rebuild(db)
+        finally:
+            self._refresh_lock.release()
+
+    def _apply(self, gig_id: int, title: Optional[str]):
+        """Set (or with None, drop) a gig's title in the live index."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((gig_id, title))
+            if self._loaded_at is None:
+                return
+
+            self._remove_title(gig_id)
+            if title is not None:
+                self._add_title(gig_id, title)
+
+    def index_gig(self, gig: Gig):
+        """Add or refresh a gig's title."""
+        self._apply(gig.gig_id, gig.title if gig.is_active else None)
+
+    def remove_gig(self, gig_id: int):
+        """Drop a gig's title."""
+        self._apply(gig_id, None)
+
+    def suggest(self, db: Session, query: str, limit: int = 10) -> List[str]:
+        """Return the highest weighted phrases matching the query prefix."""
+        self.ensure_fresh(db)
+
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        with self._lock:
+            cached = self._prefix_cache.get(prefix)
+            if cached is None or cached[0] < limit:
+                start = bisect.bisect_left(self._keys, (prefix,))
+                end = bisect.bisect_left(self._keys, (prefix + "\uffff",))
+                phrases = {phrase for _, phrase in self._keys[start:end]}
+                top = heapq.nsmallest(limit, phrases, key=lambda p: (-self._weight(p), p))
+
+                cached = (limit, top)
+                self._prefix_cache[prefix] = cached
+                if len(self._prefix_cache) > PREFIX_CACHE_SIZE:
+                    self._prefix_cache.popitem(last=False)
+            else:
+                self._prefix_cache.move_to_end(prefix)
+
+            return [self._display[phrase] for phrase in cached[1][:limit]]
+
+# Process-wide index shared by SearchService and GigService
+suggestion_index = SuggestionIndex()
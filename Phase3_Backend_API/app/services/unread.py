@@ -0,0 +1,89 @@
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import CounterCache
+from app.core.config import UNREAD_COUNTER_STORE, UNREAD_COUNTER_MAX_USERS, UNREAD_COUNTER_RECONCILE_SECONDS
+from app.services.outbox import outbox_dispatcher
+
+# Counter kinds
+NOTIFICATIONS = "notifications"
+MESSAGES = "messages"
+
+class UnreadCounterStore(ABC):
+    """Interface for per-user unread counter stores.
+
+    Counters cache the result of counting unread rows. A missing counter is
+    loaded by the caller and stored with `set`; writes adjust it with
+    `add`, which leaves counters that are not held alone. Stores drop a
+    counter after the reconciliation interval, so drift from changes made
+    elsewhere (other processes, stored procedures) is corrected by the
+    next recount.
+    """
+
+    @abstractmethod
+    def get(self, kind: str, user_id: int) -> Optional[int]:
+        """The current counter, or None if it has to be recounted."""
+
+    @abstractmethod
+    def set(self, kind: str, user_id: int, count: int):
+        """Store a freshly counted value."""
+
+    @abstractmethod
+    def add(self, kind: str, user_id: int, delta: int):
+        """Adjust a held counter, never below zero."""
+
+    @abstractmethod
+    def invalidate(self, kind: str, user_id: int):
+        """Drop a counter so the next read recounts it."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+class InMemoryUnreadCounterStore(UnreadCounterStore):
+    """Counters held in this process, bounded by LRU eviction."""
+
+    def __init__(
+        self,
+        max_users: int = UNREAD_COUNTER_MAX_USERS,
+        reconcile_seconds: float = UNREAD_COUNTER_RECONCILE_SECONDS
+    ):
+        # One entry per (kind, user), so room for both kinds of each user
+        self._counters = CounterCache(max_size=2 * max_users, ttl_seconds=reconcile_seconds)
+
+    def get(self, kind: str, user_id: int) -> Optional[int]:
+        return self._counters.get((kind, user_id))
+
+    def set(self, kind: str, user_id: int, count: int):
+        self._counters.set((kind, user_id), count)
+
+    def add(self, kind: str, user_id: int, delta: int):
+        if delta:
+            self._counters.add((kind, user_id), delta)
+
+    def invalidate(self, kind: str, user_id: int):
+        self._counters.delete((kind, user_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return self._counters.stats()
+
+UNREAD_COUNTER_STORES = {
+    "memory": InMemoryUnreadCounterStore,
+}
+
+def get_unread_counter_store(name: str = UNREAD_COUNTER_STORE) -> UnreadCounterStore:
+    """Instantiate the configured unread counter store."""
+    try:
+        return UNREAD_COUNTER_STORES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown unread counter store '{name}'")
+
+# Process-wide store shared by the notification and message services
+unread_counters = get_unread_counter_store()
+
+def _count_dispatched(notifications: List[Dict[str, Any]]):
+    """Outbox delivery channel: count newly dispatched notifications."""
+    for user_id, count in Counter(notification["user_id"] for notification in notifications).items():
+        unread_counters.add(NOTIFICATIONS, user_id, count)
+
+outbox_dispatcher.add_channel(_count_dispatched)
@@ -1,11 +1,13 @@
 from typing import Optional, List
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.user import User, SellerProfile
 from app.schemas.user import UserUpdate, PasswordChange
 from app.schemas.seller import SellerProfileCreate, SellerProfileUpdate
-from app.services.auth import AuthService
+from app.services.auth import AuthService, principal_cache
+from app.services.listing_facts import ListingFactsService
 
 class UserService:
     @staticmethod
@@ -33,6 +35,7 @@ class UserService:
             setattr(user, field, value)
         
         db.commit()
+        principal_cache.invalidate_user(user_id)
         db.refresh(user)
         return user
 
@@ -56,6 +59,7 @@ class UserService:
         # Update password
         user.password_hash = AuthService.get_password_hash(password_change.new_password)
         db.commit()
+        principal_cache.invalidate_user(user_id)
         return True
 
     @staticmethod
@@ -100,6 +104,8 @@ class UserService:
             user.user_role = "seller"
         
         db.commit()
+        # Role and seller id changed
+        principal_cache.invalidate_user(user_id)
         db.refresh(seller_profile)
         
         return seller_profile
@@ -123,6 +129,28 @@ class UserService:
         for field, value in update_data.items():
             setattr(seller_profile, field, value)
         
+        db.flush()
+        ListingFactsService.refresh_seller(db, seller_id)
         db.commit()
         db.refresh(seller_profile)
-        return seller_profile
\ No newline at end of file
+        return seller_profile
+
+class AsyncUserService:
+    """UserService read paths for async endpoints."""
+
+    @staticmethod
+    async def get_current_user(db: AsyncSession, user_id: int) -> User:
+        """Load the row of an authenticated user.
+
+        The principal may outlive the user row in the cache; a deleted user
+        is treated as unauthenticated and dropped from the cache.
+        """
+        user = await db.get(User, user_id)
+        if user is None:
+            principal_cache.invalidate_user(user_id)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return user
@@ -0,0 +1,82 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class CursorPage(list):
+    """A list of results that also knows the cursor of the following page.
+
+    Behaves exactly like the plain lists services used to return, so
+    response models and existing callers are unaffected.
+    """
+
+    def __init__(self, items: Iterable[Any] = (), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+def encode_cursor(sort: str, key: Sequence[Any]) -> str:
+    """Encode a sort name and the sort key of the last row as an opaque token."""
+    payload = json.dumps({"s": sort, "k": [_encode_value(v) for v in key]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str) -> List[Any]:
+    """Decode a cursor token, checking it was issued for the same sort order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = [_decode_value(v) for v in payload["k"]]
+        cursor_sort = payload["s"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    if cursor_sort != sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested sort order"
+        )
+
+    return key
+
+def keyset_condition(columns: Sequence[Any], key: Sequence[Any], descending: bool = True):
+    """Build a WHERE clause selecting rows strictly after `key` in sort order.
+
+    SQL Server has no row-value comparison, so (a, b) < (x, y) is expanded
+    to a <= x AND (a < x OR (a = x AND b < y)), which an index on (a, b)
+    can still seek into.
+    """
+    def after(column, value):
+        return column < value if descending else column > value
+
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, key)):
+        equal_prefix = [c == v for c, v in zip(columns[:i], key[:i])]
+        clauses.append(and_(*equal_prefix, after(column, value)))
+
+    leading = columns[0] <= key[0] if descending else columns[0] >= key[0]
+    return and_(leading, or_(*clauses))
+
+def set_next_cursor(response: Response, page: Any):
+    """Expose a page's next cursor as a response header."""
+    next_cursor = getattr(page, "next_cursor", None)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add the parent directory to the Python path so we can import the app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.async_session import get_async_db, async_engine
+from app.database.session import SessionLocal, get_db, engine
+from app.models.user import User
+from app.services.notification import NotificationService, AsyncNotificationService
+
+# The same request served both ways: a user lookup (what authentication
+# does) followed by the notification badge count and first page
+bench_app = FastAPI()
+
+@bench_app.get("/sync")
+def sync_request(user_id: int, db: Session = Depends(get_db)):
+    user = db.scalar(select(User).where(User.user_id == user_id))
+    return {
+        "user": user.user_id,
+        "unread_count": NotificationService.get_unread_count(db, user_id),
+        "notifications": len(NotificationService.get_notifications(db, user_id))
+    }
+
+@bench_app.get("/async")
+async def async_request(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User).where(User.user_id == user_id))
+    return {
+        "user": user.user_id,
+        "unread_count": await AsyncNotificationService.get_unread_count(db, user_id),
+        "notifications": len(await AsyncNotificationService.get_notifications(db, user_id))
+    }
+
+async def run_level(client: httpx.AsyncClient, path: str, user_id: int, concurrency: int, requests: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_request():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path, params={"user_id": user_id})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+async def benchmark(user_id: int, levels, requests: int):
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        # Warm up both pools so connection setup is not measured
+        await run_level(client, "/sync", user_id, max(levels), max(levels))
+        await run_level(client, "/async", user_id, max(levels), max(levels))
+
+        print(f"{'concurrency':>11} {'sync req/s':>11} {'async req/s':>12} {'sync p95 ms':>12} {'async p95 ms':>13}")
+        for concurrency in levels:
+            sync_result = await run_level(client, "/sync", user_id, concurrency, requests)
+            async_result = await run_level(client, "/async", user_id, concurrency, requests)
+            print(
+                f"{concurrency:>11} {sync_result['throughput']:>11.1f} {async_result['throughput']:>12.1f} "
+                f"{sync_result['p95_ms']:>12.1f} {async_result['p95_ms']:>13.1f}"
+            )
+
+    await async_engine.dispose()
+    engine.dispose()
+
+def main():
+    """Compare requests/sec of the sync (threadpool) and async request paths"""
+    parser = argparse.ArgumentParser(description="Sync vs async request path benchmark")
+    parser.add_argument("--user-id", type=int, help="User whose notifications are read (defaults to the first user)")
+    parser.add_argument("--concurrency", default="1,8,32,64", help="Comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per concurrency level and path")
+    args = parser.parse_args()
+
+    user_id = args.user_id
+    if user_id is None:
+        db = SessionLocal()
+        try:
+            user_id = db.scalar(select(User.user_id).order_by(User.user_id))
+        finally:
+            db.close()
+        if user_id is None:
+            sys.exit("No users found; seed the database first.")
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    asyncio.run(benchmark(user_id, levels, args.requests))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the Python path so we can import the app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+
+from app.core.config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT
+from app.database.pool import get_pool_stats
+from app.database.session import create_pooled_engine
+
+def waitfor_delay(delay_ms: int) -> str:
+    """A WAITFOR DELAY time string (hh:mm:ss.mmm) for delay_ms milliseconds."""
+    seconds, milliseconds = divmod(delay_ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+def make_request(engine, delay_ms: int) -> float:
+    """One simulated request: hold a connection for a query of roughly delay_ms."""
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        if delay_ms:
+            if engine.dialect.name == "mssql":
+                conn.exec_driver_sql(f"WAITFOR DELAY '{waitfor_delay(delay_ms)}'")
+            else:
+                time.sleep(delay_ms / 1000)
+        conn.execute(text("SELECT 1")).scalar()
+    return time.perf_counter() - started
+
+def run_level(engine, concurrency: int, requests: int, delay_ms: int):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = time.perf_counter()
+        latencies = list(executor.map(lambda _: make_request(engine, delay_ms), range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+def benchmark(label: str, url: str, pool_size: int, max_overflow: int, levels, requests: int, delay_ms: int):
+    print(f"\n{label}: pool_size={pool_size} max_overflow={max_overflow}")
+    print(f"{'concurrency':>11} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'wait avg ms':>12} {'wait max ms':>12} {'opened':>7}")
+
+    for concurrency in levels:
+        engine = create_pooled_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_timeout=DB_POOL_TIMEOUT)
+        try:
+            result = run_level(engine, concurrency, requests, delay_ms)
+            stats = get_pool_stats(engine.pool)
+        finally:
+            engine.dispose()
+
+        print(
+            f"{concurrency:>11} {result['throughput']:>9.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+            f"{stats['checkout_wait_avg_ms']:>12.2f} {stats['checkout_wait_max_ms']:>12.2f} {stats['connections_opened']:>7}"
+        )
+
+def main():
+    """Compare request throughput on a single shared connection and on the configured pool"""
+    parser = argparse.ArgumentParser(description="Connection pool throughput benchmark")
+    parser.add_argument("--url", default=DATABASE_URL, help="Database URL (defaults to the application's)")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="Comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=400, help="Requests per concurrency level")
+    parser.add_argument("--delay-ms", type=int, default=10, help="Simulated query time per request")
+    args = parser.parse_args()
+    if not 0 <= args.delay_ms < 24 * 3600 * 1000:
+        parser.error("--delay-ms must be between 0 and one day")
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    # Equivalent of the old StaticPool: every request queues for one connection
+    benchmark("Single connection", args.url, 1, 0, levels, args.requests, args.delay_ms)
+    benchmark("Configured pool", args.url, DB_POOL_SIZE, DB_MAX_OVERFLOW, levels, args.requests, args.delay_ms)
+
+if __name__ == "__main__":
+    main()
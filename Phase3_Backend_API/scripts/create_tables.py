@@ -105,30 +105,10 @@ def create_triggers():
     END
     """
     
-    # FIXED: Update Gig Ranking - Only on UPDATE, not INSERT
-    update_gig_ranking = """
-    CREATE OR ALTER TRIGGER trg_update_gig_ranking
-    ON orders
-    FOR UPDATE
-    AS
-    BEGIN
-        SET NOCOUNT ON;
-        
-        -- Only update when order status changes to completed
-        IF UPDATE(status)
-        BEGIN
-            UPDATE g
-            SET ranking_score = (
-                COALESCE(g.total_orders, 0) * 0.4 +
-                COALESCE(g.total_reviews, 0) * 0.3 +
-                CASE WHEN g.is_featured = 1 THEN 10 ELSE 0 END +
-                COALESCE(g.impression_count, 0) * 0.01
-            )
-            FROM gigs g
-            INNER JOIN inserted i ON g.gig_id = i.gig_id
-            WHERE i.status = 'completed';
-        END
-    END
+    # Gig ranking is recomputed by RankingService (app/services/ranking.py);
+    # drop the old trigger, which rescored completed orders with its own formula
+    drop_gig_ranking = """
+    DROP TRIGGER IF EXISTS trg_update_gig_ranking
     """
     
     # FIXED: Order Completion
@@ -179,7 +159,7 @@ def create_triggers():
         conn.execute(text(limit_gigs_per_seller))
         conn.execute(text(calculate_overall_rating))
         conn.execute(text(update_seller_rating))
-        conn.execute(text(update_gig_ranking))
+        conn.execute(text(drop_gig_ranking))
         conn.execute(text(order_completion))
         conn.execute(text(offer_expiration))
         conn.commit()
@@ -1001,19 +981,42 @@ def create_functions():
     AS
     RETURN
     (
+        -- Months wholly inside the range come from the monthly rollups;
+        -- the partial months at either end are summed from their payments
+        WITH bounds AS (
+            SELECT
+                CASE WHEN @start_date = DATEFROMPARTS(YEAR(@start_date), MONTH(@start_date), 1)
+                     THEN @start_date
+                     ELSE DATEADD(MONTH, 1, CAST(DATEFROMPARTS(YEAR(@start_date), MONTH(@start_date), 1) AS DATETIME))
+                END AS full_from,
+                CAST(DATEFROMPARTS(YEAR(@end_date), MONTH(@end_date), 1) AS DATETIME) AS full_to
+        ),
+        periods AS (
+            SELECT r.period_start, r.earnings, r.completed_orders
+            FROM earnings_monthly_rollups r
+            JOIN seller_profiles sp ON r.seller_id = sp.user_id
+            CROSS JOIN bounds b
+            WHERE sp.seller_id = @seller_id
+              AND r.period_start >= b.full_from
+              AND r.period_start < b.full_to
+            UNION ALL
+            SELECT CAST(DATEFROMPARTS(YEAR(p.created_at), MONTH(p.created_at), 1) AS DATETIME), p.seller_amount, 1
+            FROM payments p
+            JOIN orders o ON p.order_id = o.order_id
+            JOIN seller_profiles sp ON o.seller_id = sp.user_id
+            CROSS JOIN bounds b
+            WHERE sp.seller_id = @seller_id
+              AND p.status = 'completed'
+              AND p.created_at BETWEEN @start_date AND @end_date
+              AND (p.created_at < b.full_from OR p.created_at >= b.full_to)
+        )
         SELECT 
-            CAST(YEAR(p.created_at) AS VARCHAR) + '-' + 
-            RIGHT('0' + CAST(MONTH(p.created_at) AS VARCHAR), 2) AS period,
-            SUM(p.seller_amount) AS earnings,
-            COUNT(p.payment_id) AS completed_orders
-        FROM payments p
-        JOIN orders o ON p.order_id = o.order_id
-        JOIN seller_profiles sp ON o.seller_id = sp.user_id
-        WHERE sp.seller_id = @seller_id
-          AND p.status = 'completed'
-          AND p.created_at BETWEEN @start_date AND @end_date
-        GROUP BY CAST(YEAR(p.created_at) AS VARCHAR) + '-' + 
-                RIGHT('0' + CAST(MONTH(p.created_at) AS VARCHAR), 2)
+            CONVERT(CHAR(7), period_start, 126) AS period,
+            SUM(earnings) AS earnings,
+            SUM(completed_orders) AS completed_orders
+        FROM periods
+        GROUP BY period_start
+        HAVING SUM(completed_orders) > 0
     )
     """
     
@@ -1304,11 +1307,38 @@ def create_indexes():
     indexes = [
         "CREATE INDEX IX_Gigs_RankingScore ON gigs (ranking_score DESC)",
         "CREATE INDEX IX_Gigs_CategoryId ON gigs (category_id)",
-        "CREATE INDEX IX_Orders_BuyerId ON orders (buyer_id)",
-        "CREATE INDEX IX_Orders_SellerId ON orders (seller_id)",
+        # Order lists filter by party (and optionally status) and page newest first
+        "CREATE INDEX IX_Orders_BuyerId ON orders (buyer_id, created_at DESC, order_id DESC)",
+        "CREATE INDEX IX_Orders_SellerId ON orders (seller_id, created_at DESC, order_id DESC)",
+        "CREATE INDEX IX_Orders_Seller_Status_CreatedAt ON orders (seller_id, status, created_at DESC, order_id DESC)",
+        "CREATE INDEX IX_Orders_Buyer_Status_CreatedAt ON orders (buyer_id, status, created_at DESC, order_id DESC)",
         "CREATE INDEX IX_Messages_ConversationId ON messages (conversation_id)",
+        "CREATE INDEX IX_Messages_Unread ON messages (conversation_id, recipient_id, message_id) WHERE is_read = 0",
         "CREATE INDEX IX_GigTags_TagId ON gig_tags (tag_id)",
-        "CREATE INDEX IX_Notifications_UserId_IsRead ON notifications (user_id, is_read)"
+        "CREATE INDEX IX_Notifications_UserId_IsRead ON notifications (user_id, is_read)",
+        # Outbox: dispatcher claims due events in order; dispatch is idempotent per key
+        "CREATE INDEX IX_OutboxEvents_Status_NextAttempt ON outbox_events (status, next_attempt_at, event_id)",
+        "CREATE UNIQUE INDEX UX_Notifications_IdempotencyKey ON notifications (idempotency_key) WHERE idempotency_key IS NOT NULL",
+        # Retention: archive scan of old read rows, archived history per user
+        "CREATE INDEX IX_Notifications_IsRead_CreatedAt ON notifications (is_read, created_at)",
+        "CREATE INDEX IX_NotificationsArchive_User ON notifications_archive (user_id, created_at DESC)",
+        # Incremental ranking runs look for rows changed since the last run
+        "CREATE INDEX IX_Gigs_UpdatedAt ON gigs (updated_at)",
+        "CREATE INDEX IX_Orders_UpdatedAt ON orders (updated_at) INCLUDE (gig_id)",
+        "CREATE INDEX IX_Orders_CreatedAt ON orders (created_at) INCLUDE (gig_id)",
+        "CREATE INDEX IX_Reviews_CreatedAt ON reviews (created_at) INCLUDE (order_id)",
+        # Listing facts: each filter/sort combination is a single range scan
+        "CREATE INDEX IX_GigListingFacts_Category_Ranking ON gig_listing_facts (is_active, category_id, ranking_score DESC)",
+        "CREATE INDEX IX_GigListingFacts_Ranking ON gig_listing_facts (is_active, ranking_score DESC)",
+        "CREATE INDEX IX_GigListingFacts_Price ON gig_listing_facts (is_active, min_price)",
+        "CREATE INDEX IX_GigListingFacts_Delivery ON gig_listing_facts (is_active, min_delivery_time)",
+        "CREATE INDEX IX_GigListingFacts_Rating ON gig_listing_facts (is_active, rating_average DESC)",
+        # Inbox: point lookup per conversation, range scan per user
+        "CREATE UNIQUE INDEX UX_ConversationSummaries_User_Conversation ON conversation_summaries (user_id, conversation_id)",
+        "CREATE INDEX IX_ConversationSummaries_User_LastMessage ON conversation_summaries (user_id, last_message_date DESC, last_message_id DESC)",
+        # Earnings: history pages per seller, one rollup row per seller and month
+        "CREATE INDEX IX_EarningsLedger_Seller ON earnings_ledger (seller_id, entry_id DESC)",
+        "CREATE UNIQUE INDEX UX_EarningsRollups_Seller_Period ON earnings_monthly_rollups (seller_id, period_start)"
     ]
     
     try:
@@ -1321,6 +1351,32 @@ def create_indexes():
     finally:
         conn.close()
 
+def build_projections():
+    """Populate the denormalized read tables from the base tables"""
+    from app.database.session import SessionLocal
+    from app.services.conversation_summary import ConversationSummaryService
+    from app.services.listing_facts import ListingFactsService
+    from app.services.ranking import RankingService
+    from app.services.earnings import EarningsLedgerService
+    from app.services.seller_balance import SellerBalanceService
+    
+    db = SessionLocal()
+    try:
+        report = RankingService.run(db, mode="full")
+        print(f"Ranking scores computed for {report['gigs_scored']} gigs.")
+        count = ListingFactsService.rebuild(db)
+        print(f"Listing facts built for {count} gigs.")
+        count = ConversationSummaryService.rebuild(db)
+        print(f"Conversation summaries built: {count} inbox rows.")
+        count = SellerBalanceService.rebuild(db)
+        print(f"Seller balances built for {count} sellers.")
+        count = EarningsLedgerService.rebuild(db)
+        print(f"Earnings ledger built: {count} entries.")
+    except Exception as e:
+        print(f"Error building projections: {e}")
+    finally:
+        db.close()
+
 def seed_initial_data():
     """Seed the database with initial data"""
     conn = engine.connect()
@@ -1453,4 +1509,5 @@ if __name__ == "__main__":
     create_views()
     create_indexes()
     seed_initial_data()
+    build_projections()
     print("Database setup complete!")
\ No newline at end of file
@@ -67,6 +67,7 @@ def setup_database():
         create_tables_module.create_views()
         create_tables_module.create_indexes()
         create_tables_module.seed_initial_data()
+        create_tables_module.build_projections()
         
         print("Database setup complete!")
         return True
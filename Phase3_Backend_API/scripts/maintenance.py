@@ -0,0 +1,108 @@
+import argparse
+import os
+import sys
+
+# Add the parent directory to the Python path so we can import the app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import NOTIFICATION_RETENTION_DAYS, OUTBOX_RETENTION_DAYS
+from app.database.session import SessionLocal
+from app.models import *
+
+def rebuild_listing_facts(db, args):
+    """Rebuild gig_listing_facts from gigs, packages and seller profiles"""
+    from app.services.listing_facts import ListingFactsService
+    
+    count = ListingFactsService.rebuild(db)
+    print(f"Listing facts rebuilt for {count} gigs.")
+
+def rebuild_conversation_summaries(db, args):
+    """Rebuild conversation_summaries from the messages table"""
+    from app.services.conversation_summary import ConversationSummaryService
+    
+    count = ConversationSummaryService.rebuild(db)
+    print(f"Conversation summaries rebuilt: {count} inbox rows.")
+
+def rebuild_seller_balances(db, args):
+    """Rebuild seller_balances from payments and orders"""
+    from app.services.seller_balance import SellerBalanceService
+    
+    count = SellerBalanceService.rebuild(db)
+    print(f"Seller balances rebuilt for {count} sellers.")
+
+def rebuild_earnings_ledger(db, args):
+    """Rebuild the earnings ledger and monthly rollups from completed payments"""
+    from app.services.earnings import EarningsLedgerService
+    
+    count = EarningsLedgerService.rebuild(db)
+    print(f"Earnings ledger rebuilt: {count} entries.")
+
+def purge_outbox(db, args):
+    """Delete dispatched notification outbox events past the retention period"""
+    from app.services.outbox import OutboxService
+    
+    count = OutboxService.purge(db, args.days)
+    print(f"Outbox purged: {count} dispatched events older than {args.days} days.")
+
+def compact_notifications(db, args):
+    """Coalesce repeated notifications into digests and archive old read ones"""
+    from app.services.notification_retention import NotificationRetentionService
+    
+    coalesced = NotificationRetentionService.coalesce(db)
+    archived = NotificationRetentionService.archive(db, older_than_days=args.days)
+    stats = NotificationRetentionService.stats(db)
+    print(
+        f"Notifications compacted: {coalesced} merged into digests, {archived} archived "
+        f"(read, older than {args.days} days). {stats['notifications']} remain, "
+        f"{stats['archived_notifications']} in the archive."
+    )
+
+def recompute_rankings(db, args):
+    """Recompute gig ranking scores (full or incremental since the last run)"""
+    from app.services.ranking import RankingService
+    
+    report = RankingService.run(db, mode=args.mode)
+    print(
+        f"Ranking run {report['run_id']} ({report['mode']}): {report['gigs_scored']} gigs scored, "
+        f"{report['gigs_updated']} updated in {report['duration_seconds']}s "
+        f"({report['gigs_per_second']} gigs/s)."
+    )
+
+# Command name -> (handler, [(flags, argparse options), ...])
+COMMANDS = {
+    "rebuild-listing-facts": (rebuild_listing_facts, []),
+    "rebuild-conversation-summaries": (rebuild_conversation_summaries, []),
+    "rebuild-seller-balances": (rebuild_seller_balances, []),
+    "rebuild-earnings-ledger": (rebuild_earnings_ledger, []),
+    "purge-outbox": (purge_outbox, [
+        (("--days",), {"type": int, "default": OUTBOX_RETENTION_DAYS}),
+    ]),
+    "compact-notifications": (compact_notifications, [
+        (("--days",), {"type": int, "default": NOTIFICATION_RETENTION_DAYS}),
+    ]),
+    "recompute-rankings": (recompute_rankings, [
+        (("--mode",), {"choices": ["full", "incremental"], "default": "incremental"}),
+    ]),
+}
+
+def main():
+    """Run a maintenance command against the configured database"""
+    parser = argparse.ArgumentParser(description="Slate maintenance tasks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    for name, (handler, arguments) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=handler.__doc__)
+        for flags, options in arguments:
+            subparser.add_argument(*flags, **options)
+    
+    args = parser.parse_args()
+    handler, _ = COMMANDS[args.command]
+    
+    db = SessionLocal()
+    try:
+        handler(db, args)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()